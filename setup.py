@@ -1,5 +1,14 @@
+import os
 from setuptools import setup
 
 # Minimal setup.py for compatibility
 # Configuration is primarily in pyproject.toml
-setup() 
\ No newline at end of file
+
+# Opt-in: MEXC_BOT_MYPYC=1 compiles the per-tick statistics module with mypyc (needs mypy
+# installed). Default installs stay pure Python.
+ext_modules = []
+if os.environ.get("MEXC_BOT_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["src/stats_handler.py"])
+
+setup(ext_modules=ext_modules) 
\ No newline at end of file
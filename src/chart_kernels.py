@@ -0,0 +1,63 @@
+"""
+Kernels for drawing the candles of the terminal mini chart.
+
+When numba is installed the grid is filled by a JIT-compiled loop, warmed up at import
+time, that allocates nothing but the output; otherwise an equivalent NumPy implementation
+built from boolean masks is used.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# Cell codes written to the grid; GLYPHS[code] is the character drawn for each
+EMPTY, BODY, WICK, DOJI = 0, 1, 2, 3
+GLYPHS = np.array([" ", "█", "│", "─"])
+
+
+def _plot_candles_loop(ys, height, out):
+    """
+    Fill `out` (height x candles) with cell codes for candles whose (open, high, low, close)
+    rows are given in `ys`, row 0 being the top. A doji wins over a body, a body over a wick.
+    """
+    for j in range(ys.shape[0]):
+        open_y = ys[j, 0]
+        high_y = ys[j, 1]
+        low_y = ys[j, 2]
+        close_y = ys[j, 3]
+        body_top = min(open_y, close_y)
+        body_bottom = max(open_y, close_y)
+        for i in range(height):
+            if open_y == close_y and i == open_y:
+                out[i, j] = DOJI
+            elif body_top <= i <= body_bottom:
+                out[i, j] = BODY
+            elif high_y <= i <= low_y:
+                out[i, j] = WICK
+            else:
+                out[i, j] = EMPTY
+    return out
+
+
+def _plot_candles_numpy(ys, height, out):
+    """Same as the loop, with one boolean mask per cell type."""
+    open_y, high_y, low_y, close_y = ys.T
+    rows = np.arange(height)[:, None]
+    body = (rows >= np.minimum(open_y, close_y)) & (rows <= np.maximum(open_y, close_y))
+    wick = (rows >= high_y) & (rows <= low_y)
+    doji = (open_y == close_y) & (rows == open_y)
+    # First matching condition wins
+    out[...] = np.select([doji, body, wick], [DOJI, BODY, WICK], default=EMPTY)
+    return out
+
+
+if HAVE_NUMBA:
+    plot_candles_kernel = njit(cache=True)(_plot_candles_loop)
+
+    # Compile now rather than on the first chart render
+    plot_candles_kernel(np.zeros((1, 4), dtype=np.int64), 1, np.empty((1, 1), dtype=np.uint8))
+else:
+    plot_candles_kernel = _plot_candles_numpy
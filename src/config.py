@@ -1,4 +1,7 @@
 import os
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
 from dotenv import load_dotenv
 
 # --- Security Warning ---
@@ -12,14 +15,35 @@ from dotenv import load_dotenv
 load_dotenv() # Load variables from .env file
 
 # --- MEXC API Credentials ---
-MEXC_API_KEY = os.getenv('MEXC_API_KEY')
-MEXC_SECRET_KEY = os.getenv('MEXC_SECRET_KEY')
+MEXC_API_KEY = None
+MEXC_SECRET_KEY = None
+
+@dataclass(frozen=True)
+class Config:
+    """MEXC API credentials read from an environment mapping."""
+    MEXC_API_KEY: Optional[str] = None
+    MEXC_SECRET_KEY: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = os.environ) -> "Config":
+        """Build from `env` (os.environ by default); missing variables are None."""
+        return cls(MEXC_API_KEY=env.get('MEXC_API_KEY'), MEXC_SECRET_KEY=env.get('MEXC_SECRET_KEY'))
+
+def load_env_variables(env: Optional[Mapping[str, str]] = None):
+    """(Re)read the MEXC API credentials from `env` (os.environ by default) into this module and return them as (key, secret)."""
+    global MEXC_API_KEY, MEXC_SECRET_KEY
+    credentials = Config.from_env(os.environ if env is None else env)
+    MEXC_API_KEY = credentials.MEXC_API_KEY
+    MEXC_SECRET_KEY = credentials.MEXC_SECRET_KEY
+
+    if not MEXC_API_KEY or not MEXC_SECRET_KEY:
+        print("ERROR: MEXC_API_KEY or MEXC_SECRET_KEY not found in environment variables.")
+        print("Please create a .env file and add your keys.")
+        # Consider exiting or raising an exception here in a real application
+        # exit(1)
+    return MEXC_API_KEY, MEXC_SECRET_KEY
 
-if not MEXC_API_KEY or not MEXC_SECRET_KEY:
-    print("ERROR: MEXC_API_KEY or MEXC_SECRET_KEY not found in environment variables.")
-    print("Please create a .env file and add your keys.")
-    # Consider exiting or raising an exception here in a real application
-    # exit(1)
+load_env_variables()
 
 # --- Trading Parameters ---
 DEFAULT_SYMBOL = 'XRP/USDT:USDT' # Example symbol, adjust as needed
@@ -36,6 +60,8 @@ DATA_FETCH_INTERVAL_SECONDS = 5 # How often to fetch new market data
 PREDICTION_INTERVAL_SECONDS = 1 # How often to run the prediction logic
 STATS_UPDATE_INTERVAL_SECONDS = 10 # How often to update and display statistics
 CURRENT_THEME = "default_val" # Default theme for the application
+ENABLE_PRICE_STREAM = False # Stream live prices and candles over websocket (ccxt.pro) instead of polling REST
+OHLCV_DB_PATH = None # e.g. 'ohlcv.db' to keep candles in SQLite and only fetch new ones
 
 # --- Keyboard Input ---
 MANUAL_TRADE_KEY_UP = 'up'      # Key for manual long trade
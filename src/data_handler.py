@@ -43,7 +43,7 @@ class DataHandler:
             for attempt in range(3): # Retry up to 3 times
                 raw_ohlcv = self.mexc_handler.fetch_ohlcv(self.symbol, self.timeframe, limit=limit)
                 if raw_ohlcv:
-                    logging.debug(f"Fetched {len(raw_ohlcv)} candles for {self.symbol} ({self.timeframe}) on attempt {attempt + 1}")
+                    logging.debug("Fetched %d candles for %s (%s) on attempt %d", len(raw_ohlcv), self.symbol, self.timeframe, attempt + 1)
                     break # Success
                 logging.warning(f"Attempt {attempt + 1} failed to fetch OHLCV for {self.symbol}. Retrying after 1s...")
                 time.sleep(1) # Wait before retrying
@@ -91,7 +91,7 @@ class DataHandler:
                 latest_close = ohlcv_df['close'].iloc[-1]
                 if pd.notna(latest_close):
                     price = Decimal(str(latest_close))
-                    logging.debug(f"Using latest close price from DataFrame: {price}")
+                    logging.debug("Using latest close price from DataFrame: %s", price)
                     return price
                 else:
                     logging.debug("Latest close in DataFrame is NaN, falling back to ticker.")
@@ -99,13 +99,13 @@ class DataHandler:
                 logging.warning(f"Could not get latest close from DataFrame ({e}), falling back to ticker.")
 
         # Priority 2: Fetch ticker information using MEXCHandler method
-        logging.debug(f"Fetching current ticker price for {self.symbol}")
+        logging.debug("Fetching current ticker price for %s", self.symbol)
         try:
             # Use the get_current_price method from the injected mexc_handler instance
             ticker_price_float = self.mexc_handler.get_current_price(self.symbol)
             if ticker_price_float is not None:
                 price = Decimal(str(ticker_price_float))
-                logging.debug(f"Using ticker price: {price}")
+                logging.debug("Using ticker price: %s", price)
                 return price
             else:
                 logging.warning(f"Could not get current price for {self.symbol} from ticker.")
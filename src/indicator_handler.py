@@ -1,4 +1,4 @@
-from typing import List, Tuple, Optional, Any
+from typing import List, Tuple, Optional, Any, NamedTuple
 import logging
 import pandas as pd
 import numpy as np
@@ -38,6 +38,16 @@ MIN_DATA_POINTS = max(
     STOCH_K_PERIOD + STOCH_SMOOTH_K # Approximation for stoch
 ) + 10 # Add a buffer for calculations to stabilize
 
+class IndResult(NamedTuple):
+    """Fixed-shape result of calculate_indicators."""
+    rsi: float                    # Latest RSI value (NaN when unavailable)
+    is_valid: bool                # False when indicators could not be calculated
+    df: Optional[pd.DataFrame]    # DataFrame with indicator columns, None when invalid
+
+
+_INVALID_RESULT = IndResult(float('nan'), False, None)
+
+
 class IndicatorHandler:
     """Handles calculation of technical indicators and signal generation."""
 
@@ -46,13 +56,17 @@ class IndicatorHandler:
         # Add any initialization parameters if needed in the future
         logging.info("IndicatorHandler initialized.")
 
-    def calculate_indicators(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
-        """Calculates technical indicators using pandas-ta and adds them to the DataFrame."""
+    def calculate_indicators(self, df: pd.DataFrame) -> IndResult:
+        """
+        Calculates technical indicators using pandas-ta and adds them to the DataFrame.
+
+        Always returns an IndResult; check `is_valid` instead of testing for None.
+        """
         
         required_length = MIN_DATA_POINTS
         if len(df) < required_length:
             logging.warning(f"Not enough data points ({len(df)}) to calculate indicators reliably (min: {required_length}).")
-            return None
+            return _INVALID_RESULT
 
         try:
             # Ensure standard OHLCV column names if not already present (pandas-ta prefers lowercase)
@@ -65,7 +79,7 @@ class IndicatorHandler:
             for col in required_cols_ohlcv:
                 if col not in df.columns:
                     logging.error(f"Missing required column for indicators: {col}")
-                    return None
+                    return _INVALID_RESULT
                 # Convert to numeric, coercing errors (like empty strings) to NaN
                 df[col] = pd.to_numeric(df[col], errors='coerce')
 
@@ -73,7 +87,7 @@ class IndicatorHandler:
             df.dropna(subset=required_cols_ohlcv, inplace=True)
             if len(df) < required_length:
                 logging.warning(f"Data points reduced to {len(df)} after cleaning NaNs, insufficient for indicators (min: {required_length}).")
-                return None
+                return _INVALID_RESULT
 
             # --- Calculate Indicators using df.ta --- 
             # Strategy Example: Calculate SMA, RSI, MACD, Bollinger Bands, Stochastic, OBV
@@ -107,12 +121,17 @@ class IndicatorHandler:
                 # Keep original 'OBV' as is
             }, inplace=True, errors='ignore') # Ignore errors if a col wasn't generated (e.g., older pandas-ta)
 
+            # Keep RSI as a plain float64 column so per-tick reads of the latest value never box objects
+            if 'rsi' in df.columns and df['rsi'].dtype != np.float64:
+                df['rsi'] = np.asarray(df['rsi'], dtype=np.float64)
+
             logging.debug("Indicators calculated successfully using pandas-ta.")
-            return df
+            rsi = df['rsi'].iat[-1] if 'rsi' in df.columns and len(df) else float('nan')
+            return IndResult(float(rsi), True, df)
 
         except Exception as e:
             logging.error(f"Error calculating indicators with pandas-ta: {e}", exc_info=True)
-            return None
+            return _INVALID_RESULT
 
     def get_signal(self, ohlcv: List[List[float]]) -> str:
         """
@@ -133,9 +152,10 @@ class IndicatorHandler:
         df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
 
         # Calculate Indicators using the updated function
-        df_indicators = self.calculate_indicators(df)
+        ind_result = self.calculate_indicators(df)
+        df_indicators = ind_result.df
 
-        if df_indicators is None:
+        if not ind_result.is_valid:
             logging.warning("Failed to calculate indicators or insufficient data, cannot generate signal.")
             return 'NONE'
 
@@ -222,7 +242,7 @@ class IndicatorHandler:
             return 'SHORT'
 
         else:
-            logging.debug(f"No clear signal based on current strategy rules.")
+            logging.debug("No clear signal based on current strategy rules.")
             return 'NONE'
 
     def generate_signal(self, indicators) -> str:
@@ -230,11 +250,18 @@ class IndicatorHandler:
         Generate a trading signal from the calculated indicators.
         
         Args:
-            indicators: The indicators data, either a dictionary or DataFrame
+            indicators: An IndResult from calculate_indicators (a dictionary or
+                DataFrame is also accepted)
             
         Returns:
             'LONG', 'SHORT', or 'HOLD'
         """
+        # Fast path: the fixed-shape result produced by calculate_indicators
+        if type(indicators) is IndResult:
+            if not indicators.is_valid:
+                return 'HOLD'
+            indicators = indicators.df
+
         # Check if indicators is a DataFrame, if so convert to dict 
         if isinstance(indicators, pd.DataFrame):
             if len(indicators) == 0:
@@ -325,9 +352,10 @@ if __name__ == '__main__':
     print(f"--- Testing IndicatorHandler with {len(dummy_ohlcv)} dummy data points ---")
     handler = IndicatorHandler() # Instantiate the handler
     df_test = pd.DataFrame(dummy_ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-    df_test_indicators = handler.calculate_indicators(df_test.copy()) # Call method on instance
+    test_result = handler.calculate_indicators(df_test.copy()) # Call method on instance
+    df_test_indicators = test_result.df
 
-    if df_test_indicators is not None:
+    if test_result.is_valid:
         print("Indicators calculated. Checking latest values (last 5 rows):")
         # Select only the columns used in the strategy to check for NaNs
         check_cols = ['sma_short', 'sma_long', 'rsi', 'macd', 'macdsignal', 'slowk', 'slowd', 'OBV', 'obv_sma', 'bb_lower', 'bb_middle', 'bb_upper']
@@ -1,10 +1,8 @@
 import logging
+import math
 import queue
 import threading
 import time
-import os
-import pandas as pd
-from decimal import Decimal
 from collections import deque
 from dataclasses import dataclass, field
 
@@ -13,10 +11,11 @@ from textual.app import App, ComposeResult
 from textual.message import Message
 from textual.containers import Container
 from textual.reactive import reactive
-from textual.widgets import DataTable, Footer, Header, RichLog, Static
+from textual.widgets import DataTable, Footer, Header, RichLog
 
 # Import project modules (adjust paths if necessary)
 import src.config as config
+from src.metrics import Metrics, UpdateMetricsMessage, format_metrics_rows
 # Assume these modules exist and have necessary functions/classes
 from src.mexc_handler import MEXCHandler
 from src.data_handler import DataHandler
@@ -30,7 +29,9 @@ from src.widgets import (
     MiniChartWidget, 
     ThemeManager,
     ThemeChangedMessage,
-    SettingChangedMessage
+    SettingsChangedMessage,
+    NotificationMessage,
+    NotificationWidget
 )
 
 # --- Constants ---
@@ -41,6 +42,51 @@ UI_UPDATE_THROTTLE = 0.2  # Minimum time between UI updates (seconds)
 UI_UPDATE_INTERVAL = 0.2  # How often to check for pending UI updates (seconds)
 PREDICTION_ERROR_THROTTLE = 10  # Minimum time between logging same prediction errors (seconds)
 
+# --- Default Stylesheet (written to main.css on first start) ---
+CSS_BYTES = b"""
+Screen {
+    layout: vertical;
+}
+
+Header {
+    dock: top;
+    height: 1;
+}
+
+Footer {
+    dock: bottom;
+    height: 1;
+}
+
+.notification {
+    background: $surface;
+    height: 1;
+    dock: top;
+    text-align: center;
+    margin: 0 2;
+}
+
+#main-container {
+    grid-size: 2;
+    grid-gutter: 1 2;
+    grid-rows: auto 1fr; /* Metrics table auto height, Log takes rest */
+    padding: 1; /* Add some padding around the container */
+}
+
+DataTable {
+    width: 1fr;
+    /* Removed fixed height, let it adjust or set via grid */
+    border: thick $accent;
+    margin-bottom: 1; /* Add space below the table */
+}
+
+RichLog {
+    width: 1fr;
+    height: 1fr; /* Take remaining vertical space */
+    border: thick $accent;
+}
+"""
+
 # --- Logging Setup ---
 log_queue = queue.Queue()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -64,32 +110,12 @@ class TextualLogHandler(logging.Handler):
 
 # --- Background Task Messages ---
 # Use classes or dictionaries for clearer message structure
-class UpdateMetricsMessage(Message):
-    """Message to update metrics in the UI."""
-    def __init__(self, metrics):
-        super().__init__()
-        self.metrics = metrics
-
 class LogMessage(Message):
     """Message to log text in the UI."""
     def __init__(self, message):
         super().__init__()
         self.message = message
 
-class NotificationMessage(Message):
-    """Message to display a notification in the UI."""
-    def __init__(self, message, level="info"):
-        """
-        Initialize notification message.
-        
-        Args:
-            message: The notification text
-            level: Severity level ("info", "warning", "error", "success")
-        """
-        super().__init__()
-        self.message = message
-        self.level = level
-
 class ConnectionStatusMessage(Message):
     """Message to update connection status in the UI."""
     def __init__(self, status, error_message=""):
@@ -115,76 +141,6 @@ class UpdatePositionHistoryMessage(Message):
         super().__init__()
         self.history = history
 
-# --- Notification Widget ---
-class NotificationWidget(Static):
-    """Widget for displaying notifications and alerts."""
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.auto_hide = True
-        self.auto_hide_time = 5  # Default time in seconds
-        self.notification_queue = []
-        self.current_timer = None
-        self.current_priority = 0  # 0=info, 1=success, 2=warning, 3=error
-        
-    def show_notification(self, message, level="info"):
-        """
-        Display a notification with the specified level.
-        
-        Args:
-            message: The notification text
-            level: Severity level ("info", "warning", "error", "success")
-        """
-        # Map levels to styles and priorities
-        style_map = {
-            "info": ("bold blue", 0),
-            "success": ("bold green", 1),
-            "warning": ("bold yellow", 2),
-            "error": ("bold red on white", 3),
-        }
-        
-        style, priority = style_map.get(level, ("bold blue", 0))
-        
-        # If a higher priority notification is showing, queue this one
-        if self.visible and priority <= self.current_priority:
-            self.notification_queue.append({
-                "message": message,
-                "level": level,
-                "priority": priority
-            })
-            return
-            
-        # If we're replacing a current notification, check if a timer exists
-        # but don't explicitly cancel it to avoid the AttributeError
-        if self.current_timer:
-            # self.cancel_timer(self.current_timer) # Removed problematic line causing AttributeError
-            self.current_timer = None # Still clear the handle reference so we don't try to cancel it later
-        
-        # Update with the new notification
-        self.update(f"[{style}]{message}[/]")
-        self.current_priority = priority
-        
-        # Make widget visible
-        self.visible = True
-        
-        # Auto-hide after a delay
-        if self.auto_hide:
-            self.current_timer = self.set_timer(self.auto_hide_time, self.clear_notification)
-    
-    def clear_notification(self):
-        """Clear the current notification."""
-        self.current_timer = None
-        self.visible = False
-        self.update("")
-        self.current_priority = 0
-        
-        # If there are queued notifications, show the next one
-        if self.notification_queue:
-            # Sort by priority (highest first)
-            self.notification_queue.sort(key=lambda x: x["priority"], reverse=True)
-            next_notification = self.notification_queue.pop(0)
-            self.show_notification(next_notification["message"], next_notification["level"])
-
 @dataclass
 class UIUpdateState:
     """Track UI update state to prevent flicker."""
@@ -194,21 +150,6 @@ class UIUpdateState:
     log_batch: deque = field(default_factory=lambda: deque(maxlen=100))
     last_log_batch_update: float = 0.0
 
-# --- Metrics Data Structure ---
-# Example - adjust based on actual data needed
-class Metrics:
-    def __init__(self):
-        self.symbol = config.DEFAULT_SYMBOL
-        self.current_price: Decimal | None = None
-        self.rsi: float | None = None
-        self.prediction: str | None = None # e.g., 'LONG', 'SHORT', 'HOLD'
-        self.position_size: Decimal | None = None
-        self.entry_price: Decimal | None = None
-        self.pnl_percent: float | None = None
-        self.timestamp = time.time()
-        self.chart_data = None  # For storing OHLCV data for charts
-        self.position_history = []  # For storing position history
-
 # --- Textual App ---
 class TradingBotApp(App):
     """A Textual app for the Leverage Trading Bot."""
@@ -245,6 +186,7 @@ class TradingBotApp(App):
         self.stop_event = threading.Event()
         self.command_queue = queue.Queue()  # Queue for app -> background thread commands
         self.ui_state = UIUpdateState()  # Track UI update state
+        self._metrics_rows = None  # Latest pre-formatted metrics rows from UpdateMetricsMessage
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -273,6 +215,10 @@ class TradingBotApp(App):
 
         app_logger.info("Trading Bot App initializing...")
 
+        # Apply the configured theme here rather than in __init__, so a bad theme
+        # setting falls back in place instead of forcing a full app restart
+        self._apply_configured_theme()
+
         # Setup Metrics Table
         self.metrics_table.add_column("Metric", key="metric")
         self.metrics_table.add_column("Value", key="value")
@@ -295,6 +241,17 @@ class TradingBotApp(App):
         self.set_interval(LOG_UPDATE_INTERVAL, self.process_log_queue)
         self.set_interval(UI_UPDATE_INTERVAL, self.check_pending_updates)
 
+    def _apply_configured_theme(self) -> None:
+        """Apply config.CURRENT_THEME, reverting to the default theme if it cannot be applied."""
+        theme_name = config.CURRENT_THEME
+        try:
+            # Always applied: the registered themes only take effect once assigned to the app
+            self.theme_manager.set_theme(theme_name, notify=False)
+        except Exception as e:
+            app_logger.warning(f"Could not apply theme '{theme_name}': {e}. Using default theme.")
+            config.CURRENT_THEME = ThemeManager.DEFAULT_THEME
+            self.theme_manager.set_theme(ThemeManager.DEFAULT_THEME, notify=False)
+
     def process_log_queue(self) -> None:
         """Process logs from the background thread but batch updates."""
         batch_update_time = 0.2  # Batch log updates
@@ -377,59 +334,10 @@ class TradingBotApp(App):
 
     def _do_metrics_update(self) -> None:
         """Actually perform the metrics table update."""
-        metrics = self.current_metrics
+        rows = self._metrics_rows or format_metrics_rows(self.current_metrics)
         self.metrics_table.clear(columns=False)  # Keep columns, clear rows
-        
-        # Add rows with appropriate styling
-        self.metrics_table.add_row("Symbol", metrics.symbol or "N/A", key="symbol")
-        
-        # Format timestamp
-        timestamp_formatted = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(metrics.timestamp))
-        self.metrics_table.add_row("Timestamp", timestamp_formatted, key="timestamp")
-        
-        # Format price with color (green if up from previous, red if down)
-        price_text = f"{metrics.current_price:.4f}" if metrics.current_price else "N/A"
-        self.metrics_table.add_row("Current Price", Text(price_text, style="bold green" if metrics.current_price else ""), key="price")
-        
-        # Format RSI with color (green if bullish, red if overbought)
-        if metrics.rsi is not None:
-            rsi_text = f"{metrics.rsi:.2f}"
-            if metrics.rsi < 30:  # Oversold
-                rsi_style = "bold green"
-            elif metrics.rsi > 70:  # Overbought
-                rsi_style = "bold red"
-            else:  # Neutral
-                rsi_style = "bold yellow"
-            self.metrics_table.add_row("RSI", Text(rsi_text, style=rsi_style), key="rsi")
-        else:
-            self.metrics_table.add_row("RSI", "N/A", key="rsi")
-        
-        # Format prediction with color based on signal
-        if metrics.prediction:
-            prediction_text = metrics.prediction
-            if "LONG" in prediction_text:
-                prediction_style = "bold green"
-            elif "SHORT" in prediction_text:
-                prediction_style = "bold red"
-            else:
-                prediction_style = "bold white"
-            self.metrics_table.add_row("Prediction", Text(prediction_text, style=prediction_style), key="prediction")
-        else:
-            self.metrics_table.add_row("Prediction", "N/A", key="prediction")
-        
-        # Position size
-        self.metrics_table.add_row("Position Size", f"{metrics.position_size}" if metrics.position_size else "N/A", key="pos_size")
-        
-        # Entry price
-        self.metrics_table.add_row("Entry Price", f"{metrics.entry_price:.4f}" if metrics.entry_price else "N/A", key="entry")
-        
-        # PnL with color (green for profit, red for loss)
-        if metrics.pnl_percent is not None:
-            pnl_text = f"{metrics.pnl_percent:.2f}%"
-            pnl_style = "bold green" if metrics.pnl_percent >= 0 else "bold red"
-            self.metrics_table.add_row("PnL (%)", Text(pnl_text, style=pnl_style), key="pnl")
-        else:
-            self.metrics_table.add_row("PnL (%)", "N/A", key="pnl")
+        for label, value, key in rows:
+            self.metrics_table.add_row(label, value, key=key)
             
         app_logger.debug("Metrics table updated.")  # Debug level for frequent updates
         
@@ -440,16 +348,17 @@ class TradingBotApp(App):
     # --- Message Handlers ---
     def on_update_metrics_message(self, message: UpdateMetricsMessage) -> None:
         """Handles metric updates from the background thread."""
-        app_logger.debug(f"Received metrics update: {message.metrics}")
+        app_logger.debug("Received metrics update: %s", message.metrics)
+        self._metrics_rows = message.rows  # Pre-formatted on the background thread
         self.current_metrics = message.metrics  # Update reactive variable
         
-        # Update mini chart if it's visible
-        if self.mini_chart_widget.visible and hasattr(message.metrics, 'chart_data'):
-            self.mini_chart_widget.update_data(message.metrics.chart_data)
+        # Hand the chart its data; it only draws while visible
+        if hasattr(message.metrics, 'chart_data'):
+            self.mini_chart_widget.update_data(message.metrics.chart_data, symbol=message.metrics.symbol)
         
     def on_notification_message(self, message: NotificationMessage) -> None:
         """Handles notification messages."""
-        app_logger.debug(f"Received notification: {message.message} ({message.level})")
+        app_logger.debug("Received notification: %s (%s)", message.message, message.level)
         
         # Prioritize notifications - errors stay longer
         if message.level == "error":
@@ -464,7 +373,7 @@ class TradingBotApp(App):
         
     def on_connection_status_message(self, message: ConnectionStatusMessage) -> None:
         """Handles connection status updates."""
-        app_logger.debug(f"Received connection status update: {message.status}")
+        app_logger.debug("Received connection status update: %s", message.status)
         self.connection_status_widget.update_status(message.status, message.error_message)
         
         # Also show a notification for important status changes
@@ -477,22 +386,25 @@ class TradingBotApp(App):
     
     def on_update_position_history_message(self, message: UpdatePositionHistoryMessage) -> None:
         """Handle position history updates from the background thread."""
-        app_logger.debug(f"Received position history update with {len(message.history)} entries")
+        app_logger.debug("Received position history update with %d entries", len(message.history))
         self.position_history_widget.update_history(message.history)
 
-    def on_setting_changed_message(self, message: SettingChangedMessage) -> None:
+    def on_settings_changed_message(self, message: SettingsChangedMessage) -> None:
         """Handle setting changes from the settings panel."""
-        app_logger.info(f"Setting changed: {message.setting_name} = {message.new_value}")
+        settings = dict(message.settings)
+        app_logger.info(f"Settings changed: {settings}")
         
-        # Handle theme changes
-        if message.setting_name == "THEME":
-            self.theme_manager.set_theme(message.new_value)
+        # Theme changes are applied here on the UI thread
+        theme = settings.pop("THEME", None)
+        if theme is not None:
+            self.theme_manager.set_theme(theme)
         
-        # Send settings update to background thread
-        self.command_queue.put({"command": "update_setting", "setting": message.setting_name, "value": message.new_value})
+        # Send the remaining changes to the background thread as one command
+        if settings:
+            self.command_queue.put({"command": "update_settings", "settings": settings})
         
         # Notify the user
-        self.notification_widget.show_notification(f"Setting updated: {message.setting_name}", "info")
+        self.notification_widget.show_notification(f"Settings updated: {', '.join(message.settings)}", "info")
         
     def on_theme_changed_message(self, message: ThemeChangedMessage) -> None:
         """Handle theme change notifications."""
@@ -606,334 +518,310 @@ def run_trading_logic(command_queue: queue.Queue, post_message_callback, stop_ev
     stats_handler = None
     
     # Error tracking for throttling
-    last_prediction_error_time = 0
-    last_prediction_error_msg = ""
+    last_prediction_error_time = 0.0 # time.monotonic() of the last reported error
+    last_prediction_error_hash = 0   # hash of the last reported error message
     
     try:
-        mexc = MEXCHandler(api_key=config.MEXC_API_KEY, secret_key=config.MEXC_SECRET_KEY, test_mode=config.ENABLE_TEST_MODE)
+        mexc = MEXCHandler(api_key=config.MEXC_API_KEY, secret_key=config.MEXC_SECRET_KEY, test_mode=config.ENABLE_TEST_MODE,
+                           prime_dns=True)
         data_handler = DataHandler(mexc, symbol=config.DEFAULT_SYMBOL, timeframe=config.DEFAULT_TIMEFRAME)
         indicator_handler = IndicatorHandler()
         trade_executor = TradeExecutor(mexc, symbol=config.DEFAULT_SYMBOL, leverage=config.DEFAULT_LEVERAGE)
         stats_handler = StatsHandler() # Initialize your stats handler
+        if config.ENABLE_PRICE_STREAM:
+            mexc.start_price_stream(config.DEFAULT_SYMBOL)
+            mexc.start_ohlcv_stream(config.DEFAULT_SYMBOL, config.DEFAULT_TIMEFRAME)
         app_logger.info("Background thread: Handlers initialized successfully.")
         post_message_callback(ConnectionStatusMessage("connected"))
     except Exception as e:
         app_logger.critical(f"Background thread: Failed to initialize handlers: {e}. Stopping thread.")
         post_message_callback(ConnectionStatusMessage("error", str(e)))
+        if mexc is not None:
+            mexc.close() # A handler built before the failure still holds a session and worker threads
         return # Stop the thread if handlers fail
 
-    last_data_fetch = 0
-    last_prediction_run = 0
-    last_connection_check = 0
-    current_position = None # Track current position state (e.g., dict from trade_executor)
-    ohlcv = None # Store fetched OHLCV data
+    try:
+        last_data_fetch = 0
+        last_prediction_run = 0
+        last_connection_check = 0
+        current_position = None # Track current position state (e.g., dict from trade_executor)
+        ohlcv = None # Store fetched OHLCV data
 
-    metrics = Metrics()
-    metrics.symbol = config.DEFAULT_SYMBOL # Set symbol initially
+        metrics = Metrics()
+        metrics.symbol = config.DEFAULT_SYMBOL # Set symbol initially
 
-    app_logger.info("Background thread: Starting main loop.")
+        app_logger.info("Background thread: Starting main loop.")
 
-    while not stop_event.is_set():
-        now = time.time()
-        command = None
+        while not stop_event.is_set():
+            now = time.time()
+            command = None
 
-        # --- Check for commands from the main app ---
-        try:
-            command = command_queue.get_nowait()
-            if isinstance(command, ManualTradeMessage):
-                app_logger.info(f"Background thread: Received manual {command.side} trade command.")
-                # --- Execute Manual Trade --- Integrate with TradeExecutor
-                try:
-                    result = trade_executor.execute_manual_trade(command.side, config.TRADE_AMOUNT_BASE)
-                    if result:
-                        current_position = result # Update position state (assuming result is position info dict)
-                        app_logger.info(f"Manual {command.side} trade executed: {result}")
-                        metrics.position_size = result.get('size') # Adjust keys based on actual return value
-                        metrics.entry_price = result.get('entry_price') # Adjust keys
-                        metrics.prediction = f"Manual {command.side.upper()}" # Update status
-                        metrics.pnl_percent = None # Reset PnL on new trade
-                        # Send notification for successful trade
-                        post_message_callback(NotificationMessage(f"Manual {command.side.upper()} trade executed", "success"))
-                    else:
-                        app_logger.error(f"Manual {command.side} trade failed.")
-                        # Send notification for failed trade
-                        post_message_callback(NotificationMessage(f"Manual {command.side.upper()} trade failed", "error"))
-                        # Keep old prediction/state or set to failed?
-                        # metrics.prediction = f"Manual {command.side.upper()} FAILED"
-                except Exception as trade_error:
-                    app_logger.error(f"Background thread: Error executing manual trade: {trade_error}")
-                    # Send notification for error
-                    post_message_callback(NotificationMessage(f"Error executing trade: {str(trade_error)}", "error"))
-                # --- End Execute Manual Trade ---
-            elif isinstance(command, dict):
-                # Handle dictionary-based commands
-                if command.get("command") == "refresh_data":
-                    app_logger.info("Background thread: Manual data refresh requested")
+            # --- Check for commands from the main app ---
+            try:
+                command = command_queue.get_nowait()
+                if isinstance(command, ManualTradeMessage):
+                    app_logger.info(f"Background thread: Received manual {command.side} trade command.")
+                    # --- Execute Manual Trade --- Integrate with TradeExecutor
                     try:
-                        # Force immediate data fetch
-                        fetched_ohlcv = data_handler.fetch_ohlcv()
-                        if fetched_ohlcv is not None and not fetched_ohlcv.empty:
-                            ohlcv = fetched_ohlcv  # Store the fetched data
-                            current_price = data_handler.get_current_price(ohlcv)
-                            if current_price:
-                                metrics.current_price = current_price
-                                metrics.chart_data = ohlcv  # Store for charts
-                                app_logger.info(f"Background thread: Data fetched. Current price: {current_price}")
-                                post_message_callback(NotificationMessage("Data refreshed successfully", "success"))
-                            else:
-                                app_logger.warning("Background thread: Could not determine current price from OHLCV.")
-                                post_message_callback(NotificationMessage("Could not determine current price", "warning"))
+                        result = trade_executor.execute_manual_trade(command.side, config.TRADE_AMOUNT_BASE)
+                        if result:
+                            current_position = result # Update position state (assuming result is position info dict)
+                            app_logger.info(f"Manual {command.side} trade executed: {result}")
+                            metrics.position_size = result.get('size') # Adjust keys based on actual return value
+                            metrics.entry_price = result.get('entry_price') # Adjust keys
+                            metrics.prediction = f"Manual {command.side.upper()}" # Update status
+                            metrics.pnl_percent = None # Reset PnL on new trade
+                            # Send notification for successful trade
+                            post_message_callback(NotificationMessage(f"Manual {command.side.upper()} trade executed", "success"))
                         else:
-                            app_logger.warning("Background thread: No OHLCV data fetched.")
-                            post_message_callback(NotificationMessage("No data fetched", "warning"))
-                    except Exception as e:
-                        app_logger.error(f"Background thread: Error refreshing data: {e}")
-                        post_message_callback(NotificationMessage(f"Error refreshing data: {str(e)}", "error"))
-                elif command.get("command") == "update_setting":
-                    # Handle setting updates
-                    setting_name = command.get("setting")
-                    new_value = command.get("value")
-                    app_logger.info(f"Background thread: Setting update {setting_name}={new_value}")
-                    
-                    # Apply setting changes
-                    try:
-                        if hasattr(config, setting_name):
-                            setattr(config, setting_name, new_value)
-                            app_logger.info(f"Background thread: Updated setting {setting_name}={new_value}")
-                            
-                            # Apply specific setting changes immediately if needed
-                            if setting_name == "DEFAULT_SYMBOL":
-                                # Update data handler for new symbol
-                                data_handler = DataHandler(mexc, symbol=new_value, timeframe=config.DEFAULT_TIMEFRAME)
-                                trade_executor = TradeExecutor(mexc, symbol=new_value, leverage=config.DEFAULT_LEVERAGE)
-                                metrics.symbol = new_value
-                            elif setting_name == "DEFAULT_TIMEFRAME":
-                                # Update data handler for new timeframe
-                                data_handler = DataHandler(mexc, symbol=config.DEFAULT_SYMBOL, timeframe=new_value)
-                            elif setting_name == "DEFAULT_LEVERAGE":
-                                # Update trade executor for new leverage
-                                trade_executor = TradeExecutor(mexc, symbol=config.DEFAULT_SYMBOL, leverage=new_value)
+                            app_logger.error(f"Manual {command.side} trade failed.")
+                            # Send notification for failed trade
+                            post_message_callback(NotificationMessage(f"Manual {command.side.upper()} trade failed", "error"))
+                            # Keep old prediction/state or set to failed?
+                            # metrics.prediction = f"Manual {command.side.upper()} FAILED"
+                    except Exception as trade_error:
+                        app_logger.error(f"Background thread: Error executing manual trade: {trade_error}")
+                        # Send notification for error
+                        post_message_callback(NotificationMessage(f"Error executing trade: {str(trade_error)}", "error"))
+                    # --- End Execute Manual Trade ---
+                elif isinstance(command, dict):
+                    # Handle dictionary-based commands
+                    if command.get("command") == "refresh_data":
+                        app_logger.info("Background thread: Manual data refresh requested")
+                        try:
+                            # Force immediate data fetch
+                            fetched_ohlcv = data_handler.fetch_ohlcv()
+                            if fetched_ohlcv is not None and not fetched_ohlcv.empty:
+                                ohlcv = fetched_ohlcv  # Store the fetched data
+                                current_price = data_handler.get_current_price(ohlcv)
+                                if current_price:
+                                    metrics.current_price = current_price
+                                    metrics.chart_data = ohlcv  # Store for charts
+                                    app_logger.info(f"Background thread: Data fetched. Current price: {current_price}")
+                                    post_message_callback(NotificationMessage("Data refreshed successfully", "success"))
+                                else:
+                                    app_logger.warning("Background thread: Could not determine current price from OHLCV.")
+                                    post_message_callback(NotificationMessage("Could not determine current price", "warning"))
+                            else:
+                                app_logger.warning("Background thread: No OHLCV data fetched.")
+                                post_message_callback(NotificationMessage("No data fetched", "warning"))
+                        except Exception as e:
+                            app_logger.error(f"Background thread: Error refreshing data: {e}")
+                            post_message_callback(NotificationMessage(f"Error refreshing data: {str(e)}", "error"))
+                    elif command.get("command") == "update_settings":
+                        # Handle setting updates, all changes from one save at a time
+                        updated = []
+                        for setting_name, new_value in command.get("settings", {}).items():
+                            app_logger.info(f"Background thread: Setting update {setting_name}={new_value}")
+                        
+                            # Apply setting changes
+                            try:
+                                if hasattr(config, setting_name):
+                                    setattr(config, setting_name, new_value)
+                                    app_logger.info(f"Background thread: Updated setting {setting_name}={new_value}")
                                 
-                            post_message_callback(NotificationMessage(f"Setting {setting_name} updated", "success"))
-                        else:
-                            app_logger.warning(f"Background thread: Unknown setting {setting_name}")
-                            post_message_callback(NotificationMessage(f"Unknown setting: {setting_name}", "warning"))
-                    except Exception as e:
-                        app_logger.error(f"Background thread: Error updating setting {setting_name}: {e}")
-                        post_message_callback(NotificationMessage(f"Error updating setting: {str(e)}", "error"))
-
-            command_queue.task_done()
-        except queue.Empty:
-            pass # No command waiting
-        except Exception as e:
-            app_logger.error(f"Background thread: Error processing command: {e}")
+                                    # Apply specific setting changes immediately if needed
+                                    # Handlers share the single MEXCHandler (and its HTTP session); only
+                                    # the trade executor needs rebuilding, since it loads per-symbol market details
+                                    if setting_name == "DEFAULT_SYMBOL":
+                                        data_handler.symbol = new_value
+                                        if config.ENABLE_PRICE_STREAM:
+                                            mexc.start_price_stream(new_value)
+                                            mexc.start_ohlcv_stream(new_value, data_handler.timeframe)
+                                        trade_executor = TradeExecutor(mexc, symbol=new_value, leverage=config.DEFAULT_LEVERAGE)
+                                        metrics.symbol = new_value
+                                    elif setting_name == "DEFAULT_TIMEFRAME":
+                                        data_handler.timeframe = new_value
+                                        if config.ENABLE_PRICE_STREAM:
+                                            mexc.start_ohlcv_stream(data_handler.symbol, new_value)
+                                    elif setting_name == "DEFAULT_LEVERAGE":
+                                        if mexc.set_leverage(trade_executor.symbol, new_value):
+                                            trade_executor.leverage = new_value
+                                
+                                    updated.append(setting_name)
+                                else:
+                                    app_logger.warning(f"Background thread: Unknown setting {setting_name}")
+                                    post_message_callback(NotificationMessage(f"Unknown setting: {setting_name}", "warning"))
+                            except Exception as e:
+                                app_logger.error(f"Background thread: Error updating setting {setting_name}: {e}")
+                                post_message_callback(NotificationMessage(f"Error updating setting: {str(e)}", "error"))
+                    
+                        if updated:
+                            post_message_callback(NotificationMessage(f"Settings updated: {', '.join(updated)}", "success"))
 
-        # --- Check API connection periodically ---
-        if now - last_connection_check >= CONNECTION_CHECK_INTERVAL:
-            try:
-                # Simple check - try to get the current price directly
-                connection_test = mexc.get_current_price(config.DEFAULT_SYMBOL)
-                if connection_test:
-                    post_message_callback(ConnectionStatusMessage("connected"))
-                else:
-                    app_logger.warning("Background thread: Connection test failed - null result.")
-                    post_message_callback(ConnectionStatusMessage("error", "API returned null result"))
-            except Exception as conn_error:
-                app_logger.error(f"Background thread: Connection test failed: {conn_error}")
-                post_message_callback(ConnectionStatusMessage("error", str(conn_error)))
+                command_queue.task_done()
+            except queue.Empty:
+                pass # No command waiting
+            except Exception as e:
+                app_logger.error(f"Background thread: Error processing command: {e}")
+
+            symbol = metrics.symbol # Resolved once per iteration, after any setting change above
+
+            # --- Check API connection periodically ---
+            if now - last_connection_check >= CONNECTION_CHECK_INTERVAL:
+                try:
+                    # Simple check - try to get the current price directly
+                    connection_test = mexc.get_current_price(symbol)
+                    if connection_test:
+                        post_message_callback(ConnectionStatusMessage("connected"))
+                    else:
+                        app_logger.warning("Background thread: Connection test failed - null result.")
+                        post_message_callback(ConnectionStatusMessage("error", "API returned null result"))
+                except Exception as conn_error:
+                    app_logger.error(f"Background thread: Connection test failed: {conn_error}")
+                    post_message_callback(ConnectionStatusMessage("error", str(conn_error)))
             
-            last_connection_check = now
+                last_connection_check = now
 
-        # --- Fetch Data Periodically ---
-        if now - last_data_fetch >= config.DATA_FETCH_INTERVAL_SECONDS:
-            try:
-                app_logger.debug("Background thread: Fetching market data...")
-                # --- Fetch Data --- Integrate with DataHandler
-                fetched_ohlcv = data_handler.fetch_ohlcv()
-                if fetched_ohlcv is None or fetched_ohlcv.empty:
-                    app_logger.warning("Background thread: No OHLCV data fetched.")
-                    # Keep using old data? Or wait?
-                    # time.sleep(1) # Avoid busy-waiting if fetch fails - handled by main loop sleep
-                else:
-                    ohlcv = fetched_ohlcv # Store the fetched data
-                    current_price = data_handler.get_current_price(ohlcv)
-                    if current_price:
-                        metrics.current_price = current_price
-                        metrics.chart_data = ohlcv  # Store for charts
-                        app_logger.debug(f"Background thread: Data fetched. Current price: {current_price}")
+            # --- Fetch Data Periodically ---
+            if now - last_data_fetch >= config.DATA_FETCH_INTERVAL_SECONDS:
+                try:
+                    app_logger.debug("Background thread: Fetching market data...")
+                    # --- Fetch Data --- Integrate with DataHandler
+                    fetched_ohlcv = data_handler.fetch_ohlcv()
+                    if fetched_ohlcv is None or fetched_ohlcv.empty:
+                        app_logger.warning("Background thread: No OHLCV data fetched.")
+                        # Keep using old data? Or wait?
+                        # time.sleep(1) # Avoid busy-waiting if fetch fails - handled by main loop sleep
                     else:
-                         app_logger.warning("Background thread: Could not determine current price from OHLCV.")
-                         # metrics.current_price = None # Or keep the old one?
-                # --- End Fetch Data ---
-                # Removed dummy data assignment
-                last_data_fetch = now
+                        ohlcv = fetched_ohlcv # Store the fetched data
+                        current_price = data_handler.get_current_price(ohlcv)
+                        if current_price:
+                            metrics.current_price = current_price
+                            if trade_executor:
+                                trade_executor.update_price(current_price)
+                            metrics.chart_data = ohlcv  # Store for charts
+                            app_logger.debug("Background thread: Data fetched. Current price: %s", current_price)
+                        else:
+                             app_logger.warning("Background thread: Could not determine current price from OHLCV.")
+                             # metrics.current_price = None # Or keep the old one?
+                    # --- End Fetch Data ---
+                    # Removed dummy data assignment
+                    last_data_fetch = now
 
-            except Exception as e:
-                app_logger.error(f"Background thread: Error fetching data: {e}")
-                post_message_callback(ConnectionStatusMessage("error", f"Data fetch error: {str(e)}"))
-                time.sleep(config.DATA_FETCH_INTERVAL_SECONDS / 2) # Wait a bit before retrying
+                except Exception as e:
+                    app_logger.error(f"Background thread: Error fetching data: {e}")
+                    post_message_callback(ConnectionStatusMessage("error", f"Data fetch error: {str(e)}"))
+                    time.sleep(config.DATA_FETCH_INTERVAL_SECONDS / 2) # Wait a bit before retrying
 
 
-        # --- Run Prediction Logic Periodically --- Ensure data is available
-        if now - last_prediction_run >= config.PREDICTION_INTERVAL_SECONDS and ohlcv is not None and not ohlcv.empty and metrics.current_price is not None:
-            try:
-                app_logger.debug("Background thread: Running prediction logic...")
-                # --- Calculate Indicators & Predict --- Integrate with IndicatorHandler
-                indicators = indicator_handler.calculate_indicators(ohlcv)
-                if indicators is not None:  # We'll let generate_signal handle the DataFrame type
-                    prediction = indicator_handler.generate_signal(indicators)
-                    # Update metrics with indicator values if available
-                    if isinstance(indicators, pd.DataFrame) and not indicators.empty:
-                        metrics.rsi = indicators['rsi'].iloc[-1] if 'rsi' in indicators.columns else None
-                    elif isinstance(indicators, dict):
-                        metrics.rsi = indicators.get('rsi')
+            # --- Run Prediction Logic Periodically --- Ensure data is available
+            if now - last_prediction_run >= config.PREDICTION_INTERVAL_SECONDS and ohlcv is not None and not ohlcv.empty and metrics.current_price is not None:
+                try:
+                    app_logger.debug("Background thread: Running prediction logic...")
+                    # --- Calculate Indicators & Predict --- Integrate with IndicatorHandler
+                    ind_result = indicator_handler.calculate_indicators(ohlcv)
+                    if ind_result.is_valid:
+                        prediction = indicator_handler.generate_signal(ind_result)
+                        # Latest RSI comes precomputed with the result (NaN means not available yet)
+                        metrics.rsi = None if math.isnan(ind_result.rsi) else ind_result.rsi
                     
-                    metrics.prediction = prediction
-                    app_logger.debug(f"Background thread: Prediction: {prediction}, RSI: {metrics.rsi:.2f}" if metrics.rsi is not None else f"Prediction: {prediction}, RSI: N/A")
-                else:
-                     app_logger.warning("Background thread: Indicator calculation failed.")
-                     metrics.prediction = "Calc Error"
-                     metrics.rsi = None
-                     prediction = "HOLD" # Default to HOLD if calculation fails
-                # --- End Calculate Indicators & Predict ---
-
-                # --- Execute Automated Trade (if prediction warrants and no position) ---
-                if prediction in ['LONG', 'SHORT'] and not current_position: # Example logic: Only trade if flat
-                    # Add any additional checks, e.g., predicted move > threshold
-                    # predicted_move_pct = indicator_handler.get_predicted_move_pct(indicators) # Assuming this method exists
-                    # if predicted_move_pct is not None and abs(predicted_move_pct) > config.MIN_TAKE_PROFIT_PERCENT:
-                    app_logger.info(f"Background thread: Triggering automated {prediction} trade.")
-                    try:
-                        trade_result = trade_executor.execute_trade(
-                            side=prediction.lower(),
-                            amount=config.TRADE_AMOUNT_BASE,
-                            stop_loss_pct=config.STOP_LOSS_PERCENT,
-                            take_profit_pct=config.TAKE_PROFIT_PERCENT
-                        )
-                        if trade_result:
-                            current_position = trade_result # Update position state
-                            app_logger.info(f"Automated {prediction} trade executed: {trade_result}")
-                            metrics.position_size = trade_result.get('size') # Adjust keys
-                            metrics.entry_price = trade_result.get('entry_price') # Adjust keys
-                            metrics.pnl_percent = None # Reset PnL on new trade
+                        metrics.prediction = prediction
+                        if app_logger.isEnabledFor(logging.DEBUG):
+                            rsi_text = "N/A" if metrics.rsi is None else f"{metrics.rsi:.2f}"
+                            app_logger.debug("Background thread: Prediction: %s, RSI: %s", prediction, rsi_text)
+                    else:
+                         app_logger.warning("Background thread: Indicator calculation failed.")
+                         metrics.prediction = "Calc Error"
+                         metrics.rsi = None
+                         prediction = "HOLD" # Default to HOLD if calculation fails
+                    # --- End Calculate Indicators & Predict ---
+
+                    # --- Execute Automated Trade (if prediction warrants and no position) ---
+                    if prediction in ['LONG', 'SHORT'] and not current_position: # Example logic: Only trade if flat
+                        # Add any additional checks, e.g., predicted move > threshold
+                        # predicted_move_pct = indicator_handler.get_predicted_move_pct(indicators) # Assuming this method exists
+                        # if predicted_move_pct is not None and abs(predicted_move_pct) > config.MIN_TAKE_PROFIT_PERCENT:
+                        app_logger.info(f"Background thread: Triggering automated {prediction} trade.")
+                        try:
+                            trade_result = trade_executor.execute_trade(
+                                side=prediction.lower(),
+                                amount=config.TRADE_AMOUNT_BASE,
+                                stop_loss_pct=config.STOP_LOSS_PERCENT,
+                                take_profit_pct=config.TAKE_PROFIT_PERCENT,
+                                current_price=metrics.current_price # Already fetched this loop
+                            )
+                            if trade_result:
+                                current_position = trade_result # Update position state
+                                app_logger.info(f"Automated {prediction} trade executed: {trade_result}")
+                                metrics.position_size = trade_result.get('size') # Adjust keys
+                                metrics.entry_price = trade_result.get('entry_price') # Adjust keys
+                                metrics.pnl_percent = None # Reset PnL on new trade
                             
-                            # Add to position history when a position is closed
-                            if trade_result.get('status') == 'closed' and trade_result.get('exit_price'):
-                                # Format position for history
-                                position_history_entry = {
-                                    'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-                                    'symbol': metrics.symbol,
-                                    'side': trade_result.get('side', 'unknown'),
-                                    'size': trade_result.get('size', 0),
-                                    'entry_price': trade_result.get('entry_price', 0),
-                                    'exit_price': trade_result.get('exit_price', 0),
-                                    'pnl': trade_result.get('pnl', 0),
-                                    'duration': trade_result.get('duration', 'N/A')
-                                }
-                                # Add to history and limit size
-                                metrics.position_history.insert(0, position_history_entry)
-                                if len(metrics.position_history) > 50:  # Keep last 50 positions
-                                    metrics.position_history = metrics.position_history[:50]
-                                
-                                # Update position history widget if it exists
-                                post_message_callback(UpdatePositionHistoryMessage(metrics.position_history))
+                                # Add to position history when a position is closed
+                                if trade_result.get('status') == 'closed' and trade_result.get('exit_price'):
+                                    # Format position for history
+                                    position_history_entry = {
+                                        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                                        'symbol': metrics.symbol,
+                                        'side': trade_result.get('side', 'unknown'),
+                                        'size': trade_result.get('size', 0),
+                                        'entry_price': trade_result.get('entry_price', 0),
+                                        'exit_price': trade_result.get('exit_price', 0),
+                                        'pnl': trade_result.get('pnl', 0),
+                                        'duration': trade_result.get('duration', 'N/A')
+                                    }
+                                    # Add to history (deque maxlen drops the oldest entry)
+                                    metrics.position_history.appendleft(position_history_entry)
+
+                                    # Update position history widget with a snapshot, since the UI thread iterates it
+                                    post_message_callback(UpdatePositionHistoryMessage(list(metrics.position_history)))
                             
-                            # Send notification for successful automated trade
-                            post_message_callback(NotificationMessage(f"Automated {prediction} trade executed", "success"))
-                        else:
-                            app_logger.error(f"Automated {prediction} trade failed.")
-                            # Send notification for failed automated trade
-                            post_message_callback(NotificationMessage(f"Automated {prediction} trade failed", "error"))
-                    except Exception as auto_trade_error:
-                         app_logger.error(f"Background thread: Error executing automated trade: {auto_trade_error}")
-                         # Send notification for error
-                         post_message_callback(NotificationMessage(f"Error executing trade: {str(auto_trade_error)}", "error"))
-                    # else:
-                    #    app_logger.debug(f"Automated {prediction} signal ignored: Predicted move too small.")
-                elif current_position and prediction != 'HOLD':
-                    # Optional: Log if signal contradicts current position but not acting
-                    current_side = current_position.get('side', 'unknown').upper()
-                    if (prediction == 'LONG' and current_side != 'BUY') or \
-                       (prediction == 'SHORT' and current_side != 'SELL'):
-                        app_logger.debug(f"Signal {prediction} contradicts current {current_side} position. Holding.")
-                # --- End Execute Automated Trade ---
-
-                # Update UI with current metrics
-                post_message_callback(UpdateMetricsMessage(metrics))
-                last_prediction_run = now
-            except Exception as e:
-                error_msg = str(e)
-                current_time = time.time()
+                                # Send notification for successful automated trade
+                                post_message_callback(NotificationMessage(f"Automated {prediction} trade executed", "success"))
+                            else:
+                                app_logger.error(f"Automated {prediction} trade failed.")
+                                # Send notification for failed automated trade
+                                post_message_callback(NotificationMessage(f"Automated {prediction} trade failed", "error"))
+                        except Exception as auto_trade_error:
+                             app_logger.error(f"Background thread: Error executing automated trade: {auto_trade_error}")
+                             # Send notification for error
+                             post_message_callback(NotificationMessage(f"Error executing trade: {str(auto_trade_error)}", "error"))
+                        # else:
+                        #    app_logger.debug(f"Automated {prediction} signal ignored: Predicted move too small.")
+                    elif current_position and prediction != 'HOLD':
+                        # Optional: Log if signal contradicts current position but not acting
+                        current_side = current_position.get('side', 'unknown').upper()
+                        if (prediction == 'LONG' and current_side != 'BUY') or \
+                           (prediction == 'SHORT' and current_side != 'SELL'):
+                            app_logger.debug("Signal %s contradicts current %s position. Holding.", prediction, current_side)
+                    # --- End Execute Automated Trade ---
+
+                    # Update UI with current metrics
+                    post_message_callback(UpdateMetricsMessage(metrics))
+                    last_prediction_run = now
+                except Exception as e:
+                    error_msg = str(e)
+                    error_hash = hash(error_msg)
+                    current_time = time.monotonic() # Immune to wall-clock jumps
                 
-                # Only log and notify about errors if different from the last one or enough time has passed
-                if (error_msg != last_prediction_error_msg or 
-                    current_time - last_prediction_error_time >= PREDICTION_ERROR_THROTTLE):
-                    app_logger.error(f"Background thread: Error in prediction logic: {error_msg}")
-                    post_message_callback(NotificationMessage(f"Prediction error: {error_msg}", "error"))
-                    last_prediction_error_msg = error_msg
-                    last_prediction_error_time = current_time
-
-        # Slight delay to avoid burning CPU
-        time.sleep(0.1)
+                    # Only log and notify about errors if different from the last one or enough time has passed
+                    if (error_hash != last_prediction_error_hash or 
+                        current_time - last_prediction_error_time >= PREDICTION_ERROR_THROTTLE):
+                        app_logger.error(f"Background thread: Error in prediction logic: {error_msg}")
+                        post_message_callback(NotificationMessage(f"Prediction error: {error_msg}", "error"))
+                        last_prediction_error_hash = error_hash
+                        last_prediction_error_time = current_time
+
+            # Slight delay to avoid burning CPU
+            time.sleep(0.1)
+    finally:
+        mexc.close() # Release the session, worker threads and streams whichever way the loop ends
 
     app_logger.info("Background thread: Stopping.")
 
 
 if __name__ == "__main__":
-    # Create a basic CSS file if it doesn't exist
+    # Create the default CSS file unless one already exists (single exclusive create)
     css_file_path = "main.css"
-    if not os.path.exists(css_file_path):
-        css_content = """
-Screen {
-    layout: vertical;
-}
-
-Header {
-    dock: top;
-    height: 1;
-}
-
-Footer {
-    dock: bottom;
-    height: 1;
-}
-
-.notification {
-    background: $surface;
-    height: 1;
-    dock: top;
-    text-align: center;
-    margin: 0 2;
-}
-
-#main-container {
-    grid-size: 2;
-    grid-gutter: 1 2;
-    grid-rows: auto 1fr; /* Metrics table auto height, Log takes rest */
-    padding: 1; /* Add some padding around the container */
-}
-
-DataTable {
-    width: 1fr;
-    /* Removed fixed height, let it adjust or set via grid */
-    border: thick $accent;
-    margin-bottom: 1; /* Add space below the table */
-}
-
-RichLog {
-    width: 1fr;
-    height: 1fr; /* Take remaining vertical space */
-    border: thick $accent;
-}
-"""
-        try:
-            with open(css_file_path, "w") as f:
-                f.write(css_content)
-            print(f"Created default CSS file: {css_file_path}")
-        except IOError as e:
-            print(f"Warning: Could not write {css_file_path}: {e}")
-    else:
-         print(f"CSS file already exists: {css_file_path}")
+    try:
+        with open(css_file_path, "xb") as f:
+            f.write(CSS_BYTES)
+        print(f"Created default CSS file: {css_file_path}")
+    except FileExistsError:
+        pass
+    except OSError as e:
+        print(f"Warning: Could not write {css_file_path}: {e}")
 
 
     # Run the app
@@ -943,7 +831,7 @@ RichLog {
     except Exception as e:
         print(f"Error starting app: {e}")
         print("Attempting to start app with fallback settings...")
-        # Update config to use guaranteed working values
-        config.CURRENT_THEME = "default_val"
+        # Theme problems are already recovered in on_mount; a fresh app is the last resort
+        config.CURRENT_THEME = ThemeManager.DEFAULT_THEME
         app = TradingBotApp()
-        app.run() 
\ No newline at end of file
+        app.run()
@@ -0,0 +1,96 @@
+"""
+Metrics shown in the TUI and the message that carries them from the background thread.
+
+Kept apart from src.main so code that only needs these data types does not import the
+exchange, data and trading modules.
+"""
+import time
+from collections import deque
+from decimal import Decimal
+
+from rich.text import Text
+from textual.message import Message
+
+import src.config as config
+
+POSITION_HISTORY_LIMIT = 50  # Number of closed positions kept for the history widget
+
+# --- Metrics Data Structure ---
+# Example - adjust based on actual data needed
+class Metrics:
+    def __init__(self):
+        self.symbol = config.DEFAULT_SYMBOL
+        self.current_price: Decimal | None = None
+        self.rsi: float | None = None
+        self.prediction: str | None = None # e.g., 'LONG', 'SHORT', 'HOLD'
+        self.position_size: Decimal | None = None
+        self.entry_price: Decimal | None = None
+        self.pnl_percent: float | None = None
+        self.timestamp = time.time()
+        self.chart_data = None  # For storing OHLCV data for charts
+        self.position_history = deque(maxlen=POSITION_HISTORY_LIMIT)  # Newest first, oldest evicted automatically
+
+def format_metrics_rows(metrics: Metrics) -> tuple:
+    """Format metrics into (label, cell, key) rows for the metrics table."""
+    rows = []
+
+    rows.append(("Symbol", metrics.symbol or "N/A", "symbol"))
+
+    # Format timestamp
+    timestamp_formatted = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(metrics.timestamp))
+    rows.append(("Timestamp", timestamp_formatted, "timestamp"))
+
+    # Format price with color (green if up from previous, red if down)
+    price_text = f"{metrics.current_price:.4f}" if metrics.current_price else "N/A"
+    rows.append(("Current Price", Text(price_text, style="bold green" if metrics.current_price else ""), "price"))
+
+    # Format RSI with color (green if bullish, red if overbought)
+    if metrics.rsi is not None:
+        rsi_text = f"{metrics.rsi:.2f}"
+        if metrics.rsi < 30:  # Oversold
+            rsi_style = "bold green"
+        elif metrics.rsi > 70:  # Overbought
+            rsi_style = "bold red"
+        else:  # Neutral
+            rsi_style = "bold yellow"
+        rows.append(("RSI", Text(rsi_text, style=rsi_style), "rsi"))
+    else:
+        rows.append(("RSI", "N/A", "rsi"))
+
+    # Format prediction with color based on signal
+    if metrics.prediction:
+        prediction_text = metrics.prediction
+        if "LONG" in prediction_text:
+            prediction_style = "bold green"
+        elif "SHORT" in prediction_text:
+            prediction_style = "bold red"
+        else:
+            prediction_style = "bold white"
+        rows.append(("Prediction", Text(prediction_text, style=prediction_style), "prediction"))
+    else:
+        rows.append(("Prediction", "N/A", "prediction"))
+
+    # Position size
+    rows.append(("Position Size", f"{metrics.position_size}" if metrics.position_size else "N/A", "pos_size"))
+
+    # Entry price
+    rows.append(("Entry Price", f"{metrics.entry_price:.4f}" if metrics.entry_price else "N/A", "entry"))
+
+    # PnL with color (green for profit, red for loss)
+    if metrics.pnl_percent is not None:
+        pnl_text = f"{metrics.pnl_percent:.2f}%"
+        pnl_style = "bold green" if metrics.pnl_percent >= 0 else "bold red"
+        rows.append(("PnL (%)", Text(pnl_text, style=pnl_style), "pnl"))
+    else:
+        rows.append(("PnL (%)", "N/A", "pnl"))
+
+    return tuple(rows)
+
+class UpdateMetricsMessage(Message):
+    """Message to update metrics in the UI."""
+    def __init__(self, metrics):
+        super().__init__()
+        self.metrics = metrics
+        # Format the table rows here, on the posting (background) thread, so the UI
+        # thread only swaps in ready-made cells
+        self.rows = format_metrics_rows(metrics)
@@ -1,23 +1,136 @@
+import asyncio
 import ccxt
+import math
+import os
+import socket
+import threading
 import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Optional, Dict, List, Any
+from urllib.parse import urlparse
 import config
 import logging
-from src.utils.error_handler import handle_api_errors, APIError, safe_api_call
+import numpy as np
+from requests.adapters import HTTPAdapter
+from src.utils.error_handler import handle_api_errors, APIError, CircuitOpenError, safe_api_call
+from src.utils import market_cache
+from src.utils.cache import TTLCache
+from src.utils.rate_limiter import TokenBucket
+from src.utils.ohlcv_store import OHLCVStore
+from src.utils.single_flight import SingleFlight
+from src.utils.ring_buffer import OHLCVRingBuffer
+from src.utils.sides import SIDE_SIGN, close_side
+from src.utils.retry import CircuitBreaker, retry
 
 # --- Early import of config to use ENABLE_TEST_MODE ---
 ENABLE_TEST_MODE = getattr(config, 'ENABLE_TEST_MODE', False)
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Connection pool for the exchange's long-lived HTTP session, sized for the worker threads
+# plus the trading loop so concurrent calls never fall back to fresh TCP+TLS handshakes
+HTTP_POOL_CONNECTIONS = 20
+HTTP_POOL_MAXSIZE = 20
+
+# Market metadata caching
+MARKET_CACHE_TTL_SECONDS = 300          # How long a resolved market dict is served from memory
+MISSING_SYMBOL_TTL_SECONDS = 60         # How long an unknown symbol is remembered as missing
+MARKET_RELOAD_MIN_INTERVAL_SECONDS = 60 # Minimum time between forced load_markets(True) calls
+
+# On-disk copy of the markets universe, reused across restarts while fresh
+MARKETS_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "leverage-trader", "mexc_markets.pkl")
+MARKETS_CACHE_MAX_AGE_SECONDS = 12 * 60 * 60
+
+# Balance only changes on order events, so it is served from memory for a short while
+BALANCE_CACHE_TTL_SECONDS = 2.0
+
+# Repeat OHLCV requests inside the same candle are answered from memory for this long.
+# Kept short because the last candle is still forming and the bot prices off its close.
+OHLCV_CACHE_MAX_AGE_SECONDS = 1.0
+
+# Optional SQLite file holding fetched candles; when set only the delta since the newest
+# stored candle is downloaded. None keeps every fetch a full `limit`-candle request.
+OHLCV_DB_PATH = getattr(config, 'OHLCV_DB_PATH', None)
+
+# Last prices are reused for this long so repeat per-symbol lookups within a tick coalesce
+PRICE_CACHE_TTL_SECONDS = 0.25
+
+# Delay before re-subscribing after a websocket error
+STREAM_RECONNECT_DELAY_SECONDS = 1.0
+
+# Streamed candles are served only if an update arrived this recently; at most this many are kept
+OHLCV_STREAM_STALE_SECONDS = 10.0
+OHLCV_STREAM_MAX_CANDLES = 1000
+
+# Retry policy for transient network failures: decorrelated-jitter exponential backoff
+FETCH_MAX_RETRIES = 3
+RETRY_BACKOFF_BASE_SECONDS = 0.2
+RETRY_BACKOFF_CAP_SECONDS = 5.0
+
+# After this many consecutive network failures, data fetches fail fast for a while
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT_SECONDS = 30.0
+
+# Worker threads used to run independent REST calls concurrently
+IO_MAX_WORKERS = 4
+# Orders get their own workers so they never queue behind slow data fetches; this also
+# caps how many closes close_all sends at once
+ORDER_MAX_WORKERS = 4
+LEVERAGE_CALL_TIMEOUT_SECONDS = 10
+
+# Leverage rarely changes, so a side already set to the requested value is not set again for this long
+LEVERAGE_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# Client-side token bucket in front of every REST call (burst size, sustained requests/second)
+RATE_LIMIT_CAPACITY = 10
+RATE_LIMIT_REFILL_PER_SECOND = 8.0
+
+# Trades kept per symbol for get_trade_history, and the most pages pulled to catch up in one call
+TRADE_HISTORY_BUFFER_SIZE = 500
+TRADE_HISTORY_MAX_PAGES = 10
+
+# Seconds per candle for the timeframes the bot uses; anything else is parsed once on first use
+TIMEFRAME_SECONDS = {
+    '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+    '1h': 3600, '4h': 14400, '8h': 28800, '1d': 86400,
+}
+
 class MEXCHandler:
-    def __init__(self, api_key=None, secret_key=None, test_mode=False):
+    def __init__(self, api_key=None, secret_key=None, test_mode=False, markets_cache_path=MARKETS_CACHE_PATH, ohlcv_db_path=OHLCV_DB_PATH,
+                 prime_dns=False):
         self.api_key = api_key or config.MEXC_API_KEY
         self.secret_key = secret_key or config.MEXC_SECRET_KEY
         self.test_mode = test_mode if test_mode is not None else ENABLE_TEST_MODE
         self.markets = {}
         self.current_price = None
+        self.markets_cache_path = markets_cache_path # None disables the on-disk markets cache
+        self._market_cache = TTLCache(ttl=MARKET_CACHE_TTL_SECONDS)
+        self._market_handles = {} # symbol -> market dict pinned for the order/leverage hot path
+        self._price_formats = {} # symbol -> (tick size, decimals) for formatting order prices
+        self._missing_symbols = TTLCache(ttl=MISSING_SYMBOL_TTL_SECONDS, maxsize=512)
+        self._last_markets_reload = 0.0 # time.monotonic() of the last forced reload
+        self._balance_cache = (0.0, None) # (time.monotonic() fetched at, free USDT)
+        self._ohlcv_cache = {} # (symbol, timeframe, limit) -> (candle bucket, time.monotonic(), candles)
+        self._timeframe_seconds = dict(TIMEFRAME_SECONDS) # timeframe string -> seconds
+        self._ohlcv_store = OHLCVStore(ohlcv_db_path) if ohlcv_db_path else None
+        self._price_cache = TTLCache(ttl=PRICE_CACHE_TTL_SECONDS)
+        self._trade_history = {} # symbol -> deque of trades seen so far, oldest first
+        self._last_trade_ts = {} # symbol -> `since` (ms) for the next incremental fetch
+        self._inflight = SingleFlight() # Concurrent identical REST requests share one round-trip
+        # Websocket streaming state (ccxt.pro client and its event loop thread are created on first use)
+        self._ws_exchange = None
+        self._stream_loop = None
+        self._stream_tasks = {} # ('ticker', symbol) / ('ohlcv', symbol, timeframe) -> concurrent.futures.Future of the watch loop
+        self._stream_candles = {} # (symbol, timeframe) -> (time.monotonic() of last push, OHLCVRingBuffer)
+        self._executor = ThreadPoolExecutor(max_workers=IO_MAX_WORKERS, thread_name_prefix="mexc-io")
+        self._order_executor = ThreadPoolExecutor(max_workers=ORDER_MAX_WORKERS, thread_name_prefix="mexc-order")
+        self._bucket = TokenBucket(capacity=RATE_LIMIT_CAPACITY, refill_rate=RATE_LIMIT_REFILL_PER_SECOND)
+        self._leverage_cache = TTLCache(ttl=LEVERAGE_CACHE_TTL_SECONDS, maxsize=256) # (symbol, positionType) -> leverage
+        self._breaker = CircuitBreaker(failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT_SECONDS)
         
         if not self.api_key or not self.secret_key:
             raise ValueError("API Key or Secret Key not configured")
@@ -25,6 +138,7 @@ class MEXCHandler:
         exchange_options = {
             'apiKey': self.api_key,
             'secret': self.secret_key,
+            'enableRateLimit': True, # ccxt's own per-endpoint throttle, on top of our token bucket
             'options': {
                 'defaultType': 'swap', # Use 'swap' for USDT-M futures
             }
@@ -35,7 +149,11 @@ class MEXCHandler:
             logger.warning("Attempting to enable test/sandbox mode. This requires MEXC & ccxt support.")
             exchange_options['options']['test'] = True
         
+        self._exchange_options = exchange_options
         self.exchange = ccxt.mexc(exchange_options)
+        self._configure_session()
+        if prime_dns: # Opt-in: a background DNS lookup is network I/O that tests and scripts don't want
+            self._prime_dns()
 
         # Log if test mode seems active (based on URLs, might not be reliable)
         if self.test_mode and ('testnet' in self.exchange.urls.get('api', '') or 'sandbox' in self.exchange.urls.get('api', '')):
@@ -45,31 +163,171 @@ class MEXCHandler:
 
         self._initialize_markets()
 
+    def _configure_session(self):
+        """
+        Mount a pooled keep-alive adapter on the exchange session so consecutive calls reuse TCP/TLS connections.
+
+        Transport-level retries are disabled: retrying is decided by the callers (see fetch_ohlcv),
+        and silently re-sending a request such as create_order is never safe.
+        """
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=0
+        )
+        self.exchange.session.mount("https://", adapter)
+
+    def _prime_dns(self):
+        """Resolve the REST hosts once in the background so the first real request skips the DNS lookup."""
+        hosts = set()
+        pending = [self.exchange.urls.get('api')]
+        while pending:
+            url = pending.pop()
+            if isinstance(url, dict):
+                pending.extend(url.values())
+            elif isinstance(url, str) and url.startswith('https://'):
+                hosts.add(urlparse(url).hostname)
+
+        def resolve():
+            for host in hosts:
+                try:
+                    socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+                except OSError as e:
+                    logger.debug("DNS prime for %s failed: %s", host, e)
+
+        threading.Thread(target=resolve, name="mexc-dns", daemon=True).start()
+
+    def close(self):
+        """Release network resources: websocket streams, worker threads, HTTP connections and the OHLCV store."""
+        self.stop_streams()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._order_executor.shutdown(wait=True) # Let submitted orders finish
+        self.exchange.session.close()
+        if self._ohlcv_store is not None:
+            self._ohlcv_store.close()
+
     @handle_api_errors
     def _initialize_markets(self):
-        """Initialize and load markets data from the exchange."""
+        """Initialize markets from the on-disk cache when fresh, otherwise from the exchange."""
+        cached_markets = self._load_markets_cache()
+        if cached_markets:
+            self.exchange.set_markets(cached_markets)
+            self.markets = self.exchange.markets
+            logger.info(f"MEXC Handler initialized. Markets loaded from cache. Test Mode Requested: {self.test_mode}")
+            return self.markets
+
+        self._bucket.acquire()
         self.markets = self.exchange.load_markets()
+        self._save_markets_cache()
         logger.info(f"MEXC Handler initialized. Markets loaded. Test Mode Requested: {self.test_mode}")
         return self.markets
 
+    @handle_api_errors
+    def refresh_markets(self) -> Dict[str, Any]:
+        """Force a markets reload from the exchange and rewrite the on-disk cache."""
+        return self._inflight.do(('markets',), self._reload_markets)
+
+    def _reload_markets(self) -> Dict[str, Any]:
+        """Reload markets and reset everything derived from them."""
+        self._last_markets_reload = time.monotonic()
+        self._bucket.acquire()
+        self.markets = self.exchange.load_markets(True)
+        self._market_cache.clear()
+        self._market_handles.clear()
+        self._price_formats.clear()
+        self._save_markets_cache()
+        return self.markets
+
+    def _load_markets_cache(self) -> Optional[Dict[str, Any]]:
+        """Return the cached markets dict if the cache file exists and is fresh enough."""
+        if not self.markets_cache_path:
+            return None
+        return market_cache.load(self.markets_cache_path, MARKETS_CACHE_MAX_AGE_SECONDS)
+
+    def _save_markets_cache(self) -> None:
+        """Persist the current markets dict to the on-disk cache."""
+        if self.markets_cache_path and self.markets:
+            market_cache.save(self.markets_cache_path, self.markets)
+
+    def _bust_market(self, symbol: str) -> None:
+        """
+        Forget everything cached about `symbol`'s market, in memory and on disk, after the
+        exchange rejected it (e.g. delisted or renamed), and allow an immediate reload.
+        """
+        self._market_cache.pop(symbol)
+        self._market_handles.pop(symbol, None)
+        self._price_formats.pop(symbol, None)
+        self._last_markets_reload = 0.0
+        if self.markets_cache_path:
+            market_cache.invalidate(self.markets_cache_path)
+
     @handle_api_errors
     def get_market(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Fetch market details for a symbol."""
-        if symbol in self.markets:
-            return self.markets[symbol]
-        else:
-            logger.warning(f"Market {symbol} not found. Reloading markets.")
-            self.markets = self.exchange.load_markets(True) # Force reload
-            if symbol in self.markets:
-                return self.markets[symbol]
-            else:
-                logger.error(f"Market {symbol} not found after reload.")
+        """
+        Fetch market details for a symbol.
+
+        Served from an in-memory TTL cache; a full markets reload is only forced for
+        unknown symbols, at most once per MARKET_RELOAD_MIN_INTERVAL_SECONDS, and
+        symbols still missing afterwards are remembered for MISSING_SYMBOL_TTL_SECONDS.
+        """
+        market = self._market_cache.get(symbol)
+        if market is not None:
+            return market
+        if symbol in self._missing_symbols:
+            return None
+
+        market = self.markets.get(symbol)
+        if market is None:
+            now = time.monotonic()
+            if now - self._last_markets_reload > MARKET_RELOAD_MIN_INTERVAL_SECONDS:
+                logger.warning(f"Market {symbol} not found. Reloading markets.")
+                self.refresh_markets() # Force reload
+                market = self.markets.get(symbol)
+            if market is None:
+                logger.error(f"Market {symbol} not found on the exchange.")
+                self._missing_symbols.set(symbol, True)
                 return None
 
+        self._market_cache.set(symbol, market)
+        return market
+
+    def _market_handle(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Return the pinned market dict for `symbol`, resolving it through get_market once."""
+        market = self._market_handles.get(symbol)
+        if market is None:
+            market = self.get_market(symbol)
+            if market is not None:
+                self._market_handles[symbol] = market
+        return market
+
+    def _price_format(self, symbol: str, market: Dict[str, Any]) -> Optional[tuple]:
+        """Return (tick size, decimals) for `symbol` prices, derived once from the market precision."""
+        spec = self._price_formats.get(symbol)
+        if spec is None:
+            precision = market.get('precision', {}).get('price')
+            if precision is None:
+                return None
+            if self.exchange.precisionMode == ccxt.TICK_SIZE:
+                tick = Decimal(str(precision))
+            else: # DECIMAL_PLACES: precision is the number of decimals
+                tick = Decimal(1).scaleb(-int(precision))
+            decimals = max(0, -tick.normalize().as_tuple().exponent)
+            spec = (float(tick), decimals)
+            self._price_formats[symbol] = spec
+        return spec
+
+    def _price_to_precision(self, symbol: str, market: Dict[str, Any], price: float) -> str:
+        """Round `price` to the nearest tick, like exchange.price_to_precision but from precomputed specs."""
+        spec = self._price_format(symbol, market)
+        if spec is None:
+            return self.exchange.price_to_precision(symbol, price)
+        tick, decimals = spec
+        return f"{math.floor(price / tick + 0.5) * tick:.{decimals}f}"
+
     @handle_api_errors
     def set_leverage(self, symbol: str, leverage: int) -> bool:
         """Set leverage for a symbol."""
-        market = self.get_market(symbol)
+        market = self._market_handle(symbol)
         if not market:
             logger.error(f"Cannot set leverage: Market {symbol} not found.")
             return False
@@ -83,54 +341,466 @@ class MEXCHandler:
             return False
 
         # MEXC requires setting leverage for LONG and SHORT sides separately for isolated margin
-        # We assume ISOLATED margin (openType=1)
-        params_long = {'openType': 1, 'positionType': 1}
-        self.exchange.set_leverage(leverage, symbol, params=params_long)
-        logger.info(f"Leverage for {symbol} LONG set to {leverage}x (Isolated)")
+        # We assume ISOLATED margin (openType=1). Sides already at this leverage are skipped, and
+        # the remaining ones are independent, so they are sent concurrently.
+        pending = {
+            side_name: position_type for side_name, position_type in (('LONG', 1), ('SHORT', 2))
+            if self._leverage_cache.get((symbol, position_type)) != leverage
+        }
+        if not pending:
+            logger.debug("Leverage for %s already %dx; skipping", symbol, leverage)
+            return True
 
-        params_short = {'openType': 1, 'positionType': 2}
-        self.exchange.set_leverage(leverage, symbol, params=params_short)
-        logger.info(f"Leverage for {symbol} SHORT set to {leverage}x (Isolated)")
+        futures = {}
+        for side_name, position_type in pending.items():
+            self._bucket.acquire() # One token per side
+            futures[side_name] = self._executor.submit(
+                self.exchange.set_leverage, leverage, symbol, params={'openType': 1, 'positionType': position_type}
+            )
 
-        # Consider this a success if we get here without exceptions
-        return True
+        # Collect every side's outcome before reporting, so one side's failure can't leave the
+        # other side's result (and its leverage cache entry) unrecorded
+        success = True
+        network_error = None
+        for side_name, future in futures.items():
+            cache_key = (symbol, pending[side_name])
+            try:
+                future.result(timeout=LEVERAGE_CALL_TIMEOUT_SECONDS)
+                self._leverage_cache.set(cache_key, leverage)
+                logger.info(f"Leverage for {symbol} {side_name} set to {leverage}x (Isolated)")
+            except (ccxt.ExchangeError, ccxt.NetworkError, FuturesTimeoutError) as e:
+                self._leverage_cache.pop(cache_key) # Outcome unknown or rejected: ask again next time
+                logger.error(f"Failed to set {side_name} leverage for {symbol}: {e!r}")
+                success = False
+                if isinstance(e, FuturesTimeoutError):
+                    e = ccxt.RequestTimeout(f"set_leverage {side_name} got no reply within {LEVERAGE_CALL_TIMEOUT_SECONDS}s")
+                if not isinstance(e, ccxt.ExchangeError) and network_error is None:
+                    network_error = e
+        # The exchange rejecting a side is a normal False; not reaching it is raised once
+        if network_error is not None:
+            raise network_error
+        return success
+
+    def _timeframe_to_seconds(self, timeframe: str) -> int:
+        """Convert a ccxt timeframe string ('1m', '1h', ...) to seconds via the static table, parsing unknown ones once."""
+        seconds = self._timeframe_seconds.get(timeframe)
+        if seconds is None:
+            seconds = int(ccxt.Exchange.parse_timeframe(timeframe))
+            self._timeframe_seconds[timeframe] = seconds
+        return seconds
 
     @handle_api_errors
     def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', limit: int = 100) -> Optional[List[List[float]]]:
-        """Fetch OHLCV data."""
+        """
+        Fetch OHLCV data.
+
+        Candles from a live websocket stream (see start_ohlcv_stream) are served from memory.
+        Otherwise calls repeated within the same candle bucket and OHLCV_CACHE_MAX_AGE_SECONDS
+        return the previously fetched candles without a network round-trip, and
+        concurrent identical calls share a single request. Every call gets its own copy of
+        the candles, so callers may modify the result without corrupting the cache.
+        """
         if not self.exchange.has['fetchOHLCV']:
             logger.error("Exchange does not support fetchOHLCV")
             return None
-            
-        # Add retry logic for robustness
-        for attempt in range(3): # Retry up to 3 times
-            try:
-                ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
-                if ohlcv:
-                    logger.debug(f"Fetched {len(ohlcv)} candles for {symbol} ({timeframe})")
-                    return ohlcv
-                logger.warning(f"Attempt {attempt + 1}: Empty OHLCV data received for {symbol}")
-            except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
-                
-            # Wait before retrying
-            time.sleep(1 * (attempt + 1))
-            
-        logger.error(f"Failed to fetch OHLCV for {symbol} after 3 attempts")
-        return None
+        if symbol in self._missing_symbols:
+            return None
+        streamed = self._streamed_ohlcv(symbol, timeframe, limit)
+        if streamed is not None:
+            # The ring buffer stores timestamps as float64; callers expect int milliseconds like REST
+            return [[int(row[0]), *row[1:]] for row in streamed.tolist()]
+
+        cache_key = (symbol, timeframe, limit)
+        bucket = int(time.time() // self._timeframe_to_seconds(timeframe))
+        cached = self._ohlcv_cache.get(cache_key)
+        if cached is not None:
+            cached_bucket, fetched_at, cached_ohlcv = cached
+            if cached_bucket == bucket and time.monotonic() - fetched_at < OHLCV_CACHE_MAX_AGE_SECONDS:
+                return [list(row) for row in cached_ohlcv]
+
+        ohlcv = self._inflight.do(('ohlcv',) + cache_key, self._fetch_ohlcv_with_retry, symbol, timeframe, limit, bucket)
+        return None if ohlcv is None else [list(row) for row in ohlcv]
+
+    def _fetch_ohlcv_with_retry(self, symbol: str, timeframe: str, limit: int, bucket: int) -> Optional[List[List[float]]]:
+        """Fetch candles from the exchange, retrying transient failures, and cache them under `bucket`."""
+        def attempt():
+            self._bucket.acquire()
+            return self._fetch_ohlcv_remote(symbol, timeframe, limit)
+
+        def on_retry(attempt_no, error):
+            if error is None:
+                logger.warning(f"Attempt {attempt_no + 1}: Empty OHLCV data received for {symbol}")
+            else:
+                self._log_retry(attempt_no, error)
+
+        try:
+            ohlcv = self._call_with_retry(attempt, retry_if_result=lambda result: not result, on_retry=on_retry)
+        except ccxt.BadSymbol:
+            self._missing_symbols.set(symbol, True)
+            raise
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping OHLCV fetch for {symbol}: {e}")
+            return None
+        except ccxt.NetworkError:
+            ohlcv = None
+
+        if not ohlcv:
+            logger.error(f"Failed to fetch OHLCV for {symbol} after {FETCH_MAX_RETRIES} attempts")
+            return None
+        logger.debug("Fetched %d candles for %s (%s)", len(ohlcv), symbol, timeframe)
+        self._ohlcv_cache[(symbol, timeframe, limit)] = (bucket, time.monotonic(), ohlcv)
+        streamed = self._stream_candles.get((symbol, timeframe))
+        if streamed is not None:
+            streamed[1].extend(ohlcv) # Backfill the stream's history from REST
+        return ohlcv
+
+    def _call_with_retry(self, fn, **kwargs):
+        """
+        Run `fn` under the shared retry policy and circuit breaker.
+
+        Only network errors (rate limits included) are retried; anything else, e.g.
+        AuthenticationError or BadSymbol, propagates immediately.
+        """
+        kwargs.setdefault('on_retry', self._log_retry)
+        return retry(
+            fn,
+            attempts=FETCH_MAX_RETRIES,
+            base=RETRY_BACKOFF_BASE_SECONDS,
+            cap=RETRY_BACKOFF_CAP_SECONDS,
+            retry_on=(ccxt.NetworkError,),
+            retry_after=self._retry_after,
+            breaker=self._breaker,
+            **kwargs
+        )
+
+    def _log_retry(self, attempt: int, error: Optional[BaseException]) -> None:
+        """Log a failed attempt; on a rate-limit error also empty the token bucket so all callers slow down."""
+        if isinstance(error, ccxt.RateLimitExceeded):
+            logger.warning(f"Attempt {attempt + 1} rate limited: {str(error)}. Throttling requests.")
+            self._bucket.drain()
+        else:
+            logger.warning(f"Attempt {attempt + 1} failed: {str(error)}")
+
+    def _retry_after(self, error: BaseException) -> Optional[float]:
+        """Return the server's Retry-After delay (seconds) for a rate-limit error, if it sent one."""
+        if not isinstance(error, ccxt.RateLimitExceeded):
+            return None
+        headers = getattr(self.exchange, 'last_response_headers', None)
+        if not isinstance(headers, Mapping):
+            return None
+        try:
+            return float(headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+    def _fetch_ohlcv_remote(self, symbol: str, timeframe: str, limit: int) -> List[List[float]]:
+        """
+        Download candles, going through the local OHLCV store when one is configured.
+
+        With a store, only candles from the newest stored one onwards are requested (that
+        candle is refetched because it was probably still forming) and the newest `limit`
+        stored candles are returned. A full fetch is used when the store is empty, too far
+        behind, or holds fewer than `limit` candles.
+        """
+        store = self._ohlcv_store
+        if store is None:
+            return self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+
+        last_ts = store.last_timestamp(symbol, timeframe)
+        window_ms = limit * self._timeframe_to_seconds(timeframe) * 1000
+        if last_ts is not None and time.time() * 1000 - last_ts < window_ms:
+            delta = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=last_ts, limit=limit)
+            if delta:
+                store.upsert(symbol, timeframe, delta)
+            ohlcv = store.tail(symbol, timeframe, limit)
+            if len(ohlcv) >= limit:
+                return ohlcv
+            self._bucket.acquire() # Store too short for this limit; backfill with a full fetch
+
+        ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+        if ohlcv:
+            store.upsert(symbol, timeframe, ohlcv)
+        return ohlcv
+
+    def fetch_ohlcv_np(self, symbol: str, timeframe: str = '1m', limit: int = 100) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Fetch OHLCV data as one NumPy array per column.
+
+        Candles from a live websocket stream are returned as zero-copy views of its ring
+        buffer (valid until about OHLCV_STREAM_MAX_CANDLES further updates; read-only).
+
+        Returns:
+            {'ts': int64 ms timestamps, 'open', 'high', 'low', 'close', 'volume': float64 arrays},
+            or None if no data could be fetched.
+        """
+        arr = self._streamed_ohlcv(symbol, timeframe, limit) if symbol not in self._missing_symbols else None
+        if arr is None:
+            raw = self.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+            if not raw:
+                return None
+            arr = np.asarray(raw, dtype=np.float64)
+        return {
+            'ts': arr[:, 0].astype(np.int64),
+            'open': arr[:, 1],
+            'high': arr[:, 2],
+            'low': arr[:, 3],
+            'close': arr[:, 4],
+            'volume': arr[:, 5],
+        }
 
     @handle_api_errors
+    def fetch_ohlcv_range(self, symbol: str, timeframe: str, since_ms: int, until_ms: int, limit: int = 1000) -> List[List[float]]:
+        """
+        Fetch every candle with open time in [since_ms, until_ms), e.g. to backfill history.
+
+        The range is split into pages of `limit` candles that are requested concurrently on
+        the worker threads (so at most IO_MAX_WORKERS at a time, each through the token
+        bucket and retry policy), then stitched and de-duplicated by timestamp.
+        """
+        page_ms = limit * self._timeframe_to_seconds(timeframe) * 1000
+
+        def fetch_page(page_since):
+            def attempt():
+                self._bucket.acquire()
+                return self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=page_since, limit=limit)
+            return self._call_with_retry(attempt)
+
+        pages = [self._executor.submit(fetch_page, page_since) for page_since in range(since_ms, until_ms, page_ms)]
+        by_ts = {}
+        for page in pages:
+            for candle in page.result() or ():
+                if since_ms <= candle[0] < until_ms:
+                    by_ts[candle[0]] = candle
+        logger.debug("Fetched %d candles for %s (%s) in %d pages", len(by_ts), symbol, timeframe, len(pages))
+        return [by_ts[ts] for ts in sorted(by_ts)]
+
+    def fetch_ohlcv_many(self, symbols: List[str], timeframe: str = '1m', limit: int = 100) -> Dict[str, Optional[List[List[float]]]]:
+        """
+        Fetch OHLCV data for several symbols concurrently.
+
+        The REST calls run on the handler's worker threads, so total latency is close to
+        the slowest single request rather than the sum of all of them.
+
+        Returns:
+            A dict mapping each symbol to its candles, or None if that fetch failed.
+        """
+        futures = {symbol: self._executor.submit(self.fetch_ohlcv, symbol, timeframe, limit) for symbol in symbols}
+        results = {}
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except APIError as e:
+                logger.error(f"Failed to fetch OHLCV for {symbol}: {e}")
+                results[symbol] = None
+        return results
+
+    def snapshot(self, symbol: str, timeframe: str = '1m', limit: int = 100) -> Dict[str, Any]:
+        """
+        Fetch balance, last price, open positions and OHLCV for `symbol` concurrently.
+
+        The four reads are independent, so running them on the worker threads makes the
+        total latency roughly that of the slowest one.
+
+        Returns:
+            {'balance', 'price', 'positions', 'ohlcv'}; an entry is None if its fetch failed.
+        """
+        futures = {
+            'balance': self._executor.submit(self.get_usdt_balance),
+            'price': self._executor.submit(self.get_current_price, symbol),
+            'positions': self._executor.submit(self.get_positions, symbol),
+            'ohlcv': self._executor.submit(self.fetch_ohlcv, symbol, timeframe, limit),
+        }
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except APIError as e:
+                logger.error(f"Snapshot {name} fetch for {symbol} failed: {e}")
+                results[name] = None
+        return results
+
     def get_current_price(self, symbol: str) -> Optional[float]:
-        """Get the last traded price for a symbol."""
-        ticker = self.exchange.fetch_ticker(symbol)
-        if ticker and 'last' in ticker:
+        """
+        Get the last traded price for a symbol.
+
+        Prices fetched here or by get_current_prices are reused for PRICE_CACHE_TTL_SECONDS,
+        and concurrent lookups of the same symbol share a single ticker request.
+        """
+        # Cache hits cannot fail, so they skip the error-handling wrapper entirely
+        price = self._price_cache.get(symbol)
+        if price is not None:
+            self.current_price = price
+            return price
+        if symbol in self._missing_symbols:
+            return None
+        return self._fetch_current_price(symbol)
+
+    @handle_api_errors
+    def _fetch_current_price(self, symbol: str) -> Optional[float]:
+        """get_current_price for a cache miss: fetch the ticker and cache its last price."""
+        try:
+            ticker = self._inflight.do(('ticker', symbol), self._fetch_ticker, symbol)
+        except ccxt.BadSymbol:
+            self._missing_symbols.set(symbol, True)
+            raise
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping ticker fetch for {symbol}: {e}")
+            return None
+        if ticker and ticker.get('last') is not None:
             self.current_price = float(ticker['last'])
-            logger.debug(f"Current price for {symbol}: {self.current_price}")
+            self._price_cache.set(symbol, self.current_price)
+            logger.debug("Current price for %s: %s", symbol, self.current_price)
             return self.current_price
         else:
             logger.warning(f"Could not fetch valid ticker/last price for {symbol}")
             return None
 
+    def _fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        """Rate-limited fetch_ticker call, retrying transient network errors."""
+        def attempt():
+            self._bucket.acquire()
+            return self.exchange.fetch_ticker(symbol)
+        return self._call_with_retry(attempt)
+
+    @handle_api_errors
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get the last traded prices for several symbols with a single fetch_tickers request.
+
+        Symbols without a valid last price are left out of the result.
+        """
+        self._bucket.acquire()
+        tickers = self.exchange.fetch_tickers(symbols)
+        prices = {}
+        for symbol in symbols:
+            ticker = tickers.get(symbol)
+            if ticker and ticker.get('last') is not None:
+                price = float(ticker['last'])
+                prices[symbol] = price
+                self._price_cache.set(symbol, price)
+        logger.debug("Fetched prices for %d/%d symbols", len(prices), len(symbols))
+        return prices
+
+    def forget_missing(self, symbol: str) -> None:
+        """Clear a symbol from the known-missing cache so the next lookup asks the exchange again."""
+        self._missing_symbols.pop(symbol)
+
+    # --- Websocket streaming ---
+
+    def _ws_client(self):
+        """Return the shared ccxt.pro client, creating it on first use (must run inside the stream loop)."""
+        if self._ws_exchange is None:
+            # Imported here so REST-only use never loads ccxt.pro and its aiohttp stack
+            import ccxt.pro
+            # Created inside the running loop so its aiohttp session binds to it
+            self._ws_exchange = ccxt.pro.mexc(self._exchange_options)
+        return self._ws_exchange
+
+    async def stream_prices(self, symbol: str, callback) -> None:
+        """
+        Watch the ticker for `symbol` over the ccxt.pro websocket and call `callback(price)`
+        for every update. Runs until cancelled; transient network errors re-subscribe.
+        """
+        ws = self._ws_client()
+        while True:
+            try:
+                ticker = await ws.watch_ticker(symbol)
+            except ccxt.NetworkError as e:
+                logger.warning(f"Price stream for {symbol} interrupted: {e}. Reconnecting.")
+                await asyncio.sleep(STREAM_RECONNECT_DELAY_SECONDS)
+                continue
+            last = ticker.get('last')
+            if last is not None:
+                callback(float(last))
+
+    async def stream_ohlcv(self, symbol: str, timeframe: str) -> None:
+        """
+        Watch `symbol` candles over the ccxt.pro websocket and merge every update into the
+        streamed candle cache fetch_ohlcv reads. Runs until cancelled.
+        """
+        ws = self._ws_client()
+        while True:
+            try:
+                candles = await ws.watch_ohlcv(symbol, timeframe)
+            except ccxt.NetworkError as e:
+                logger.warning(f"Candle stream for {symbol} ({timeframe}) interrupted: {e}. Reconnecting.")
+                await asyncio.sleep(STREAM_RECONNECT_DELAY_SECONDS)
+                continue
+            self._on_stream_candles(symbol, timeframe, candles)
+
+    def _start_stream(self, key: tuple, coroutine) -> bool:
+        """Run `coroutine` on the background stream loop under `key`; returns False if already running."""
+        if key in self._stream_tasks:
+            coroutine.close()
+            return False
+        if self._stream_loop is None:
+            self._stream_loop = asyncio.new_event_loop()
+            threading.Thread(target=self._stream_loop.run_forever, name="mexc-ws", daemon=True).start()
+        self._stream_tasks[key] = asyncio.run_coroutine_threadsafe(coroutine, self._stream_loop)
+        return True
+
+    def start_price_stream(self, symbol: str) -> None:
+        """
+        Start streaming `symbol` prices in the background.
+
+        Streamed prices feed the same cache get_current_price reads, so callers get push
+        updates transparently and fall back to REST if the stream stalls.
+        """
+        callback = lambda price: self._on_stream_price(symbol, price)
+        if self._start_stream(('ticker', symbol), self.stream_prices(symbol, callback)):
+            logger.info(f"Started websocket price stream for {symbol}")
+
+    def start_ohlcv_stream(self, symbol: str, timeframe: str) -> None:
+        """
+        Start streaming `symbol` candles in the background.
+
+        While the stream is live and holds at least `limit` candles, fetch_ohlcv is a memory
+        read; until then (or if it stalls) REST is used, and REST results warm up the stream's history.
+        """
+        self._stream_candles.setdefault((symbol, timeframe), (0.0, OHLCVRingBuffer(OHLCV_STREAM_MAX_CANDLES)))
+        if self._start_stream(('ohlcv', symbol, timeframe), self.stream_ohlcv(symbol, timeframe)):
+            logger.info(f"Started websocket candle stream for {symbol} ({timeframe})")
+
+    def _on_stream_price(self, symbol: str, price: float) -> None:
+        """Record a pushed price update."""
+        self.current_price = price
+        self._price_cache.set(symbol, price)
+
+    def _on_stream_candles(self, symbol: str, timeframe: str, candles: List[List[float]]) -> None:
+        """Record pushed candles and mark the stream as live."""
+        key = (symbol, timeframe)
+        entry = self._stream_candles.get(key)
+        ring = entry[1] if entry is not None else OHLCVRingBuffer(OHLCV_STREAM_MAX_CANDLES)
+        ring.extend(candles)
+        self._stream_candles[key] = (time.monotonic(), ring)
+
+    def _streamed_ohlcv(self, symbol: str, timeframe: str, limit: int) -> Optional[np.ndarray]:
+        """Return a view of the last `limit` streamed candles if the stream is live and long enough, else None."""
+        entry = self._stream_candles.get((symbol, timeframe))
+        if entry is None:
+            return None
+        updated_at, ring = entry
+        if len(ring) < limit or time.monotonic() - updated_at > OHLCV_STREAM_STALE_SECONDS:
+            return None
+        return ring.view(limit)
+
+    def stop_streams(self) -> None:
+        """Cancel all websocket streams and shut down their event loop."""
+        if self._stream_loop is None:
+            return
+        for task in self._stream_tasks.values():
+            task.cancel()
+        self._stream_tasks.clear()
+        self._stream_candles.clear()
+        if self._ws_exchange is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._ws_exchange.close(), self._stream_loop).result(timeout=5)
+            except Exception as e:
+                logger.warning(f"Error closing websocket client: {e}")
+            self._ws_exchange = None
+        self._stream_loop.call_soon_threadsafe(self._stream_loop.stop)
+        self._stream_loop = None
+
     @handle_api_errors
     def place_market_order_with_sl_tp(self, symbol: str, side: str, amount: float, 
                                      sl_price: Optional[float] = None, 
@@ -142,7 +812,7 @@ class MEXCHandler:
             logger.error(f"Invalid order side: {side}")
             return None
 
-        market = self.get_market(symbol)
+        market = self._market_handle(symbol)
         if not market:
             logger.error(f"Cannot place order: Market {symbol} not found.")
             return None
@@ -152,33 +822,74 @@ class MEXCHandler:
 
         # Add SL/TP parameters if provided
         if sl_price:
-             params['stopLossPrice'] = self.exchange.price_to_precision(symbol, sl_price)
+            params['stopLossPrice'] = self._price_to_precision(symbol, market, sl_price)
 
         if tp_price:
-            params['takeProfitPrice'] = self.exchange.price_to_precision(symbol, tp_price)
+            params['takeProfitPrice'] = self._price_to_precision(symbol, market, tp_price)
 
         logger.info(f"Placing {side} {order_type} order for {amount} {market.get('base', '')} on {symbol} with SL={sl_price}, TP={tp_price}")
-        order = self.exchange.create_order(
-            symbol=symbol,
-            type=order_type,
-            side=side,
-            amount=amount,
-            params=params
-        )
+        self._bucket.acquire()
+        try:
+            order = self.exchange.create_order(
+                symbol=symbol,
+                type=order_type,
+                side=side,
+                amount=amount,
+                params=params
+            )
+        except ccxt.BadSymbol:
+            self._bust_market(symbol)
+            raise
         logger.info(f"Order placed successfully: {order['id']}")
+        self.invalidate(symbol) # Margin moved and price likely ticked; next reads must hit the exchange
         return order
 
+    def place_market_order_async(self, symbol: str, side: str, amount: float,
+                                 sl_price: Optional[float] = None,
+                                 tp_price: Optional[float] = None) -> Future:
+        """
+        Submit place_market_order_with_sl_tp on a dedicated order worker and return immediately.
+
+        The returned Future resolves to the order dict (or None), or raises the APIError the
+        synchronous call would have raised. Callers can wait with `.result(timeout=...)` or
+        attach `add_done_callback` for follow-up work such as confirming the fill.
+        """
+        return self._order_executor.submit(self.place_market_order_with_sl_tp, symbol, side, amount, sl_price, tp_price)
+
     @handle_api_errors
     def get_usdt_balance(self) -> float:
-        """Fetch the free USDT balance from the swap/futures account."""
+        """
+        Fetch the free USDT balance from the swap/futures account.
+
+        Results are reused for BALANCE_CACHE_TTL_SECONDS; placing an order invalidates them.
+        """
+        fetched_at, cached_balance = self._balance_cache
+        if cached_balance is not None and time.monotonic() - fetched_at < BALANCE_CACHE_TTL_SECONDS:
+            return cached_balance
+
+        self._bucket.acquire()
         balance = self.exchange.fetch_balance(params={'type': 'swap'})
-        if 'USDT' in balance['free']:
-            usdt_balance = float(balance['free']['USDT'])
-            logger.debug(f"Free USDT balance: {usdt_balance}")
-            return usdt_balance
+        free_usdt = (balance.get('free') or {}).get('USDT')
+        if free_usdt is not None:
+            usdt_balance = float(free_usdt)
+            logger.debug("Free USDT balance: %s", usdt_balance)
         else:
             logger.warning("USDT balance not found in swap account.")
-            return 0.0  # Return 0 if no USDT found
+            usdt_balance = 0.0  # Return 0 if no USDT found
+        self._balance_cache = (time.monotonic(), usdt_balance)
+        return usdt_balance
+
+    def invalidate_balance(self):
+        """Drop the cached balance so the next get_usdt_balance call refetches it."""
+        self._balance_cache = (0.0, None)
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop the cached price, candles and balance affected by activity on `symbol`."""
+        self._price_cache.pop(symbol)
+        for key in list(self._ohlcv_cache):
+            if key[0] == symbol:
+                self._ohlcv_cache.pop(key, None)
+        self.invalidate_balance()
 
     @handle_api_errors
     def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -188,23 +899,52 @@ class MEXCHandler:
             return []
             
         symbols = [symbol] if symbol else None
-        positions = self.exchange.fetch_positions(symbols=symbols)
+        params = {}
+        if symbol:
+            # Let MEXC filter server-side instead of returning every open position
+            market = self._market_handle(symbol)
+            if market and market.get('id'):
+                params['symbol'] = market['id']
+        self._bucket.acquire()
+        positions = self.exchange.fetch_positions(symbols=symbols, params=params)
         
-        # Filter out zero-size positions
-        open_positions = [p for p in positions if p.get('contracts') and float(p['contracts']) != 0]
-        logger.debug(f"Fetched {len(open_positions)} open positions.")
+        # Filter out zero-size positions (ccxt reports contracts as numbers; no float() parse needed)
+        open_positions = [p for p in positions if (c := p.get('contracts')) and c not in ('0', '0.0', 0)]
+        logger.debug("Fetched %d open positions.", len(open_positions))
         return open_positions
 
     @handle_api_errors
     def get_trade_history(self, symbol: str, limit: int = 50) -> List[Dict[str, Any]]:
-        """Fetch trade history for a symbol."""
+        """
+        Fetch the most recent `limit` trades for a symbol.
+
+        Only the first call per symbol downloads a full page; later calls ask for trades
+        since the newest one already seen and append them to a per-symbol buffer.
+        """
         if not self.exchange.has['fetchMyTrades']:
             logger.error("Exchange does not support fetchMyTrades")
             return []
-            
-        trades = self.exchange.fetch_my_trades(symbol=symbol, limit=limit)
-        logger.debug(f"Fetched {len(trades)} trades for {symbol}")
-        return trades
+
+        history = self._trade_history.get(symbol)
+        if history is None:
+            history = self._trade_history[symbol] = deque(maxlen=max(TRADE_HISTORY_BUFFER_SIZE, limit))
+        since = self._last_trade_ts.get(symbol)
+        # The first call only takes the latest page; later calls page forward until caught up
+        pages = 1 if since is None else TRADE_HISTORY_MAX_PAGES
+        fetched = 0
+        for _ in range(pages):
+            self._bucket.acquire()
+            trades = self.exchange.fetch_my_trades(symbol=symbol, since=since, limit=limit)
+            if not trades:
+                break
+            history.extend(trades)
+            fetched += len(trades)
+            since = max(t['timestamp'] for t in trades) + 1
+            self._last_trade_ts[symbol] = since
+            if len(trades) < limit:
+                break
+        logger.debug("Fetched %d new trades for %s", fetched, symbol)
+        return list(history)[-limit:]
         
     def close_position(self, position: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Close an open position."""
@@ -217,13 +957,13 @@ class MEXCHandler:
             logger.error("Cannot close position: No symbol in position data")
             return None
             
-        # Determine the side - to close, we place an opposite order
-        position_side = position.get('side')
-        if not position_side:
-            logger.error("Cannot close position: No side in position data")
+        # Determine the side - to close, we place an opposite order.
+        # Accepts our position_info ('buy'/'sell', side_sign) as well as ccxt positions ('long'/'short').
+        sign = position.get('side_sign') or SIDE_SIGN.get(position.get('side'))
+        if not sign:
+            logger.error("Cannot close position: No valid side in position data")
             return None
             
-        close_side = 'sell' if position_side == 'buy' else 'buy'
         amount = position.get('size', 0)
         
         if not amount:
@@ -232,11 +972,34 @@ class MEXCHandler:
             
         return safe_api_call(
             self.place_market_order_with_sl_tp,
-            symbol, close_side, float(amount)
+            symbol, close_side(sign), float(amount)
         )
 
+    def close_all(self, positions: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Close several positions concurrently (at most ORDER_MAX_WORKERS orders in flight).
+
+        Returns:
+            A list aligned with `positions` holding each close order (or None), or the
+            exception raised for that position.
+        """
+        futures = [self._order_executor.submit(self.close_position, position) for position in positions]
+        return [future.exception() or future.result() for future in futures]
+
+    def get_trade_history_many(self, symbols: List[str], limit: int = 50) -> List[Any]:
+        """
+        Fetch trade history for several symbols concurrently on the worker threads.
+
+        Returns:
+            A list aligned with `symbols` holding each symbol's trades, or the exception
+            raised for that symbol.
+        """
+        futures = [self._executor.submit(self.get_trade_history, symbol, limit) for symbol in symbols]
+        return [future.exception() or future.result() for future in futures]
+
 # Example Usage (for testing)
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     try:
         handler = MEXCHandler()
 
@@ -270,8 +1033,9 @@ if __name__ == '__main__':
         ohlcv = handler.fetch_ohlcv(config.DEFAULT_SYMBOL, timeframe=config.DEFAULT_TIMEFRAME, limit=5)
         if ohlcv:
             print(f"Fetched last {len(ohlcv)} candles:")
-            for candle in ohlcv:
-                print(f"  Timestamp: {handler.exchange.iso8601(candle[0])}, O: {candle[1]}, H: {candle[2]}, L: {candle[3]}, C: {candle[4]}, V: {candle[5]}")
+            timestamps = [datetime.fromtimestamp(c[0] / 1000, timezone.utc).isoformat() for c in ohlcv]
+            for ts, (_, o, h, l, c, v) in zip(timestamps, ohlcv):
+                print(f"  Timestamp: {ts}, O: {o}, H: {h}, L: {l}, C: {c}, V: {v}")
         else:
             print("Could not fetch OHLCV.")
 
@@ -1,21 +1,44 @@
 import logging
-from decimal import Decimal, InvalidOperation
-from typing import Optional, Dict, Any
+import numpy as np
+from decimal import Decimal
+from typing import Optional, Dict, Any, Union
+from src.utils.sides import SIDE_SIGN
+from src.stats_kernels import pnl_pct_kernel
+
+# Distinct entry prices whose inverse calculate_pnl keeps; the cache is emptied when full
+INV_ENTRY_CACHE_SIZE = 1024
 
 class StatsHandler:
     """Handles calculation and tracking of performance statistics."""
 
-    def __init__(self):
+    def __init__(self) -> None:
         """
         Initializes the StatsHandler.
         """
-        # Initialize stats variables if needed (e.g., total PnL, win rate)
-        self.total_realized_pnl = Decimal('0.0')
-        self.trade_count = 0
-        self.win_count = 0
+        self.reset()
         logging.info("StatsHandler initialized.")
 
-    def calculate_pnl(self, position_info: Dict[str, Any], current_price: Decimal) -> Optional[Dict[str, Any]]:
+    def reset(self) -> None:
+        """Forget all recorded trades and the registered portfolio."""
+        # Realized PnL is accumulated with Neumaier compensated summation: float speed,
+        # without the rounding drift of a naive running sum
+        self._pnl_sum: float = 0.0
+        self._pnl_compensation: float = 0.0
+        self.trade_count: int = 0
+        self.win_count: int = 0
+        # Portfolio arrays (see set_portfolio), reused on every portfolio_pnl call
+        self._entries: np.ndarray = np.empty(0)
+        self._signs: np.ndarray = np.empty(0)
+        self._pnl_out: np.ndarray = np.empty(0)
+        # Entry price (as given on positions) -> 1/entry as float, see calculate_pnl
+        self._inv_entries: Dict[Any, float] = {}
+
+    @property
+    def total_realized_pnl(self) -> float:
+        """Sum of all recorded realized PnL values."""
+        return self._pnl_sum + self._pnl_compensation
+
+    def calculate_pnl(self, position_info: Dict[str, Any], current_price: Union[Decimal, float]) -> Optional[Dict[str, Any]]:
         """
         Calculates the unrealized PnL% for a given open position.
 
@@ -27,68 +50,118 @@ class StatsHandler:
             A dictionary containing PnL details (e.g., {'pnl_percent': float}),
             or None if calculation fails.
         """
-        # Removed placeholder warning log
         entry_price_val = position_info.get('entry_price')
         side = position_info.get('side') # Expect 'buy' or 'sell'
         # Size might not be needed for PnL % calculation, but useful for context
         # size_val = position_info.get('size')
 
-        if entry_price_val is None or side not in ['buy', 'sell'] or current_price is None:
-            logging.debug(f"Cannot calculate PnL: Missing data (entry: {entry_price_val}, side: {side}, current: {current_price})")
+        sign: Optional[int] = SIDE_SIGN.get(side)
+        if entry_price_val is None or sign is None or current_price is None:
+            logging.debug("Cannot calculate PnL: Missing data (entry: %s, side: %s, current: %s)", entry_price_val, side, current_price)
             return None
 
         try:
-            # Ensure values are Decimals for accurate calculation
-            entry_price = Decimal(str(entry_price_val))
-            # current_price is already Decimal
-
-            if entry_price == 0: # Avoid division by zero
-                logging.warning("Cannot calculate PnL%: Entry price is zero.")
-                return None
-
-            pnl_percent = Decimal('0.0')
-            if side == 'buy':
-                pnl_percent = ((current_price - entry_price) / entry_price) * 100
-            elif side == 'sell':
-                pnl_percent = ((entry_price - current_price) / entry_price) * 100
-            
-            logging.debug(f"Calculated PnL%: {pnl_percent:.4f} for {side} position entered at {entry_price}")
-            
-            return {
-                'pnl_percent': float(pnl_percent) # Return as float for simplicity in UI/metrics
-            }
-            
-        except InvalidOperation as e:
-             logging.error(f"Error converting PnL values to Decimal: entry='{entry_price_val}', current='{current_price}'. Error: {e}")
-             return None
-        except Exception as e:
-            logging.error(f"Error calculating PnL: {e}", exc_info=True)
+            # PnL% is reported as a float, so plain float arithmetic loses nothing that matters here
+            price = float(current_price)
+            # 1/entry is cached per entry value, not on the position: repeated ticks skip the
+            # conversion, and a position whose entry_price changes (e.g. averaging in) is
+            # simply priced from its new entry
+            inv_entry = self._inv_entries.get(entry_price_val)
+            if inv_entry is None:
+                entry_price = float(entry_price_val)
+                if entry_price == 0: # Avoid division by zero
+                    logging.warning("Cannot calculate PnL%: Entry price is zero.")
+                    return None
+                inv_entry = 1.0 / entry_price
+                if len(self._inv_entries) >= INV_ENTRY_CACHE_SIZE:
+                    self._inv_entries.clear()
+                self._inv_entries[entry_price_val] = inv_entry
+        except (TypeError, ValueError) as e:
+            logging.error(f"Error converting PnL values: entry='{entry_price_val}', current='{current_price}'. Error: {e}")
             return None
 
-    # TODO: Implement methods to track realized PnL, win rate etc.
-    # def update_realized_stats(self, close_price: Decimal, position_info: Dict[str, Any]):
-    #     entry_price = Decimal(str(position_info.get('entry_price')))
-    #     size = Decimal(str(position_info.get('size')))
-    #     side = position_info.get('side')
-    #     pnl_value = Decimal('0.0')
-    #     if side == 'buy':
-    #         pnl_value = (close_price - entry_price) * size
-    #     elif side == 'sell':
-    #         pnl_value = (entry_price - close_price) * size
-    #     
-    #     self.total_realized_pnl += pnl_value
-    #     self.trade_count += 1
-    #     if pnl_value > 0:
-    #          self.win_count += 1
-    #     logging.info(f"Trade closed. Realized PnL: {pnl_value:.4f}, Total PnL: {self.total_realized_pnl:.4f}, Win Rate: {self.get_win_rate():.2f}%")
-
-    # def get_win_rate(self) -> float:
-    #      return (self.win_count / self.trade_count * 100) if self.trade_count > 0 else 0.0
-
-    # def get_overall_stats(self) -> Dict[str, Any]:
-    #     return {
-    #         'total_realized_pnl': float(self.total_realized_pnl),
-    #         'trade_count': self.trade_count,
-    #         'win_count': self.win_count,
-    #         'win_rate': self.get_win_rate()
-    #     } 
\ No newline at end of file
+        pnl_percent = sign * (price * inv_entry - 1.0) * 100.0
+        logging.debug("Calculated PnL%%: %.4f for %s position entered at %s", pnl_percent, side, entry_price_val)
+        return {'pnl_percent': pnl_percent}
+
+    @staticmethod
+    def calculate_pnl_fast(entry: float, current: float, side_sign: int) -> float:
+        """
+        Unrealized PnL% from float prices.
+
+        Args:
+            entry: Entry price (non-zero).
+            current: Current market price.
+            side_sign: +1 for a long position, -1 for a short one.
+        """
+        return side_sign * (current - entry) / entry * 100.0
+
+    @staticmethod
+    def calculate_pnl_batch(entries: np.ndarray, currents: np.ndarray, signs: np.ndarray) -> np.ndarray:
+        """
+        Vectorized calculate_pnl_fast over arrays of positions.
+
+        Args:
+            entries: Entry prices (non-zero).
+            currents: Current prices, aligned with `entries`.
+            signs: +1 for long, -1 for short positions.
+
+        Returns:
+            PnL% per position as a float64 array.
+        """
+        entries = np.asarray(entries, dtype=np.float64)
+        return signs * (np.asarray(currents, dtype=np.float64) - entries) * (1.0 / entries) * 100.0
+
+    def set_portfolio(self, entries: np.ndarray, signs: np.ndarray) -> None:
+        """
+        Register the open positions that portfolio_pnl recomputes.
+
+        Args:
+            entries: Entry prices (non-zero).
+            signs: +1 for long, -1 for short positions, aligned with `entries`.
+        """
+        self._entries = np.ascontiguousarray(entries, dtype=np.float64)
+        self._signs = np.ascontiguousarray(signs, dtype=np.float64)
+        self._pnl_out = np.empty_like(self._entries)
+
+    def portfolio_pnl(self, currents: np.ndarray) -> np.ndarray:
+        """
+        PnL% for every registered position at the given current prices.
+
+        Runs the (numba-compiled when available) kernel into a preallocated buffer, so the
+        returned array is overwritten by the next call; copy it to keep it.
+        """
+        return pnl_pct_kernel(self._entries, np.asarray(currents, dtype=np.float64), self._signs, self._pnl_out)
+
+    def record_realized_pnl(self, pnl: float) -> None:
+        """
+        Record the realized PnL of a closed trade.
+
+        Args:
+            pnl: Profit (positive) or loss (negative) in quote currency.
+        """
+        pnl = float(pnl)
+        total = self._pnl_sum + pnl
+        # Neumaier: recover the low-order bits lost by whichever addend is smaller
+        if abs(self._pnl_sum) >= abs(pnl):
+            self._pnl_compensation += (self._pnl_sum - total) + pnl
+        else:
+            self._pnl_compensation += (pnl - total) + self._pnl_sum
+        self._pnl_sum = total
+        self.trade_count += 1
+        if pnl > 0:
+            self.win_count += 1
+        logging.info(f"Trade closed. Realized PnL: {pnl:.4f}, Total PnL: {self.total_realized_pnl:.4f}, Win Rate: {self.get_win_rate():.2f}%")
+
+    def get_win_rate(self) -> float:
+        """Percentage of recorded trades that were profitable."""
+        return (self.win_count / self.trade_count * 100) if self.trade_count > 0 else 0.0
+
+    def get_overall_stats(self) -> Dict[str, Any]:
+        """Summary of realized performance."""
+        return {
+            'total_realized_pnl': self.total_realized_pnl,
+            'trade_count': self.trade_count,
+            'win_count': self.win_count,
+            'win_rate': self.get_win_rate()
+        }
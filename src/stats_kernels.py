@@ -0,0 +1,36 @@
+"""
+Numeric kernels for portfolio-wide statistics.
+
+When numba is installed the kernels are JIT-compiled (parallel, fastmath) and warmed up
+at import time; otherwise an equivalent in-place NumPy implementation is used.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+def _pnl_pct_numpy(entry: np.ndarray, cur: np.ndarray, signs: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """PnL% per position, written into `out` without temporaries."""
+    np.subtract(cur, entry, out=out)
+    out *= signs
+    out /= entry
+    out *= 100.0
+    return out
+
+
+if HAVE_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def pnl_pct_kernel(entry, cur, signs, out):
+        """PnL% per position, written into `out`."""
+        for i in prange(entry.shape[0]):
+            out[i] = signs[i] * (cur[i] - entry[i]) / entry[i] * 100.0
+        return out
+
+    # Compile now rather than on the first price tick
+    pnl_pct_kernel(np.ones(1), np.ones(1), np.ones(1), np.empty(1))
+else:
+    pnl_pct_kernel = _pnl_pct_numpy
@@ -1,10 +1,136 @@
+import decimal
+import functools
+from dataclasses import dataclass
 import logging
+import math
+import sys
 from decimal import Decimal, ROUND_DOWN, ROUND_UP
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, Tuple, Union
 
+import ccxt
 # Assuming MexcHandler is defined in mexc_handler.py
 from src.mexc_handler import MEXCHandler
 import src.config as config # Import config for default percentages
+from src.utils.sides import SIDE_SIGN, close_side, side_sign
+from src.trade_kernels import MAX_SCALED_PRICE, compute_sl_tp
+
+if not hasattr(decimal, '__libmpdec_version__'):
+    logging.warning("decimal is the pure-Python fallback, not the C (libmpdec) module; trade math will be slow.")
+
+# Explicit context for the trade math: 18 significant digits is ample for prices and amounts,
+# and passing it directly skips the thread-local context lookup of the operator forms
+_CTX = decimal.Context(prec=18)
+_ONE = Decimal('1')
+_HUNDRED = Decimal('100')
+# Amounts are floored to whole steps with float math only below this many steps; there the
+# few-ulp snap below stays far under a step. Larger amounts use Decimal.
+_MAX_FLOAT_AMOUNT_STEPS = 1e9
+# Relative nudge applied before flooring a scaled amount: absorbs representation error
+# (0.29 * 100 == 28.999999999999996) without ever reaching the next step the way rounding
+# would (12.9999999 must floor to 12, not 13)
+_AMOUNT_SNAP = 1.0 + 4 * sys.float_info.epsilon
+# Largest price precision (decimal places) priced with float math; finer ticks use Decimal
+_MAX_FLOAT_PRICE_PRECISION = 8
+
+# Per order side: (SL sign, TP sign, SL rounding, TP rounding). Bands sit below/above the
+# entry for a buy and mirrored for a sell; rounding always moves the level away from entry.
+_SL_TP_DIRECTION = {'buy': (Decimal('-1'), Decimal('1'), ROUND_DOWN, ROUND_UP),
+                    'sell': (Decimal('1'), Decimal('-1'), ROUND_UP, ROUND_DOWN)}
+
+
+@functools.lru_cache(maxsize=64)
+def _band_multipliers(side: str, sl_pct: float, tp_pct: float) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+    """
+    Return the (SL, TP) price multipliers for a side and SL/TP percentages, e.g.
+    ('buy', 1.5, 3) -> (0.985, 1.03); None where the percentage is not positive.
+
+    Cached because the same SL/TP settings are used for trade after trade.
+    """
+    direction = _SL_TP_DIRECTION.get(side)
+    if direction is None:
+        return None, None
+    sl_sign, tp_sign = direction[0], direction[1]
+    sl_fraction = _CTX.divide(Decimal(str(sl_pct)), _HUNDRED)
+    tp_fraction = _CTX.divide(Decimal(str(tp_pct)), _HUNDRED)
+    sl_mul = _ONE + sl_sign * sl_fraction if sl_fraction > 0 else None
+    tp_mul = _ONE + tp_sign * tp_fraction if tp_fraction > 0 else None
+    return sl_mul, tp_mul
+
+
+def _precision_step(precision: Union[int, float, str], tick_size: bool) -> Decimal:
+    """
+    Return the smallest price/amount increment for a ccxt market precision value: the value
+    itself under TICK_SIZE precision mode (e.g. 0.0001), else 10**-precision for a count of
+    decimal places (e.g. 4). Raises for values that are not a positive step.
+    """
+    if tick_size:
+        step = Decimal(str(precision)).normalize()
+    else:
+        step = _ONE.scaleb(-int(precision))
+    if not step.is_finite() or step <= 0:
+        raise ValueError(f"invalid precision {precision!r}")
+    return step
+
+
+def _make_band_pricer(price_quant: Decimal, sl_rounding: str, tp_rounding: str) -> Callable[..., Tuple[Optional[float], Optional[float]]]:
+    """
+    Build the SL/TP pricing step for one side of one market: the tick size and rounding
+    modes are bound once as closure cells instead of being looked up on every trade.
+    """
+    multiply = _CTX.multiply
+
+    if price_quant.as_tuple().digits != (1,):
+        # A tick that is not a power of ten (e.g. 0.5): quantize only rounds to decimal places,
+        # so round the number of ticks instead
+        divide = _CTX.divide
+
+        def to_tick(price: Decimal, rounding: str) -> Decimal:
+            return multiply(divide(price, price_quant).to_integral_value(rounding=rounding, context=_CTX), price_quant)
+    else:
+        def to_tick(price: Decimal, rounding: str) -> Decimal:
+            return price.quantize(price_quant, rounding=rounding, context=_CTX)
+
+    def price_bands(current_price: Decimal, sl_mul: Optional[Decimal], tp_mul: Optional[Decimal]) -> Tuple[Optional[float], Optional[float]]:
+        """Return the (SL, TP) prices as floats for ccxt, None where there is no multiplier."""
+        sl_price = tp_price = None
+        if sl_mul is not None:
+            sl_price = float(to_tick(multiply(current_price, sl_mul), sl_rounding))
+        if tp_mul is not None:
+            tp_price = float(to_tick(multiply(current_price, tp_mul), tp_rounding))
+        return sl_price, tp_price
+
+    return price_bands
+
+
+@dataclass(slots=True)
+class PositionInfo:
+    """
+    An open position as returned by TradeExecutor. Slotted for cheap per-tick attribute reads;
+    also supports the dict-style access (`get`, `[]`) that callers of the old plain-dict
+    position_info use.
+    """
+    symbol: str
+    side: str # 'buy' or 'sell'
+    size: float
+    entry_price: Decimal
+    side_sign: int
+    order_id: Optional[str]
+    sl_price: Optional[float]
+    tp_price: Optional[float]
+    timestamp: Optional[int]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        setattr(self, key, value)
+
 
 class TradeExecutor:
     """Handles placing and managing trades on the exchange."""
@@ -22,6 +148,10 @@ class TradeExecutor:
         self.symbol = symbol
         self.leverage = leverage
         self.market_details = None
+        # Static order fields per side, built once; each order only adds amount and SL/TP
+        self._order_templates = {side: {'symbol': symbol, 'side': side} for side in ('buy', 'sell')}
+        # Last known market price (see update_price), the entry estimate of last resort
+        self._last_price: Optional[float] = None
         self._load_market_details()
 
         if self.market_details:
@@ -33,13 +163,19 @@ class TradeExecutor:
             # Critical failure if market details can't be loaded
             raise ValueError(f"TradeExecutor: Could not fetch critical market details for {symbol}. Cannot proceed.")
 
+    def update_price(self, price: Optional[float]) -> None:
+        """Records the latest market price seen by the caller, so trades need not fetch one."""
+        if price:
+            self._last_price = price
+
     def _load_market_details(self):
         """Loads and stores market details required for trading."""
         self.market_details = self.mexc_handler.get_market(self.symbol)
+        self._amount_quant = None # Set below once the market's precision has been understood
         if not self.market_details:
             logging.error(f"TradeExecutor: Could not fetch market details for {self.symbol}. Trading might fail.")
         else:
-            logging.debug(f"Market details loaded for {self.symbol}")
+            logging.debug("Market details loaded for %s", self.symbol)
             # Pre-calculate or store needed precision/limits
             self.price_precision = self.market_details.get('precision', {}).get('price')
             self.amount_precision = self.market_details.get('precision', {}).get('amount')
@@ -61,7 +197,29 @@ class TradeExecutor:
             except Exception:
                  logging.error(f"Could not convert min_amount {self.min_amount} to Decimal. Defaulting to 0.0001")
                  self.min_amount_decimal = Decimal('0.0001')
-                 
+
+            # Quantization steps, built once instead of parsed from a string on every trade.
+            # ccxt's mexc reports precision as tick sizes (TICK_SIZE mode); the defaults above
+            # are always counts of decimal places.
+            exchange = getattr(self.mexc_handler, 'exchange', None)
+            tick_size = getattr(exchange, 'precisionMode', None) == ccxt.TICK_SIZE
+            market_precision = self.market_details.get('precision', {})
+            try:
+                amount_step = _precision_step(self.amount_precision, tick_size and market_precision.get('amount') is not None)
+                price_step = _precision_step(self.price_precision, tick_size and market_precision.get('price') is not None)
+            except Exception as e:
+                # Leave _amount_quant unset: trades then fail one by one instead of the constructor raising
+                logging.error(f"TradeExecutor: Unusable precision {market_precision} for {self.symbol}: {e}")
+                return
+            self._amount_quant = amount_step
+            self._amount_scale = float(_CTX.divide(_ONE, amount_step))
+            self._min_amount_float = float(self.min_amount_decimal)
+            self._price_quant = price_step
+            self._price_scale = float(_CTX.divide(_ONE, price_step))
+            self._float_prices = max(0, -price_step.as_tuple().exponent) <= _MAX_FLOAT_PRICE_PRECISION
+            # SL/TP pricing specialized per side for this market (see _make_band_pricer)
+            self._band_pricers = {side: _make_band_pricer(self._price_quant, sl_rounding, tp_rounding)
+                                  for side, (_, _, sl_rounding, tp_rounding) in _SL_TP_DIRECTION.items()}
 
     def _calculate_trade_params(
         self, 
@@ -82,17 +240,26 @@ class TradeExecutor:
         if not self.market_details:
             params['error'] = "Market details not loaded."
             return params
+        if self._amount_quant is None:
+            params['error'] = f"Market precision for {self.symbol} could not be used."
+            logging.error(params['error'])
+            return params
 
         # 1. Calculate final amount based on precision and minimums
         try:
-            amount_str = str(amount_base.quantize(Decimal('1e-'+str(self.amount_precision)), rounding=ROUND_DOWN))
-            final_amount = Decimal(amount_str)
+            scaled = float(amount_base) * self._amount_scale
+            if scaled < _MAX_FLOAT_AMOUNT_STEPS:
+                # Integer scaling instead of Decimal.quantize (see _AMOUNT_SNAP)
+                final_amount = math.floor(scaled * _AMOUNT_SNAP) / self._amount_scale
+            else:
+                steps = _CTX.divide(amount_base, self._amount_quant).to_integral_value(rounding=ROUND_DOWN, context=_CTX)
+                final_amount = float(_CTX.multiply(steps, self._amount_quant))
 
-            if final_amount < self.min_amount_decimal:
+            if final_amount < self._min_amount_float:
                 params['error'] = f"Trade amount {final_amount} is below minimum {self.min_amount_decimal}."
                 logging.error(params['error'])
                 return params
-            params['final_amount'] = float(final_amount) # Convert to float for ccxt
+            params['final_amount'] = final_amount # Float for ccxt
         except Exception as e:
              params['error'] = f"Error processing trade amount: {e}"
              logging.error(params['error'])
@@ -106,34 +273,24 @@ class TradeExecutor:
         elif current_price is None:
              return params # No SL/TP needed, amount is calculated
         
-        sl_price_decimal = None
-        tp_price_decimal = None
-        sl_pct_decimal = Decimal(str(stop_loss_pct)) / Decimal('100')
-        tp_pct_decimal = Decimal(str(take_profit_pct)) / Decimal('100')
-
-        try:
-            if side == 'buy':
-                if sl_pct_decimal > 0:
-                    sl_price_decimal = current_price * (Decimal('1') - sl_pct_decimal)
-                if tp_pct_decimal > 0:
-                    tp_price_decimal = current_price * (Decimal('1') + tp_pct_decimal)
-            elif side == 'sell':
-                if sl_pct_decimal > 0:
-                    sl_price_decimal = current_price * (Decimal('1') + sl_pct_decimal)
-                if tp_pct_decimal > 0:
-                    tp_price_decimal = current_price * (Decimal('1') - tp_pct_decimal)
-            
-            # Apply price precision
-            if sl_price_decimal is not None:
-                sl_rounding = ROUND_DOWN if side == 'buy' else ROUND_UP
-                sl_price_str = str(sl_price_decimal.quantize(Decimal('1e-'+str(self.price_precision)), rounding=sl_rounding))
-                params['sl_price'] = float(sl_price_str) # Convert to float for ccxt
+        if self._float_prices and float(current_price) * self._price_scale < MAX_SCALED_PRICE:
+            sign = SIDE_SIGN.get(side)
+            if sign is None:
+                return params # Unknown side, nothing to price
+            # Float kernel (JIT-compiled when numba is available); NaN marks a level not set
+            sl_price, tp_price = compute_sl_tp(float(current_price), float(stop_loss_pct), float(take_profit_pct),
+                                               sign, self._price_scale)
+            params['sl_price'] = None if math.isnan(sl_price) else sl_price
+            params['tp_price'] = None if math.isnan(tp_price) else tp_price
+            return params
 
-            if tp_price_decimal is not None:
-                tp_rounding = ROUND_UP if side == 'buy' else ROUND_DOWN
-                tp_price_str = str(tp_price_decimal.quantize(Decimal('1e-'+str(self.price_precision)), rounding=tp_rounding))
-                params['tp_price'] = float(tp_price_str) # Convert to float for ccxt
+        sl_multiplier, tp_multiplier = _band_multipliers(side, stop_loss_pct, take_profit_pct)
+        if sl_multiplier is None and tp_multiplier is None:
+            return params # Nothing to price (no positive percentages, or an unknown side)
 
+        try:
+            # Apply price precision; prices are returned as floats for ccxt
+            params['sl_price'], params['tp_price'] = self._band_pricers[side](current_price, sl_multiplier, tp_multiplier)
         except Exception as e:
             params['error'] = f"Error calculating SL/TP prices: {e}"
             logging.error(params['error'])
@@ -144,10 +301,12 @@ class TradeExecutor:
 
         return params
 
-    def execute_trade(self, side: str, amount: float, stop_loss_pct: float, take_profit_pct: float) -> Optional[Dict[str, Any]]:
+    def execute_trade(self, side: str, amount: float, stop_loss_pct: float, take_profit_pct: float,
+                      current_price: Optional[float] = None) -> Optional[PositionInfo]:
         """
         Executes an automated market trade with optional SL/TP.
-        Assumes `side` is 'buy' or 'sell'.
+        Assumes `side` is 'buy' or 'sell'. Pass `current_price` when the caller already
+        has a fresh price to skip the ticker request.
         """
         if side not in ['buy', 'sell']:
              logging.error(f"Invalid side '{side}' for execute_trade.")
@@ -155,12 +314,14 @@ class TradeExecutor:
              
         logging.info(f"Attempting automated {side} trade for {amount} {self.symbol}. SL%={stop_loss_pct}, TP%={take_profit_pct}")
 
-        # 1. Get current price (needed for SL/TP calc)
-        # Ideally, pass this in from the main loop to avoid extra API call
-        current_price_float = self.mexc_handler.get_current_price(self.symbol)
+        # 1. Get current price (needed for SL/TP calc), unless the caller supplied one
+        current_price_float = current_price
+        if current_price_float is None:
+            current_price_float = self.mexc_handler.get_current_price(self.symbol)
         if current_price_float is None:
              logging.error("Could not get current price. Cannot execute trade with SL/TP calculation.")
              return None
+        self._last_price = current_price_float
         current_price = Decimal(str(current_price_float))
 
         # 2. Calculate parameters
@@ -182,36 +343,37 @@ class TradeExecutor:
 
         # 3. Place order using MEXCHandler
         order_result = self.mexc_handler.place_market_order_with_sl_tp(
-            symbol=self.symbol,
-            side=side,
+            **self._order_templates[side],
             amount=final_amount,
             sl_price=sl_price,
             tp_price=tp_price
         )
 
         # 4. Parse the result and return position info dict
-        if order_result and order_result.get('id'):
-            logging.info(f"Automated {side} order placed successfully: ID {order_result.get('id')}")
+        order_id = order_result.get('id') if order_result else None
+        if order_id:
+            logging.info(f"Automated {side} order placed successfully: ID {order_id}")
             # TODO: Fetch order details for accurate fill price and size?
             # For now, estimate entry price and use requested amount
             entry_price_estimate = order_result.get('average') or order_result.get('price') or current_price_float
-            position_info = {
-                'symbol': self.symbol,
-                'side': side,
-                'size': final_amount, # Use calculated final amount
-                'entry_price': Decimal(str(entry_price_estimate)),
-                'order_id': order_result.get('id'),
-                'sl_price': sl_price, # Store the calculated SL/TP used
-                'tp_price': tp_price,
-                'timestamp': order_result.get('timestamp') # Get timestamp if available
-            }
-            logging.debug(f"Returning position info: {position_info}")
+            position_info = PositionInfo(
+                symbol=self.symbol,
+                side=side,
+                size=final_amount, # Use calculated final amount
+                entry_price=Decimal(str(entry_price_estimate)),
+                side_sign=side_sign(side),
+                order_id=order_id,
+                sl_price=sl_price, # Store the calculated SL/TP used
+                tp_price=tp_price,
+                timestamp=order_result.get('timestamp') # Get timestamp if available
+            )
+            logging.debug("Returning position info: %s", position_info)
             return position_info
         else:
             logging.error(f"Automated {side} order placement failed. Result: {order_result}")
             return None
 
-    def execute_manual_trade(self, side: str, amount: float) -> Optional[Dict[str, Any]]:
+    def execute_manual_trade(self, side: str, amount: float) -> Optional[PositionInfo]:
         """
         Executes a manual market trade (typically without SL/TP).
         Handles `side` as 'long' or 'short'.
@@ -237,83 +399,77 @@ class TradeExecutor:
         # Place order using MEXCHandler (without SL/TP params)
         # Assuming place_market_order_with_sl_tp handles None for sl/tp gracefully
         order_result = self.mexc_handler.place_market_order_with_sl_tp(
-            symbol=self.symbol,
-            side=trade_side,
+            **self._order_templates[trade_side],
             amount=final_amount,
             sl_price=None,
             tp_price=None
         )
 
         # Parse result (similar to execute_trade)
-        if order_result and order_result.get('id'):
-            logging.info(f"Manual {side} order placed successfully: ID {order_result.get('id')}")
-            # Estimate entry price
-            current_price_float = self.mexc_handler.get_current_price(self.symbol)
-            entry_price_estimate = order_result.get('average') or order_result.get('price') or current_price_float or 0
-            position_info = {
-                'symbol': self.symbol,
-                'side': trade_side,
-                'size': final_amount,
-                'entry_price': Decimal(str(entry_price_estimate)),
-                'order_id': order_result.get('id'),
-                'sl_price': None, # No SL/TP for manual trade
-                'tp_price': None,
-                'timestamp': order_result.get('timestamp')
-            }
-            logging.debug(f"Returning position info for manual trade: {position_info}")
+        order_id = order_result.get('id') if order_result else None
+        if order_id:
+            logging.info(f"Manual {side} order placed successfully: ID {order_id}")
+            # Estimate entry price from the fill, falling back to the last known price
+            entry_price_estimate = order_result.get('average') or order_result.get('price') or self._last_price or 0
+            position_info = PositionInfo(
+                symbol=self.symbol,
+                side=trade_side,
+                size=final_amount,
+                entry_price=Decimal(str(entry_price_estimate)),
+                side_sign=side_sign(trade_side),
+                order_id=order_id,
+                sl_price=None, # No SL/TP for manual trade
+                tp_price=None,
+                timestamp=order_result.get('timestamp')
+            )
+            logging.debug("Returning position info for manual trade: %s", position_info)
             return position_info
         else:
             logging.error(f"Manual {side} order placement failed. Result: {order_result}")
             return None
 
-    def check_sl_tp(self, position_info: Dict[str, Any], current_price: Decimal) -> Optional[str]:
+    def check_sl_tp(self, position_info: Union[PositionInfo, Dict[str, Any]], current_price: float) -> Optional[str]:
         """
         Checks if the current price has hit the SL or TP level for a given position.
-        Uses pre-calculated sl_price and tp_price from position_info.
+        Uses pre-calculated sl_price and tp_price (floats) from position_info; plain float
+        comparisons are exact enough for a threshold check.
         """
         if not position_info or not current_price:
              return None # Cannot check without position or price
              
-        sl_price_stored = position_info.get('sl_price')
-        tp_price_stored = position_info.get('tp_price')
+        sl_price = position_info.get('sl_price')
+        tp_price = position_info.get('tp_price')
+        if not sl_price and not tp_price:
+            # Manual trades carry neither; bail out before any other work on every tick
+            return None # No SL/TP set for this position
+
         side = position_info.get('side') # 'buy' or 'sell'
-        
-        # Convert stored SL/TP to Decimal for comparison, handle None
         try:
-            sl_price_decimal = Decimal(str(sl_price_stored)) if sl_price_stored is not None else None
-            tp_price_decimal = Decimal(str(tp_price_stored)) if tp_price_stored is not None else None
-        except Exception as e:
-            logging.error(f"Error converting stored SL/TP to Decimal: {e}")
-            return None # Cannot compare if conversion fails
-
-        if not sl_price_decimal and not tp_price_decimal:
-            # logging.debug("No SL/TP set for position, skipping check.")
-            return None # No SL/TP set for this position
+            current_price = float(current_price)
+        except (TypeError, ValueError) as e:
+            logging.error(f"Error converting current price for SL/TP check: {e}")
+            return None
         
-        logging.debug(f"Checking SL/TP for {side} position: Current={current_price}, SL={sl_price_decimal}, TP={tp_price_decimal}")
+        logging.debug("Checking SL/TP for %s position: Current=%s, SL=%s, TP=%s", side, current_price, sl_price, tp_price)
         
-        try:
-            if side == 'buy':
-                if sl_price_decimal and current_price <= sl_price_decimal:
-                    logging.info(f"Stop Loss triggered for BUY position at {current_price} (SL: {sl_price_decimal})")
-                    return 'SL'
-                if tp_price_decimal and current_price >= tp_price_decimal:
-                    logging.info(f"Take Profit triggered for BUY position at {current_price} (TP: {tp_price_decimal})")
-                    return 'TP'
-            elif side == 'sell':
-                if sl_price_decimal and current_price >= sl_price_decimal:
-                    logging.info(f"Stop Loss triggered for SELL position at {current_price} (SL: {sl_price_decimal})")
-                    return 'SL'
-                if tp_price_decimal and current_price <= tp_price_decimal:
-                    logging.info(f"Take Profit triggered for SELL position at {current_price} (TP: {tp_price_decimal})")
-                    return 'TP'
-        except Exception as e:
-            logging.error(f"Error during SL/TP comparison: {e}")
-            return None
+        if side == 'buy':
+            if sl_price and current_price <= sl_price:
+                logging.info(f"Stop Loss triggered for BUY position at {current_price} (SL: {sl_price})")
+                return 'SL'
+            if tp_price and current_price >= tp_price:
+                logging.info(f"Take Profit triggered for BUY position at {current_price} (TP: {tp_price})")
+                return 'TP'
+        elif side == 'sell':
+            if sl_price and current_price >= sl_price:
+                logging.info(f"Stop Loss triggered for SELL position at {current_price} (SL: {sl_price})")
+                return 'SL'
+            if tp_price and current_price <= tp_price:
+                logging.info(f"Take Profit triggered for SELL position at {current_price} (TP: {tp_price})")
+                return 'TP'
             
         return None # No trigger
 
-    def close_position(self, position_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def close_position(self, position_info: Union[PositionInfo, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
         Closes the given position with a market order.
         """
@@ -329,27 +485,34 @@ class TradeExecutor:
             logging.error(f"Cannot close position for {symbol}: Missing size or side information.")
             return None
         
-        try:
-             # Ensure size is a float for the order
-             amount_to_close = abs(float(size))
-        except ValueError as e:
-             logging.error(f"Cannot close position: Invalid size format '{size}': {e}")
-             return None
+        if type(size) is float:
+            amount_to_close = abs(size) # PositionInfo sizes are always floats
+        else:
+            try:
+                 # Ensure size is a float for the order
+                 amount_to_close = abs(float(size))
+            except ValueError as e:
+                 logging.error(f"Cannot close position: Invalid size format '{size}': {e}")
+                 return None
              
-        close_side = 'sell' if side == 'buy' else 'buy' # Opposite side to close
-        logging.info(f"Attempting to close {side} position for {symbol} by placing {close_side} order for {amount_to_close}.")
+        sign = position_info.get('side_sign') or SIDE_SIGN.get(side)
+        if sign is None:
+            logging.error(f"Cannot close position for {symbol}: Invalid side '{side}'.")
+            return None
+        closing_side = close_side(sign) # Opposite side to close
+        logging.info(f"Attempting to close {side} position for {symbol} by placing {closing_side} order for {amount_to_close}.")
 
         # Place closing order (market order, no SL/TP)
         try:
             order_result = self.mexc_handler.place_market_order_with_sl_tp(
                 symbol=symbol,
-                side=close_side,
+                side=closing_side,
                 amount=amount_to_close,
                 sl_price=None,
                 tp_price=None
             )
             if order_result and order_result.get('id'):
-                 logging.info(f"Position close order placed successfully: ID {order_result.get('id')}")
+                 logging.info(f"Position close order placed successfully: ID {order_result['id']}")
                  # Return the closing order details
                  return order_result
             else:
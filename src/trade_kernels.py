@@ -0,0 +1,57 @@
+"""
+Float64 kernels for per-trade price math.
+
+When numba is installed the kernels are JIT-compiled and warmed up at import time, which
+makes them cheap enough to call in backtest loops; otherwise the same code runs as plain
+Python, which is still far cheaper than the equivalent Decimal arithmetic.
+"""
+import math
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# Scaled prices within this relative distance of a whole tick are treated as exactly on it,
+# so representation error (e.g. 0.5046 * 10**4 == 5045.999999999999) cannot cost a tick.
+# A few ulps: callers keep scaled prices small enough (see MAX_SCALED_PRICE) that this
+# stays far below any genuine distance from a tick.
+_TICK_SNAP = 1e-14
+
+# Largest price, in ticks, the kernels handle exactly; beyond it use Decimal
+MAX_SCALED_PRICE = 1e9
+
+
+def _compute_sl_tp(price, sl_pct, tp_pct, side_sign, price_scale):
+    """
+    SL and TP prices for a position of direction `side_sign` (+1 long, -1 short) opened at
+    `price`, rounded to 1/`price_scale` away from the entry (SL down and TP up for a long,
+    mirrored for a short). A percentage that is not positive gives NaN for that level.
+    """
+    sl = math.nan
+    tp = math.nan
+    if sl_pct > 0:
+        scaled = price * (1.0 - side_sign * sl_pct / 100.0) * price_scale
+        snap = scaled * _TICK_SNAP
+        if side_sign > 0:
+            sl = math.floor(scaled + snap) / price_scale
+        else:
+            sl = math.ceil(scaled - snap) / price_scale
+    if tp_pct > 0:
+        scaled = price * (1.0 + side_sign * tp_pct / 100.0) * price_scale
+        snap = scaled * _TICK_SNAP
+        if side_sign > 0:
+            tp = math.ceil(scaled - snap) / price_scale
+        else:
+            tp = math.floor(scaled + snap) / price_scale
+    return sl, tp
+
+
+if HAVE_NUMBA:
+    compute_sl_tp = njit(cache=True)(_compute_sl_tp)
+
+    # Compile now rather than on the first trade
+    compute_sl_tp(1.0, 1.0, 1.0, 1, 100.0)
+else:
+    compute_sl_tp = _compute_sl_tp
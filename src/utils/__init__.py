@@ -1,19 +1,41 @@
 from src.utils.error_handler import (
     APIError, 
     ConnectionError, 
+    CircuitOpenError,
     AuthenticationError, 
     RateLimitError, 
     DataError,
     handle_api_errors,
     safe_api_call
 )
+from src.utils import market_cache
+from src.utils.cache import TTLCache
+from src.utils.rate_limiter import TokenBucket
+from src.utils.ohlcv_store import OHLCVStore
+from src.utils.single_flight import SingleFlight
+from src.utils.retry import CircuitBreaker, retry
+from src.utils.ring_buffer import OHLCVRingBuffer
+from src.utils.sides import Side, SIDE_SIGN, side_sign, close_side
 
 __all__ = [
     'APIError',
     'ConnectionError',
+    'CircuitOpenError',
     'AuthenticationError',
     'RateLimitError',
     'DataError',
     'handle_api_errors',
-    'safe_api_call'
-] 
\ No newline at end of file
+    'safe_api_call',
+    'TTLCache',
+    'TokenBucket',
+    'OHLCVStore',
+    'SingleFlight',
+    'CircuitBreaker',
+    'retry',
+    'OHLCVRingBuffer',
+    'market_cache',
+    'Side',
+    'SIDE_SIGN',
+    'side_sign',
+    'close_side'
+] 
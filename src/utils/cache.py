@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small thread-safe key/value cache whose entries expire after a fixed TTL.
+
+    Expiry uses time.monotonic(), so wall-clock adjustments do not affect it.
+    When `maxsize` is reached the oldest inserted entry is evicted.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        """
+        Args:
+            ttl: Lifetime of an entry in seconds.
+            maxsize: Maximum number of entries kept.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if absent or expired."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            with self._lock:
+                # Only drop it if nobody refreshed the entry in the meantime
+                if self._data.get(key) is entry:
+                    del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key` for `ttl` seconds."""
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Dicts keep insertion order, so the first key is the oldest
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Remove `key` and return its value (expired or not), or `default`."""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
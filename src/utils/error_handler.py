@@ -3,6 +3,8 @@ import functools
 import traceback
 from typing import Callable, Any, Optional, TypeVar, cast
 
+import ccxt
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,9 @@ R = TypeVar('R')
 
 class APIError(Exception):
     """Base exception for API-related errors."""
+    # Stored in slots so raising one never allocates an instance __dict__
+    __slots__ = ('message', 'original_error')
+
     def __init__(self, message: str, original_error: Optional[Exception] = None):
         self.message = message
         self.original_error = original_error
@@ -25,22 +30,68 @@ class APIError(Exception):
 
 class ConnectionError(APIError):
     """Exception raised for connection-related issues."""
-    pass
+    __slots__ = ()
+
+
+class CircuitOpenError(ConnectionError):
+    """Exception raised when calls are short-circuited after repeated connection failures."""
+    __slots__ = ()
 
 
 class AuthenticationError(APIError):
     """Exception raised for authentication failures."""
-    pass
+    __slots__ = ()
 
 
 class RateLimitError(APIError):
     """Exception raised when hitting rate limits."""
-    pass
+    __slots__ = ()
 
 
 class DataError(APIError):
     """Exception raised for data parsing or validity issues."""
-    pass
+    __slots__ = ()
+
+
+# ccxt exception -> (our exception, message prefix). Checked in order: RateLimitExceeded
+# subclasses NetworkError, so it must come first.
+_EXC_MAP = (
+    (ccxt.RateLimitExceeded, RateLimitError, "Rate limit"),
+    (ccxt.AuthenticationError, AuthenticationError, "Authentication"),
+    (ccxt.NetworkError, ConnectionError, "Connection"),
+    (ccxt.BadResponse, DataError, "Data"),
+)
+
+
+def _translate_error(name: str, e: Exception) -> APIError:
+    """
+    Log an exception raised by the wrapped call `name` and map it to our exception hierarchy.
+
+    Kept out of the decorator's wrapper so the success path stays a bare try/return.
+    """
+    # Log the full stack trace for debugging
+    logger.error(f"API Error in {name}: {str(e)}")
+    if logger.isEnabledFor(logging.DEBUG): # Formatting the stack is wasted work otherwise
+        logger.debug(traceback.format_exc())
+
+    # Map ccxt exception types to our custom exceptions
+    for ccxt_error, api_error, label in _EXC_MAP:
+        if isinstance(e, ccxt_error):
+            return api_error(f"{label} error in {name}", e)
+
+    # Anything else is classified by its message
+    message = str(e).lower()
+    if "connection" in message or "timeout" in message:
+        return ConnectionError(f"Connection error in {name}", e)
+    elif "auth" in message or "api key" in message:
+        return AuthenticationError(f"Authentication error in {name}", e)
+    elif "rate" in message or "limit" in message:
+        return RateLimitError(f"Rate limit error in {name}", e)
+    elif "data" in message or "parse" in message:
+        return DataError(f"Data error in {name}", e)
+    else:
+        # For unknown errors, re-raise as APIError
+        return APIError(f"Unexpected error in {name}", e)
 
 
 def handle_api_errors(func: Callable[..., R]) -> Callable[..., Optional[R]]:
@@ -53,27 +104,14 @@ def handle_api_errors(func: Callable[..., R]) -> Callable[..., Optional[R]]:
     Returns:
         The wrapped function that handles errors gracefully.
     """
+    name = func.__name__
+
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Optional[R]:
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            # Log the full stack trace for debugging
-            logger.error(f"API Error in {func.__name__}: {str(e)}")
-            logger.debug(traceback.format_exc())
-            
-            # Map common exception types to our custom exceptions
-            if "connection" in str(e).lower() or "timeout" in str(e).lower():
-                raise ConnectionError(f"Connection error in {func.__name__}", e)
-            elif "auth" in str(e).lower() or "api key" in str(e).lower():
-                raise AuthenticationError(f"Authentication error in {func.__name__}", e)
-            elif "rate" in str(e).lower() or "limit" in str(e).lower():
-                raise RateLimitError(f"Rate limit error in {func.__name__}", e)
-            elif "data" in str(e).lower() or "parse" in str(e).lower():
-                raise DataError(f"Data error in {func.__name__}", e)
-            else:
-                # For unknown errors, re-raise as APIError
-                raise APIError(f"Unexpected error in {func.__name__}", e)
+            raise _translate_error(name, e)
     
     return cast(Callable[..., Optional[R]], wrapper)
 
@@ -94,5 +132,6 @@ def safe_api_call(func: Callable[..., R], *args: Any, **kwargs: Any) -> Optional
         return func(*args, **kwargs)
     except Exception as e:
         logger.error(f"API call failed: {func.__name__} - {str(e)}")
-        logger.debug(traceback.format_exc())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
         return None 
\ No newline at end of file
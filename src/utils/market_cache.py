@@ -0,0 +1,47 @@
+import logging
+import os
+import pickle
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def load(path: str, max_age: float) -> Optional[Dict[str, Any]]:
+    """
+    Return the markets dict pickled at `path` if the file is at most `max_age` seconds old.
+
+    A missing, stale or unreadable file returns None so the caller falls back to the exchange.
+    """
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable markets cache {path}: {e}")
+        return None
+
+
+def save(path: str, markets: Dict[str, Any]) -> None:
+    """Atomically write `markets` to `path`; failures only cost a slower next startup."""
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(markets, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Could not write markets cache {path}: {e}")
+
+
+def invalidate(path: str) -> None:
+    """Delete the cache file so the next startup loads markets from the exchange."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove markets cache {path}: {e}")
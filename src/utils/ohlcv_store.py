@@ -0,0 +1,64 @@
+import sqlite3
+import threading
+from typing import List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ohlcv (
+    symbol TEXT NOT NULL,
+    tf TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    o REAL, h REAL, l REAL, c REAL, v REAL,
+    PRIMARY KEY (symbol, tf, ts)
+)
+"""
+
+
+class OHLCVStore:
+    """
+    Local SQLite copy of fetched candles, so callers only need to download the delta
+    since the newest stored candle.
+
+    One connection is shared between threads and guarded by a lock; WAL mode lets
+    readers in other processes proceed while candles are being written.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file (':memory:' keeps the store in memory).
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Return the open time (ms) of the newest stored candle, or None if there is none."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT max(ts) FROM ohlcv WHERE symbol=? AND tf=?", (symbol, timeframe)
+            ).fetchone()
+        return row[0]
+
+    def upsert(self, symbol: str, timeframe: str, candles: List[List[float]]) -> None:
+        """Insert candles, replacing stored ones with the same open time (e.g. the still-forming candle)."""
+        rows = [(symbol, timeframe, int(c[0]), c[1], c[2], c[3], c[4], c[5]) for c in candles]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO ohlcv VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def tail(self, symbol: str, timeframe: str, limit: int) -> List[List[float]]:
+        """Return the newest `limit` candles in ascending time order, in ccxt's [ts, o, h, l, c, v] layout."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, o, h, l, c, v FROM ohlcv WHERE symbol=? AND tf=? ORDER BY ts DESC LIMIT ?",
+                (symbol, timeframe, limit),
+            ).fetchall()
+        rows.reverse()
+        return [list(row) for row in rows]
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
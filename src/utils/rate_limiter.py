@@ -0,0 +1,45 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to smooth bursts of outgoing requests.
+
+    Each call to acquire() takes one token; when the bucket is empty the caller
+    sleeps just long enough for a token to be refilled.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Args:
+            capacity: Maximum number of tokens (the largest allowed burst).
+            refill_rate: Tokens added per second.
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill (caller holds the lock)."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+
+    def acquire(self) -> None:
+        """Take one token, sleeping only if none is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            # A negative balance is the caller's place in line; wait until it is paid back
+            wait = -self._tokens / self.refill_rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server reported a rate-limit violation."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
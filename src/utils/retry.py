@@ -0,0 +1,114 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple, Type
+
+from src.utils.error_handler import CircuitOpenError
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker: after `failure_threshold` consecutive failures the
+    circuit opens and calls fail fast for `reset_timeout` seconds. After that a single
+    trial call is let through; its success closes the circuit, its failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds the circuit stays open before allowing a trial call.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: let this caller try, and hold everyone else off for another period
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+
+def retry(fn: Callable[[], Any], *,
+          attempts: int = 3,
+          base: float = 0.2,
+          cap: float = 5.0,
+          retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+          retry_if_result: Optional[Callable[[Any], bool]] = None,
+          retry_after: Optional[Callable[[BaseException], Optional[float]]] = None,
+          on_retry: Optional[Callable[[int, Optional[BaseException]], None]] = None,
+          breaker: Optional[CircuitBreaker] = None) -> Any:
+    """
+    Call `fn` until it succeeds, sleeping with decorrelated-jitter exponential backoff
+    (`uniform(base, previous * 3)`, capped at `cap`) between attempts.
+
+    Args:
+        fn: Zero-argument callable to run.
+        attempts: Maximum number of calls.
+        base, cap: Smallest and largest delay in seconds.
+        retry_on: Exceptions that are retried; anything else propagates immediately.
+        retry_if_result: Predicate marking a returned value as a failed attempt (e.g. empty data).
+        retry_after: Returns a server-requested minimum delay for an exception, or None.
+        on_retry: Called with (zero-based attempt, exception or None) after each failed attempt.
+        breaker: Circuit breaker consulted before, and updated after, every attempt.
+
+    Returns:
+        The first accepted result, or the last result if every attempt was rejected by
+        `retry_if_result`.
+
+    Raises:
+        CircuitOpenError: If `breaker` is open.
+        The last retried exception once all attempts are used up.
+    """
+    delay = base
+    for attempt in range(attempts):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("Circuit open after repeated failures; failing fast")
+        try:
+            result = fn()
+        except retry_on as e:
+            if breaker is not None:
+                breaker.record_failure()
+            error: Optional[BaseException] = e
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            if retry_if_result is None or not retry_if_result(result):
+                return result
+            error = None
+
+        if on_retry is not None:
+            on_retry(attempt, error)
+        if attempt + 1 == attempts:
+            if error is not None:
+                raise error
+            return result
+
+        delay = min(cap, random.uniform(base, delay * 3))
+        hinted = retry_after(error) if retry_after is not None and error is not None else None
+        time.sleep(max(delay, hinted) if hinted else delay)
@@ -0,0 +1,79 @@
+import threading
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+
+class OHLCVRingBuffer:
+    """
+    Preallocated, timestamp-ordered store of the most recent `capacity` candles as rows of
+    a float64 array ([ts, open, high, low, close, volume]).
+
+    Rows live in a buffer twice the capacity and are compacted to the front only when
+    the end is reached, so the stored window is always contiguous and view() can hand
+    out a zero-copy slice. A view stays valid until roughly `capacity` further candles
+    have been pushed; copy it if it must be kept longer.
+
+    Writes are serialized by a lock; reads take no lock.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Maximum number of candles kept.
+        """
+        self.capacity = capacity
+        self._buf = np.empty((2 * capacity, 6), dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def view(self, limit: Optional[int] = None) -> np.ndarray:
+        """Return a read-only view of the newest `limit` candles (all of them if None), oldest first."""
+        end = self._end
+        start = self._start if limit is None else max(self._start, end - limit)
+        rows = self._buf[start:end]
+        rows.flags.writeable = False
+        return rows
+
+    def extend(self, candles: Iterable[Sequence[float]]) -> None:
+        """
+        Add candles, replacing stored ones with the same open time.
+
+        Newer candles (the streaming case) are appended in O(1); candles older than the
+        newest stored one, e.g. a REST backfill, trigger a full merge.
+        """
+        candles = list(candles)
+        with self._lock:
+            for i, candle in enumerate(candles):
+                ts = candle[0]
+                if self._end == self._start or ts > self._buf[self._end - 1, 0]:
+                    self._append(candle)
+                elif ts == self._buf[self._end - 1, 0]:
+                    self._buf[self._end - 1] = candle # The still-forming candle was updated
+                else:
+                    self._merge(candles[i:])
+                    return
+
+    def _append(self, candle: Sequence[float]) -> None:
+        """Append one row after the newest (caller holds the lock)."""
+        if self._end == len(self._buf):
+            count = self._end - self._start
+            self._buf[:count] = self._buf[self._start:self._end]
+            self._start, self._end = 0, count
+        self._buf[self._end] = candle
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+
+    def _merge(self, candles: Sequence[Sequence[float]]) -> None:
+        """Merge out-of-order candles by open time and rewrite the window from the front (caller holds the lock)."""
+        by_ts = {row[0]: row for row in self._buf[self._start:self._end].tolist()}
+        for candle in candles:
+            by_ts[float(candle[0])] = list(candle)
+        rows = [by_ts[ts] for ts in sorted(by_ts)][-self.capacity:]
+        self._buf[:len(rows)] = rows
+        self._start, self._end = 0, len(rows)
@@ -0,0 +1,21 @@
+from typing import Literal
+
+# Position direction as an integer: +1 long, -1 short. Encoded once when a position is
+# opened so PnL and close paths use arithmetic instead of string comparisons.
+Side = Literal[1, -1]
+
+# Order sides ('buy'/'sell') and ccxt position sides ('long'/'short') to their sign
+SIDE_SIGN = {'buy': 1, 'sell': -1, 'long': 1, 'short': -1}
+
+# Order side that closes a position, indexed by (side_sign + 1) // 2
+_CLOSE_SIDES = ('buy', 'sell')
+
+
+def side_sign(side: str) -> Side:
+    """Return +1 for 'buy'/'long' and -1 for 'sell'/'short'; raises KeyError for anything else."""
+    return SIDE_SIGN[side]
+
+
+def close_side(sign: int) -> str:
+    """Return the order side that closes a position with the given side sign."""
+    return _CLOSE_SIDES[(sign + 1) // 2]
@@ -1,8 +1,9 @@
 from src.widgets.connection_status import ConnectionStatusWidget
 from src.widgets.position_history import PositionHistoryWidget
-from src.widgets.settings_panel import SettingsPanelWidget, SettingChangedMessage
+from src.widgets.settings_panel import SettingsPanelWidget, SettingsChangedMessage
 from src.widgets.mini_chart import MiniChartWidget
 from src.widgets.theme_manager import ThemeManager, ThemeChangedMessage
+from src.widgets.notification import NotificationWidget, NotificationMessage
 
 __all__ = [
     "ConnectionStatusWidget",
@@ -11,5 +12,7 @@ __all__ = [
     "MiniChartWidget",
     "ThemeManager",
     "ThemeChangedMessage",
-    "SettingChangedMessage"
+    "SettingsChangedMessage",
+    "NotificationWidget",
+    "NotificationMessage"
 ] 
\ No newline at end of file
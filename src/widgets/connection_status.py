@@ -41,20 +41,33 @@ class ConnectionStatusWidget(Widget):
     
     def __init__(self, name: str | None = None):
         super().__init__(name=name)
+        # Rendered Text, reused across repaints until the status or error changes
+        self._cached_text: Text | None = None
+        self._status_upper = self.status.upper()
         self._set_status_class()
     
     def render(self) -> RenderableType:
         """Render the widget based on current status."""
-        status_text = f"MEXC API: {self.status.upper()}"
+        if self._cached_text is not None:
+            return self._cached_text
+
+        status_text = f"MEXC API: {self._status_upper}"
         
         if self.status == "error" and self.last_error:
             status_text += f" - {self.last_error}"
             
-        return Text(status_text, justify="center")
+        self._cached_text = Text(status_text, justify="center")
+        return self._cached_text
     
     def watch_status(self, new_status: str) -> None:
         """React to status changes by updating CSS classes."""
+        self._status_upper = new_status.upper()
+        self._cached_text = None
         self._set_status_class()
+
+    def watch_last_error(self, new_error: str) -> None:
+        """Drop the cached text so the new error is shown."""
+        self._cached_text = None
     
     def _set_status_class(self) -> None:
         """Set the appropriate CSS class based on current status."""
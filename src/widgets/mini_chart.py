@@ -8,6 +8,9 @@ import pandas as pd
 import numpy as np
 from rich.text import Text
 
+from src.chart_kernels import GLYPHS, plot_candles_kernel
+from src.utils.ring_buffer import OHLCVRingBuffer
+
 
 class MiniChartWidget(Widget):
     """Simple chart widget using Unicode block characters."""
@@ -22,8 +25,7 @@ class MiniChartWidget(Widget):
     }
     """
     
-    # Reactive variable to track data and visibility
-    data = reactive(None)
+    # Reactive variable to track visibility
     is_visible = reactive(False)
     
     def __init__(self, name: str = None):
@@ -34,105 +36,135 @@ class MiniChartWidget(Widget):
         self.style_bullish = "bold green"
         self.style_bearish = "bold red"
         self.style_neutral = "bold white"
+        # The candles on screen as rows of [open time ms, open, high, low, close, volume],
+        # the symbol they belong to and a counter bumped whenever they change
+        self._candles = OHLCVRingBuffer(self.chart_width)
+        self._symbol = None
+        self._candles_version = 0
+        # Axis labels for the last (min_price, max_price, chart_height) they were built for
+        self._label_cache_key = None
+        self._price_labels = None
+        # Header for the last candle row it was built from
+        self._last_header_key = None
+        self._last_header_str = None
+        # Last rendered chart and the (candles version, width, height) it was rendered for
+        self._render_cache_key = None
+        self._rendered = None
         
     def on_mount(self):
         """Initial setup on widget mount."""
         # Hide initially
         self.visible = False
         
-    def update_data(self, ohlcv_data: pd.DataFrame, indicator=None):
-        """Update the chart with new OHLCV data."""
-        if ohlcv_data is not None and not ohlcv_data.empty:
-            self.data = ohlcv_data
+    def update_data(self, ohlcv_data: pd.DataFrame, indicator=None, symbol: str = None):
+        """
+        Update the chart with new OHLCV data; a hidden chart only stores it until shown.
+
+        Only candles from the newest one already on screen onwards are copied in, so a
+        refetched frame usually costs one or two rows. Data for a different symbol
+        replaces the chart instead.
+        """
+        if ohlcv_data is None or ohlcv_data.empty:
+            return
+        if symbol != self._symbol:
+            self._candles = OHLCVRingBuffer(self.chart_width)
+            self._symbol = symbol
+        
+        tail = ohlcv_data.iloc[-self.chart_width:]
+        # Open times come from a 'timestamp' column (DataHandler frames) or the index
+        times = tail['timestamp'] if 'timestamp' in tail.columns else tail.index
+        open_ms = pd.DatetimeIndex(times).as_unit('ms').asi8
+        start = np.searchsorted(open_ms, self._candles.view(1)[0, 0]) if len(self._candles) else 0
+        new = tail.iloc[start:]
+        
+        volume = new['volume'].to_numpy(dtype=np.float64) if 'volume' in new.columns else np.zeros(len(new))
+        rows = np.column_stack((open_ms[start:], new[['open', 'high', 'low', 'close']].to_numpy(dtype=np.float64), volume))
+        self._candles.extend(rows)
+        self._candles_version += 1
+        if self.visible:
             self.refresh()
     
     def render(self):
         """Render the chart with the current data."""
-        if self.data is None or self.data.empty:
+        if not self.visible:
+            return Text("") # Nothing to draw while hidden; toggle() repaints when shown
+        if not len(self._candles):
             return Text("No chart data available")
         
-        # Extract most recent candles that fit in our chart width
-        candles = self.data.iloc[-self.chart_width:] if len(self.data) > self.chart_width else self.data
+        # Repaints without new data (visibility toggles, resizes elsewhere) reuse the last chart
+        render_key = (self._candles_version, self.chart_width, self.chart_height)
+        if render_key == self._render_cache_key:
+            return self._rendered
+        
+        # Most recent candles that fit in our chart width; (open, high, low, close) rows serve
+        # scaling, the header and plotting
+        candles = self._candles.view(self.chart_width)
+        open_ms = candles[:, 0]
+        ohlc = candles[:, 1:5]
         
-        # Determine min and max for scaling
-        min_price = candles['low'].min()
-        max_price = candles['high'].max()
-        price_range = max_price - min_price
+        # Determine min and max for scaling; a flat range is widened so it never divides by zero
+        min_price = ohlc[:, 2].min()
+        max_price = ohlc[:, 1].max()
+        price_range = max(max_price - min_price, 1e-12)
         
         # Create chart canvas
         chart = []
-        header = f"{self.title} - {candles.index[-1].strftime('%Y-%m-%d %H:%M')} - "
-        header += f"O: {candles['open'].iloc[-1]:.4f} H: {candles['high'].iloc[-1]:.4f} L: {candles['low'].iloc[-1]:.4f} C: {candles['close'].iloc[-1]:.4f}"
+        # The header only changes with the last candle (its open time, or its OHLC while still forming)
+        last_candle = tuple(candles[-1].tolist())
+        if last_candle != self._last_header_key:
+            last_time, last_open, last_high, last_low, last_close, _ = last_candle
+            header = f"{self.title} - {pd.Timestamp(int(last_time), unit='ms').strftime('%Y-%m-%d %H:%M')} - "
+            header += f"O: {last_open:.4f} H: {last_high:.4f} L: {last_low:.4f} C: {last_close:.4f}"
+            self._last_header_key = last_candle
+            self._last_header_str = header
+        header = self._last_header_str
         
         # Fill chart with candles
         chart_text = Text(header + "\n")
         
-        # Create price axis labels
-        price_labels = []
-        for i in range(self.chart_height):
-            price = max_price - (i / (self.chart_height - 1)) * price_range
-            price_labels.append(f"{price:.4f}")
+        # Create price axis labels, unless the scale is unchanged since the last render
+        label_key = (min_price, max_price, self.chart_height)
+        if label_key != self._label_cache_key:
+            price_labels = []
+            for i in range(self.chart_height):
+                price = max_price - (i / (self.chart_height - 1)) * price_range
+                price_labels.append(f"{price:.4f}")
+            self._label_cache_key = label_key
+            self._price_labels = price_labels
+        price_labels = self._price_labels
         
-        # Draw chart grid
-        grid = []
-        for i in range(self.chart_height):
-            row = [" "] * len(candles)
-            grid.append(row)
+        # Normalize all candle values to chart rows in one pass: rows of (open, high, low, close).
+        # Scaled in place in this order, since folding it into x * scale + offset moves values
+        # sitting exactly on a row boundary to the row below
+        top = self.chart_height - 1
+        scaled = ohlc - min_price
+        scaled /= price_range
+        scaled *= top
+        # Invert Y axis (0 is top in terminal) and keep values within bounds
+        ys = top - scaled.astype(np.int64)
+        np.clip(ys, 0, top, out=ys)
         
-        # Plot candles
-        for idx, (_, candle) in enumerate(candles.iterrows()):
-            # Skip if out of bounds
-            if idx >= len(grid[0]):
-                continue
-                
-            # Normalize candle values to chart height
-            open_y = int(((candle['open'] - min_price) / price_range) * (self.chart_height - 1))
-            close_y = int(((candle['close'] - min_price) / price_range) * (self.chart_height - 1))
-            high_y = int(((candle['high'] - min_price) / price_range) * (self.chart_height - 1))
-            low_y = int(((candle['low'] - min_price) / price_range) * (self.chart_height - 1))
-            
-            # Invert Y axis (0 is top in terminal)
-            open_y = self.chart_height - 1 - open_y
-            close_y = self.chart_height - 1 - close_y
-            high_y = self.chart_height - 1 - high_y
-            low_y = self.chart_height - 1 - low_y
-            
-            # Ensure values are within bounds
-            open_y = max(0, min(open_y, self.chart_height - 1))
-            close_y = max(0, min(close_y, self.chart_height - 1))
-            high_y = max(0, min(high_y, self.chart_height - 1))
-            low_y = max(0, min(low_y, self.chart_height - 1))
-            
-            # Determine candle direction
-            is_bullish = candle['close'] >= candle['open']
-            
-            # Draw candle body
-            body_start = min(open_y, close_y)
-            body_end = max(open_y, close_y)
-            
-            for y in range(self.chart_height):
-                if y == open_y and y == close_y:
-                    grid[y][idx] = "─"  # Doji
-                elif y >= body_start and y <= body_end:
-                    grid[y][idx] = "█"  # Body
-                elif y >= high_y and y <= low_y:
-                    grid[y][idx] = "│"  # Wick
+        # Draw chart grid: one column per candle, a glyph code per cell
+        codes = plot_candles_kernel(ys, self.chart_height, np.empty((self.chart_height, len(ys)), dtype=np.uint8))
+        grid = GLYPHS[codes]
         
         # Convert grid to text
-        for i, row in enumerate(grid):
-            line = f"{price_labels[i]} "
-            for cell in row:
-                line += cell
-            chart_text.append(line + "\n")
+        rows = ["".join(row) for row in grid.tolist()]
+        for i, row in enumerate(rows):
+            chart_text.append(f"{price_labels[i]} {row}\n")
             
         # Add time axis
         time_axis = "       "  # Align with price labels
-        time_points = [candles.index[0].strftime('%H:%M'), candles.index[-1].strftime('%H:%M')]
+        time_points = [pd.Timestamp(int(ms), unit='ms').strftime('%H:%M') for ms in (open_ms[0], open_ms[-1])]
         time_axis += time_points[0] + " " * (len(candles) - len(time_points[0]) - len(time_points[1])) + time_points[1]
         chart_text.append(time_axis)
         
+        self._render_cache_key = render_key
+        self._rendered = chart_text
         return chart_text
         
     def toggle(self):
         """Toggle the visibility of the chart."""
-        self.visible = not self.visible 
\ No newline at end of file
+        self.visible = not self.visible
+        if self.visible:
+            self.refresh() # Draw data that arrived while hidden 
\ No newline at end of file
@@ -0,0 +1,85 @@
+from textual.message import Message
+from textual.widgets import Static
+
+class NotificationMessage(Message):
+    """Message to display a notification in the UI."""
+    def __init__(self, message, level="info"):
+        """
+        Initialize notification message.
+        
+        Args:
+            message: The notification text
+            level: Severity level ("info", "warning", "error", "success")
+        """
+        super().__init__()
+        self.message = message
+        self.level = level
+
+class NotificationWidget(Static):
+    """Widget for displaying notifications and alerts."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.auto_hide = True
+        self.auto_hide_time = 5  # Default time in seconds
+        self.notification_queue = []
+        self.current_timer = None
+        self.current_priority = 0  # 0=info, 1=success, 2=warning, 3=error
+        
+    def show_notification(self, message, level="info"):
+        """
+        Display a notification with the specified level.
+        
+        Args:
+            message: The notification text
+            level: Severity level ("info", "warning", "error", "success")
+        """
+        # Map levels to styles and priorities
+        style_map = {
+            "info": ("bold blue", 0),
+            "success": ("bold green", 1),
+            "warning": ("bold yellow", 2),
+            "error": ("bold red on white", 3),
+        }
+        
+        style, priority = style_map.get(level, ("bold blue", 0))
+        
+        # If a higher priority notification is showing, queue this one
+        if self.visible and priority <= self.current_priority:
+            self.notification_queue.append({
+                "message": message,
+                "level": level,
+                "priority": priority
+            })
+            return
+            
+        # If we're replacing a current notification, check if a timer exists
+        # but don't explicitly cancel it to avoid the AttributeError
+        if self.current_timer:
+            # self.cancel_timer(self.current_timer) # Removed problematic line causing AttributeError
+            self.current_timer = None # Still clear the handle reference so we don't try to cancel it later
+        
+        # Update with the new notification
+        self.update(f"[{style}]{message}[/]")
+        self.current_priority = priority
+        
+        # Make widget visible
+        self.visible = True
+        
+        # Auto-hide after a delay
+        if self.auto_hide:
+            self.current_timer = self.set_timer(self.auto_hide_time, self.clear_notification)
+    
+    def clear_notification(self):
+        """Clear the current notification."""
+        self.current_timer = None
+        self.visible = False
+        self.update("")
+        self.current_priority = 0
+        
+        # If there are queued notifications, show the next one
+        if self.notification_queue:
+            # Sort by priority (highest first)
+            self.notification_queue.sort(key=lambda x: x["priority"], reverse=True)
+            next_notification = self.notification_queue.pop(0)
+            self.show_notification(next_notification["message"], next_notification["level"])
@@ -5,8 +5,13 @@ from textual.widgets import DataTable
 from textual.containers import Container
 from textual.widget import Widget
 from textual.reactive import reactive
+from rich.style import Style
 from rich.text import Text
 
+# PnL cell styles, parsed once instead of per row
+_PROFIT_STYLE = Style(color="green")
+_LOSS_STYLE = Style(color="red")
+
 
 class PositionHistoryWidget(Container):
     """Widget to display position history."""
@@ -48,6 +53,8 @@ class PositionHistoryWidget(Container):
     def __init__(self, name: str = None):
         super().__init__(name=name)
         self.history_table = DataTable(id="position-history-table", zebra_stripes=True)
+        # Latest history received while hidden, applied when the widget is next shown
+        self._pending_history = None
         
     def compose(self):
         """Compose the widget."""
@@ -69,29 +76,39 @@ class PositionHistoryWidget(Container):
         self.visible = False
         
     def update_history(self, positions):
-        """Update the position history with new data."""
+        """Update the position history with new data; while hidden, only keep the latest."""
+        if not self.visible:
+            self._pending_history = positions
+            return
+        self._pending_history = None
         self.history_table.clear(columns=False)
         
+        # Build every row first and add them in one call: a single table update instead of one per row
+        rows = []
         for position in positions:
+            get = position.get
             # Format PnL with color
-            pnl = position.get('pnl', 0)
-            pnl_text = Text(f"{pnl:.2f}%", style="green" if pnl >= 0 else "red")
+            pnl = get('pnl', 0)
+            pnl_text = Text(f"{pnl:.2f}%", style=_PROFIT_STYLE if pnl >= 0 else _LOSS_STYLE)
             
-            # Add row with all position data
-            self.history_table.add_row(
-                position.get('timestamp', 'N/A'),
-                position.get('symbol', 'N/A'),
-                position.get('side', 'N/A'),
-                f"{position.get('size', 0)}",
-                f"{position.get('entry_price', 0):.4f}",
-                f"{position.get('exit_price', 0):.4f}",
+            # Row with all position data
+            rows.append((
+                get('timestamp', 'N/A'),
+                get('symbol', 'N/A'),
+                get('side', 'N/A'),
+                f"{get('size', 0)}",
+                f"{get('entry_price', 0):.4f}",
+                f"{get('exit_price', 0):.4f}",
                 pnl_text,
-                position.get('duration', 'N/A')
-            )
+                get('duration', 'N/A')
+            ))
+        self.history_table.add_rows(rows)
     
     def toggle(self):
         """Toggle the visibility of the widget."""
         self.visible = not self.visible
+        if self.visible and self._pending_history is not None:
+            self.update_history(self._pending_history)
         
 
 from textual.widgets import Static 
\ No newline at end of file
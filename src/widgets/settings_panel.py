@@ -8,12 +8,11 @@ from textual.message import Message
 import src.config as config
 
 
-class SettingChangedMessage(Message):
-    """Message emitted when a setting is changed."""
-    def __init__(self, setting_name, new_value):
+class SettingsChangedMessage(Message):
+    """Message emitted once per save with every setting that changed, as {name: new value}."""
+    def __init__(self, settings):
         super().__init__()
-        self.setting_name = setting_name
-        self.new_value = new_value
+        self.settings = settings
 
 
 class SettingsPanelWidget(Container):
@@ -90,7 +89,8 @@ class SettingsPanelWidget(Container):
     
     def __init__(self, name: str = None):
         super().__init__(name=name)
-        self.settings = {}
+        self.settings = {} # Values as of the last save (or mount), to diff the next save against
+        self._inputs = {} # Filled in on_mount
         
     def compose(self):
         """Compose the widget."""
@@ -180,6 +180,20 @@ class SettingsPanelWidget(Container):
     
     def on_mount(self):
         """Setup widget when mounted."""
+        # Look every input up once: setting name -> (widget, conversion applied to its value)
+        self._inputs = {
+            "DEFAULT_SYMBOL": (self.query_one("#default-symbol", Input), None),
+            "DEFAULT_TIMEFRAME": (self.query_one("#default-timeframe", Select), None),
+            "DEFAULT_LEVERAGE": (self.query_one("#default-leverage", Input), float),
+            "TRADE_AMOUNT_BASE": (self.query_one("#trade-amount", Input), float),
+            "STOP_LOSS_PERCENT": (self.query_one("#stop-loss", Input), float),
+            "TAKE_PROFIT_PERCENT": (self.query_one("#take-profit", Input), float),
+            "ENABLE_TEST_MODE": (self.query_one("#test-mode", Switch), None),
+            "DATA_FETCH_INTERVAL_SECONDS": (self.query_one("#data-fetch-interval", Input), float),
+            "PREDICTION_INTERVAL_SECONDS": (self.query_one("#prediction-interval", Input), float),
+            "THEME": (self.query_one("#theme-select", Select), None), # No need to translate, use the value directly
+        }
+        self.settings = self._read_settings()
         # Hide initially
         self.visible = False
         
@@ -190,28 +204,21 @@ class SettingsPanelWidget(Container):
         elif event.button.id == "cancel-button":
             self.toggle()
     
-    def save_settings(self):
-        """Save the current settings and emit change messages."""
-        # Collect all setting values
-        theme_value = self.query_one("#theme-select", Select).value
-        # No need to translate, use the value directly
-            
-        settings = {
-            "DEFAULT_SYMBOL": self.query_one("#default-symbol", Input).value,
-            "DEFAULT_TIMEFRAME": self.query_one("#default-timeframe", Select).value,
-            "DEFAULT_LEVERAGE": float(self.query_one("#default-leverage", Input).value),
-            "TRADE_AMOUNT_BASE": float(self.query_one("#trade-amount", Input).value),
-            "STOP_LOSS_PERCENT": float(self.query_one("#stop-loss", Input).value),
-            "TAKE_PROFIT_PERCENT": float(self.query_one("#take-profit", Input).value),
-            "ENABLE_TEST_MODE": self.query_one("#test-mode", Switch).value,
-            "DATA_FETCH_INTERVAL_SECONDS": float(self.query_one("#data-fetch-interval", Input).value),
-            "PREDICTION_INTERVAL_SECONDS": float(self.query_one("#prediction-interval", Input).value),
-            "THEME": theme_value,
+    def _read_settings(self):
+        """Collect the current value of every setting from the inputs."""
+        return {
+            name: widget.value if convert is None else convert(widget.value)
+            for name, (widget, convert) in self._inputs.items()
         }
+    
+    def save_settings(self):
+        """Save the current settings and emit one message with those that changed."""
+        settings = self._read_settings()
+        changed = {name: value for name, value in settings.items() if self.settings.get(name) != value}
+        self.settings = settings
         
-        # Emit a message for each changed setting
-        for setting_name, new_value in settings.items():
-            self.post_message(SettingChangedMessage(setting_name, new_value))
+        if changed:
+            self.post_message(SettingsChangedMessage(changed))
         
         # Hide the panel
         self.toggle()
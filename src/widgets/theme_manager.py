@@ -3,6 +3,7 @@ Theme Manager for the Trading Bot.
 """
 from textual.app import App
 from textual.message import Message
+from textual.theme import Theme
 import src.config as config
 
 
@@ -75,31 +76,50 @@ class ThemeManager:
         },
     }
     
+    # Themes meant for a light terminal background
+    LIGHT_THEMES = frozenset({"light"})
+    
+    # Theme used until another is set, and the fallback when one cannot be applied
+    DEFAULT_THEME = "default_val"
+    
     def __init__(self, app: App):
         self.app = app
-        self.current_theme = "default_val"
+        self.current_theme = self.DEFAULT_THEME
+        self._theme_names = tuple(self.THEMES)
+        self._theme_idx = self._theme_names.index(self.current_theme)
+        # Build and register every theme once, so switching is a single assignment
+        for theme_name, colors in self.THEMES.items():
+            app.register_theme(self._build_theme(theme_name, colors))
+        
+    @classmethod
+    def _build_theme(cls, theme_name: str, colors: dict) -> Theme:
+        """Turn one of THEMES into a Textual Theme ("text" is its foreground color)."""
+        colors = dict(colors)
+        foreground = colors.pop("text")
+        return Theme(name=theme_name, foreground=foreground, dark=theme_name not in cls.LIGHT_THEMES, **colors)
         
-    def set_theme(self, theme_name: str):
-        """Set the application theme."""
+    def set_theme(self, theme_name: str, notify: bool = True):
+        """
+        Set the application theme; the only place current_theme and the cycle position change.
+        Pass notify=False to skip the ThemeChangedMessage (e.g. for the theme applied at startup).
+        """
         if theme_name not in self.THEMES:
             raise ValueError(f"Unknown theme: {theme_name}")
         
         self.current_theme = theme_name
-        theme = self.THEMES[theme_name]
+        self._theme_idx = self._theme_names.index(theme_name)
         
-        # Apply theme colors to the app
-        for color_name, color_value in theme.items():
-            self.app.theme_colors[color_name] = color_value
+        # Apply the pre-registered theme: one stylesheet refresh for all its colors
+        self.app.theme = theme_name
         
         # Notify the app about theme change
-        self.app.post_message(ThemeChangedMessage(theme_name))
+        if notify:
+            self.app.post_message(ThemeChangedMessage(theme_name))
         
     def cycle_theme(self):
         """Cycle to the next available theme."""
-        theme_names = list(self.THEMES.keys())
-        current_idx = theme_names.index(self.current_theme)
-        next_idx = (current_idx + 1) % len(theme_names)
-        self.set_theme(theme_names[next_idx])
+        next_idx = (self._theme_idx + 1) % len(self._theme_names)
+        self.set_theme(self._theme_names[next_idx])
         
     def get_theme_names(self):
         """Get list of available theme names."""
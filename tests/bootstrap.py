@@ -0,0 +1,24 @@
+"""
+Environment setup shared by both test entry points: pytest (via conftest.py) and
+tests/run_tests.py (plain unittest).
+
+Puts the repository root and src/ on sys.path, so tests can import `src.*` and `tests.*`
+and the app modules' own top-level imports (`import config`) resolve. Placeholder API
+keys are set before any test imports src.config, so no run warns about a missing .env
+file; real keys already in the environment are left alone.
+"""
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def bootstrap() -> None:
+    """Prepare sys.path and the environment for importing the app modules; safe to call twice."""
+    for path in (str(ROOT_DIR / "src"), str(ROOT_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    os.environ.setdefault("MEXC_API_KEY", "mock_api_key")
+    os.environ.setdefault("MEXC_SECRET_KEY", "mock_secret_key")
@@ -0,0 +1,9 @@
+"""
+pytest configuration shared by every test module.
+
+Runs the shared test bootstrap (see tests/bootstrap.py) once per session, before any test
+module is imported, so no test module adjusts sys.path or the environment itself.
+"""
+from tests.bootstrap import bootstrap
+
+bootstrap()
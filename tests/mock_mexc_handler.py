@@ -3,6 +3,8 @@ from typing import Optional, Dict, List, Any
 from decimal import Decimal
 import time
 
+import numpy as np
+
 class MockMEXCHandler:
     """Mock MEXCHandler for testing purposes."""
     
@@ -28,6 +30,7 @@ class MockMEXCHandler:
         }
         self.current_price = 0.5456  # Default mock price
         self.balance = {'USDT': 1000.0}
+        self._ohlcv_cache = {}  # (limit, current_price) -> candle rows, built on first request
         logging.info("Mock MEXC Handler initialized")
     
     def get_market(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -43,21 +46,29 @@ class MockMEXCHandler:
         return True
     
     def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', limit: int = 100) -> Optional[List[List[float]]]:
-        """Return mock OHLCV data."""
+        """Return mock OHLCV data; candles are generated once per (limit, current price) and reused."""
+        key = (limit, self.current_price)
+        rows = self._ohlcv_cache.get(key)
+        if rows is None:
+            rows = self._ohlcv_cache[key] = self._generate_ohlcv(limit)
+        return [list(row) for row in rows]  # Fresh rows, so callers that modify candles leave the cache intact
+    
+    def _generate_ohlcv(self, limit: int) -> List[List[float]]:
+        """Generate `limit` one-minute candles ending now around the current price."""
         # Generate mock OHLCV data
         current_ts = int(time.time() * 1000)  # Current timestamp in ms
         interval_ms = 60000  # 1 minute in ms
         
-        mock_data = []
-        for i in range(limit):
-            # [timestamp, open, high, low, close, volume]
-            ts = current_ts - ((limit - i - 1) * interval_ms)
-            price = self.current_price + (i % 5 - 2) * 0.01  # Create some small variations
-            high = price + 0.005
-            low = price - 0.005
-            mock_data.append([ts, price, high, low, price, 1000.0 + i])
+        # Build each column with NumPy; timestamps stay ints
+        i = np.arange(limit)
+        ts = (current_ts - (limit - i - 1) * interval_ms).tolist()
+        price = self.current_price + (i % 5 - 2) * 0.01  # Create some small variations
+        high = price + 0.005
+        low = price - 0.005
+        close = price.tolist()
         
-        return mock_data
+        # [timestamp, open, high, low, close, volume]
+        return [list(row) for row in zip(ts, close, high.tolist(), low.tolist(), close, (1000.0 + i).tolist())]
     
     def get_current_price(self, symbol: str) -> Optional[float]:
         """Return mock current price."""
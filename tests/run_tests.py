@@ -7,35 +7,21 @@ This script runs all the tests in the tests directory.
 import unittest
 import sys
 import os
-import importlib
 
 def run_tests():
     """
     Discover and run all tests in the tests directory.
     """
-    # Add parent directory to path to import modules
-    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    sys.path.append(parent_dir)
+    # Add parent directory to path to import modules, then the same path and environment
+    # setup that conftest.py gives pytest runs
+    tests_dir = os.path.dirname(os.path.abspath(__file__))
+    parent_dir = os.path.dirname(tests_dir)
+    sys.path.insert(0, parent_dir)
+    from tests.bootstrap import bootstrap
+    bootstrap()
     
-    # Get list of test modules
-    test_files = [f[:-3] for f in os.listdir('.') if f.startswith('test_') and f.endswith('.py')]
-    
-    # Create a test suite
-    test_suite = unittest.TestSuite()
-    
-    # Add all tests to the suite
-    for test_file in test_files:
-        try:
-            # Import the test module
-            module = importlib.import_module(test_file)
-            
-            # Add all test cases from the module
-            for name in dir(module):
-                obj = getattr(module, name)
-                if isinstance(obj, type) and issubclass(obj, unittest.TestCase) and obj != unittest.TestCase:
-                    test_suite.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(obj))
-        except Exception as e:
-            print(f"Error importing {test_file}: {e}")
+    # Collect every test_*.py module in this directory, wherever the script is run from
+    test_suite = unittest.TestLoader().discover(tests_dir, pattern='test_*.py', top_level_dir=parent_dir)
     
     # Run the tests
     runner = unittest.TextTestRunner(verbosity=2)
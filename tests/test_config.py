@@ -1,11 +1,6 @@
 import unittest
-import sys
-import os
 from unittest.mock import patch
-import importlib
 
-# Add parent directory to path to import our modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import src.config as config
 
 class TestConfig(unittest.TestCase):
@@ -24,32 +19,30 @@ class TestConfig(unittest.TestCase):
         self.assertIsNotNone(config.PREDICTION_INTERVAL_SECONDS)
         self.assertIsNotNone(config.STATS_UPDATE_INTERVAL_SECONDS)
     
-    @patch.dict(os.environ, {
-        'MEXC_API_KEY': 'test_api_key',
-        'MEXC_SECRET_KEY': 'test_secret_key'
-    }, clear=True)
+    def test_config_from_env(self):
+        """Test if API keys are read from an environment mapping."""
+        cfg = config.Config.from_env({'MEXC_API_KEY': 'test_api_key', 'MEXC_SECRET_KEY': 'test_secret_key'})
+
+        self.assertEqual(cfg.MEXC_API_KEY, 'test_api_key')
+        self.assertEqual(cfg.MEXC_SECRET_KEY, 'test_secret_key')
+
+    def test_config_from_env_missing(self):
+        """Test if missing environment variables leave the API keys unset."""
+        cfg = config.Config.from_env({})
+
+        self.assertIsNone(cfg.MEXC_API_KEY)
+        self.assertIsNone(cfg.MEXC_SECRET_KEY)
+
+    @patch.object(config, 'MEXC_API_KEY', None)  # Restored afterwards, so later tests see the real keys
+    @patch.object(config, 'MEXC_SECRET_KEY', None)
     def test_load_env_variables_success(self):
-        """Test if API keys are loaded correctly from environment variables."""
-        # Force reload the config module to pick up the patched environment variables
-        importlib.reload(config)
-        
-        # Reset config values that might have been set by previous tests
-        if hasattr(config, 'load_env_variables'):
-            # If there's a dedicated function for loading environment variables, call it
-            config.load_env_variables()
-        
-        # Check that API keys are set correctly from the environment
+        """Test if API keys are loaded into the config module."""
+        keys = config.load_env_variables({'MEXC_API_KEY': 'test_api_key', 'MEXC_SECRET_KEY': 'test_secret_key'})
+
+        # Check that API keys are returned and set correctly from the environment
+        self.assertEqual(keys, ('test_api_key', 'test_secret_key'))
         self.assertEqual(config.MEXC_API_KEY, 'test_api_key')
         self.assertEqual(config.MEXC_SECRET_KEY, 'test_secret_key')
-    
-    @patch.dict(os.environ, {}, clear=True)  # Clear all environment variables for this test
-    @patch('src.config.MEXC_API_KEY', None)  # Directly patch the config values
-    @patch('src.config.MEXC_SECRET_KEY', None)
-    def test_load_env_variables_missing(self):
-        """Test if config handles missing environment variables."""
-        # With the patched values, the config should have None for API keys
-        self.assertIsNone(config.MEXC_API_KEY)
-        self.assertIsNone(config.MEXC_SECRET_KEY)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
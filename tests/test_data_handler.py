@@ -1,25 +1,38 @@
 import unittest
-import sys
-import os
 import pandas as pd
 from decimal import Decimal
 from unittest.mock import patch
 
-# Add parent directory to path to import our modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.data_handler import DataHandler
 from tests.mock_mexc_handler import MockMEXCHandler
 
+# Tolerance for prices derived from the mock's OHLCV candles
+PRICE_TOL = Decimal('0.05')
+
+# Empty OHLCV frame; DataHandler only reads it, so one instance serves every test
+_EMPTY_OHLCV = pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+
+# Raised by the patched exchange call; side_effect re-raises this one instance on every call
+_TEST_ERR = RuntimeError("Test error")
+
 class TestDataHandler(unittest.TestCase):
     """Tests for the DataHandler class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the mock exchange once; tests that change its behavior patch it for their own duration."""
+        cls.mock_mexc = MockMEXCHandler()
+    
     def setUp(self):
         """Set up test environment before each test."""
-        self.mock_mexc = MockMEXCHandler()
         self.symbol = "XRP/USDT:USDT"
         self.timeframe = "1m"
         self.data_handler = DataHandler(self.mock_mexc, self.symbol, self.timeframe)
     
+    def assert_decimal_close(self, actual, expected):
+        """Assert that Decimal `actual` is within PRICE_TOL of `expected`, compared as Decimals."""
+        self.assertLessEqual(abs(actual - Decimal(str(expected))), PRICE_TOL)
+    
     def test_initialization(self):
         """Test proper initialization of DataHandler."""
         self.assertEqual(self.data_handler.symbol, self.symbol)
@@ -34,8 +47,8 @@ class TestDataHandler(unittest.TestCase):
         self.assertIsInstance(ohlcv_df, pd.DataFrame)
         
         # Test that the DataFrame has the expected columns
-        expected_columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
-        self.assertListEqual(list(ohlcv_df.columns), expected_columns)
+        expected_columns = pd.Index(['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        pd.testing.assert_index_equal(ohlcv_df.columns, expected_columns)
         
         # Test that the DataFrame has the expected number of rows
         self.assertEqual(len(ohlcv_df), 50)
@@ -52,47 +65,30 @@ class TestDataHandler(unittest.TestCase):
         self.assertIsInstance(current_price, Decimal)
         
         # Check that it's approximately the same as the mock price
-        # Converting to float for approximate comparison
-        self.assertAlmostEqual(float(current_price), self.mock_mexc.current_price, delta=0.05)
-    
-    def test_get_current_price_from_ticker(self):
-        """Test getting current price directly from ticker when no OHLCV data is provided."""
-        current_price = self.data_handler.get_current_price()
-        
-        # Test that the result is a Decimal
-        self.assertIsInstance(current_price, Decimal)
-        
-        # Check that it's the same as the mock price
-        self.assertEqual(float(current_price), self.mock_mexc.current_price)
-    
-    def test_get_current_price_with_none_ohlcv(self):
-        """Test getting current price when None is passed for OHLCV."""
-        current_price = self.data_handler.get_current_price(None)
-        
-        # Test that it falls back to ticker price
-        self.assertIsInstance(current_price, Decimal)
-        self.assertEqual(float(current_price), self.mock_mexc.current_price)
+        self.assert_decimal_close(current_price, self.mock_mexc.current_price)
     
-    def test_get_current_price_with_empty_ohlcv(self):
-        """Test getting current price when empty DataFrame is passed for OHLCV."""
-        empty_df = pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        current_price = self.data_handler.get_current_price(empty_df)
-        
-        # Test that it falls back to ticker price
-        self.assertIsInstance(current_price, Decimal)
-        self.assertEqual(float(current_price), self.mock_mexc.current_price)
+    def test_get_current_price_falls_back_to_ticker(self):
+        """Test getting current price from the ticker when no usable OHLCV data is provided."""
+        # No argument, None and an empty DataFrame all fall back to the ticker price
+        for label, args in (("no ohlcv", ()), ("None", (None,)), ("empty", (_EMPTY_OHLCV,))):
+            with self.subTest(ohlcv=label):
+                current_price = self.data_handler.get_current_price(*args)
+                
+                # Test that the result is a Decimal equal to the mock price
+                self.assertIsInstance(current_price, Decimal)
+                self.assertEqual(float(current_price), self.mock_mexc.current_price)
 
     @patch('src.data_handler.logging')
     def test_fetch_ohlcv_error_handling(self, mock_logging):
         """Test error handling in fetch_ohlcv method."""
-        # Make mexc_handler.fetch_ohlcv throw an exception
-        self.mock_mexc.fetch_ohlcv = lambda *args, **kwargs: exec('raise Exception("Test error")')
-        
-        # Call fetch_ohlcv, which should catch the exception
-        result = self.data_handler.fetch_ohlcv()
+        # Make mexc_handler.fetch_ohlcv throw an exception; the patch is undone when the block exits
+        with patch.object(self.mock_mexc, 'fetch_ohlcv', side_effect=_TEST_ERR) as mock_fetch:
+            # Call fetch_ohlcv, which should catch the exception
+            result = self.data_handler.fetch_ohlcv()
         
-        # Check that None is returned on error
+        # Check that None is returned on error, without retrying
         self.assertIsNone(result)
+        mock_fetch.assert_called_once_with(self.symbol, self.timeframe, limit=100)
         
         # Verify that the error was logged
         mock_logging.error.assert_called()
@@ -1,15 +1,6 @@
 import unittest
 from decimal import Decimal, ROUND_DOWN, ROUND_UP
-import os
-from unittest.mock import patch
-
-# We need config values for the calculations
-# Mock environment variables to allow config import without errors
-with patch.dict(os.environ, {'MEXC_API_KEY': 'mock_api_key', 'MEXC_SECRET_KEY': 'mock_secret'}):
-    import config
-    # Set specific config values relevant to calculations for testing
-    config.STOP_LOSS_PERCENT = 5.0 # 5%
-    config.TAKE_PROFIT_PERCENT = 10.0 # 10%
+import functools
 
 # Note: In a larger project, you might refactor the SL/TP calculation 
 # into a separate utility function in main.py or another module 
@@ -17,6 +8,17 @@ with patch.dict(os.environ, {'MEXC_API_KEY': 'mock_api_key', 'MEXC_SECRET_KEY':
 # Here, we simulate the inputs and replicate the calculation logic 
 # from the execute_trade function for testing.
 
+_ONE = Decimal('1')
+
+
+@functools.lru_cache(maxsize=32)
+def _factors(sl_pct_config: float, tp_pct_config: float, price_precision: int) -> tuple:
+    """(1 - sl, 1 + sl, 1 - tp, 1 + tp, quantum) as Decimals for config percentages (5.0 = 5%) and a precision."""
+    sl_pct = Decimal(str(sl_pct_config)) / Decimal('100')
+    tp_pct = Decimal(str(tp_pct_config)) / Decimal('100')
+    return (_ONE - sl_pct, _ONE + sl_pct, _ONE - tp_pct, _ONE + tp_pct, _ONE.scaleb(-price_precision))
+
+
 def calculate_sl_tp_for_test(current_price_dec: Decimal, 
                               side: str, 
                               sl_pct_config: float, 
@@ -25,92 +27,41 @@ def calculate_sl_tp_for_test(current_price_dec: Decimal,
     """Replicates the SL/TP calculation logic from main.execute_trade for testing."""
     sl_price = None
     tp_price = None
-    sl_pct = Decimal(str(sl_pct_config)) / Decimal('100')
-    tp_pct = Decimal(str(tp_pct_config)) / Decimal('100')
-    price_decimal_places = Decimal('1e-' + str(price_precision))
+    sl_down, sl_up, tp_down, tp_up, price_decimal_places = _factors(sl_pct_config, tp_pct_config, price_precision)
 
     if side == 'buy':
-        if sl_pct > 0:
-            sl_price = current_price_dec * (Decimal('1') - sl_pct)
-            sl_price = sl_price.quantize(price_decimal_places, rounding=ROUND_DOWN)
-        if tp_pct > 0:
-            tp_price = current_price_dec * (Decimal('1') + tp_pct)
-            tp_price = tp_price.quantize(price_decimal_places, rounding=ROUND_UP)
+        if sl_pct_config > 0:
+            sl_price = (current_price_dec * sl_down).quantize(price_decimal_places, rounding=ROUND_DOWN)
+        if tp_pct_config > 0:
+            tp_price = (current_price_dec * tp_up).quantize(price_decimal_places, rounding=ROUND_UP)
     elif side == 'sell':
-        if sl_pct > 0:
-            sl_price = current_price_dec * (Decimal('1') + sl_pct)
-            sl_price = sl_price.quantize(price_decimal_places, rounding=ROUND_UP)
-        if tp_pct > 0:
-            tp_price = current_price_dec * (Decimal('1') - tp_pct)
-            tp_price = tp_price.quantize(price_decimal_places, rounding=ROUND_DOWN)
+        if sl_pct_config > 0:
+            sl_price = (current_price_dec * sl_up).quantize(price_decimal_places, rounding=ROUND_UP)
+        if tp_pct_config > 0:
+            tp_price = (current_price_dec * tp_down).quantize(price_decimal_places, rounding=ROUND_DOWN)
             
     return sl_price, tp_price
 
 class TestMainCalculations(unittest.TestCase):
 
-    def test_sl_tp_calculation_buy(self):
-        """Test SL/TP calculation for a BUY order."""
-        current_price = Decimal('100.0000')
-        price_precision = 2 # e.g., 2 decimal places like 100.00
-        sl_pct = 5.0
-        tp_pct = 10.0
-        
-        expected_sl = Decimal('100.0000') * (Decimal('1') - Decimal('0.05')) # 95.0000
-        expected_sl = expected_sl.quantize(Decimal('0.01'), rounding=ROUND_DOWN) # 95.00
-        
-        expected_tp = Decimal('100.0000') * (Decimal('1') + Decimal('0.10')) # 110.0000
-        expected_tp = expected_tp.quantize(Decimal('0.01'), rounding=ROUND_UP) # 110.00
-        
-        sl_price, tp_price = calculate_sl_tp_for_test(current_price, 'buy', sl_pct, tp_pct, price_precision)
-        
-        self.assertEqual(sl_price, expected_sl)
-        self.assertEqual(tp_price, expected_tp)
-
-    def test_sl_tp_calculation_sell(self):
-        """Test SL/TP calculation for a SELL order."""
-        current_price = Decimal('0.5000') # Example like XRP
-        price_precision = 4 # e.g., 4 decimal places like 0.5000
-        sl_pct = 5.0
-        tp_pct = 10.0
-        
-        expected_sl = Decimal('0.5000') * (Decimal('1') + Decimal('0.05')) # 0.5250
-        expected_sl = expected_sl.quantize(Decimal('0.0001'), rounding=ROUND_UP) # 0.5250
-        
-        expected_tp = Decimal('0.5000') * (Decimal('1') - Decimal('0.10')) # 0.4500
-        expected_tp = expected_tp.quantize(Decimal('0.0001'), rounding=ROUND_DOWN) # 0.4500
-        
-        sl_price, tp_price = calculate_sl_tp_for_test(current_price, 'sell', sl_pct, tp_pct, price_precision)
-        
-        self.assertEqual(sl_price, expected_sl)
-        self.assertEqual(tp_price, expected_tp)
-
-    def test_sl_tp_calculation_zero_percent(self):
-        """Test calculation when SL or TP percentage is zero."""
-        current_price = Decimal('2000.00')
-        price_precision = 2
-        sl_pct_zero = 0.0
-        tp_pct_zero = 0.0
-        sl_pct_non_zero = 2.0
-        tp_pct_non_zero = 3.0
-
-        # Test zero SL, non-zero TP (buy)
-        sl_price, tp_price = calculate_sl_tp_for_test(current_price, 'buy', sl_pct_zero, tp_pct_non_zero, price_precision)
-        self.assertIsNone(sl_price)
-        self.assertIsNotNone(tp_price)
-        expected_tp = (current_price * (Decimal('1') + Decimal('0.03'))).quantize(Decimal('0.01'), rounding=ROUND_UP) # 2060.00
-        self.assertEqual(tp_price, expected_tp)
-        
-        # Test non-zero SL, zero TP (sell)
-        sl_price, tp_price = calculate_sl_tp_for_test(current_price, 'sell', sl_pct_non_zero, tp_pct_zero, price_precision)
-        self.assertIsNotNone(sl_price)
-        self.assertIsNone(tp_price)
-        expected_sl = (current_price * (Decimal('1') + Decimal('0.02'))).quantize(Decimal('0.01'), rounding=ROUND_UP) # 2040.00
-        self.assertEqual(sl_price, expected_sl)
+    # (price, side, sl_pct, tp_pct, price_precision, expected_sl, expected_tp); the expected
+    # prices are worked out by hand, and a zero percentage means no order for that level
+    CASES = (
+        (Decimal('100.0000'), 'buy', 5.0, 10.0, 2, Decimal('95.00'), Decimal('110.00')),     # 100 * 0.95 down, 100 * 1.10 up
+        (Decimal('0.5000'), 'sell', 5.0, 10.0, 4, Decimal('0.5250'), Decimal('0.4500')),     # Example like XRP: 0.5 * 1.05 up, 0.5 * 0.90 down
+        (Decimal('2000.00'), 'buy', 0.0, 3.0, 2, None, Decimal('2060.00')),                  # Zero SL: 2000 * 1.03 up
+        (Decimal('2000.00'), 'sell', 2.0, 0.0, 2, Decimal('2040.00'), None),                 # Zero TP: 2000 * 1.02 up
+        (Decimal('2000.00'), 'buy', 0.0, 0.0, 2, None, None),                                # Both zero
+    )
 
-        # Test both zero
-        sl_price, tp_price = calculate_sl_tp_for_test(current_price, 'buy', sl_pct_zero, tp_pct_zero, price_precision)
-        self.assertIsNone(sl_price)
-        self.assertIsNone(tp_price)
+    def test_sl_tp_calculation(self):
+        """Test SL/TP calculation for buy and sell orders, including zero percentages."""
+        for price, side, sl_pct, tp_pct, price_precision, expected_sl, expected_tp in self.CASES:
+            with self.subTest(price=price, side=side, sl_pct=sl_pct, tp_pct=tp_pct):
+                sl_price, tp_price = calculate_sl_tp_for_test(price, side, sl_pct, tp_pct, price_precision)
+                
+                self.assertEqual(sl_price, expected_sl)
+                self.assertEqual(tp_price, expected_tp)
 
     # Add tests for edge cases like very small prices or different precisions if needed
 
@@ -1,12 +1,33 @@
 import unittest
-import sys
-import os
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, call
 from decimal import Decimal
 
-# Add parent directory to path to import our modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.main import Metrics, UpdateMetricsMessage
+from src.metrics import Metrics, UpdateMetricsMessage, format_metrics_rows
+
+# add_row calls expected for the sample metrics built in setUp: prices with 4 decimal
+# places, RSI with 2, PnL with 2 and a % sign
+EXPECTED_ROWS = [
+    call("Symbol", "XRP/USDT:USDT"),
+    call("Timestamp", "Timestamp"),
+    call("Current Price", "0.5456"),
+    call("RSI", "55.50"),
+    call("Prediction", "LONG"),
+    call("Position Size", "100"),
+    call("Entry Price", "0.5200"),
+    call("PnL (%)", "4.92%"),
+]
+
+# add_row calls expected for a fresh Metrics()
+EXPECTED_EMPTY_ROWS = [
+    call("Symbol", "XRP/USDT:USDT"),
+    call("Timestamp", "Timestamp"),
+    call("Current Price", "N/A"),
+    call("RSI", "N/A"),
+    call("Prediction", "N/A"),
+    call("Position Size", "N/A"),
+    call("Entry Price", "N/A"),
+    call("PnL (%)", "N/A"),
+]
 
 # We'll avoid importing the real TradingBotApp and instead create a simplified mock
 class MockTradingBotApp:
@@ -60,6 +81,11 @@ class MockTradingBotApp:
 class TestMetricsDisplay(unittest.TestCase):
     """Tests for the metrics display in the TUI."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the mock app once; setUp resets what the tests change."""
+        cls.app = MockTradingBotApp()
+    
     def setUp(self):
         """Set up test environment before each test."""
         # Create a sample metrics object
@@ -72,8 +98,10 @@ class TestMetricsDisplay(unittest.TestCase):
         self.metrics.entry_price = Decimal("0.5200")
         self.metrics.pnl_percent = 4.92
         
-        # Create a clean app for each test
-        self.app = MockTradingBotApp()
+        # Give each test a clean app: no metrics and no recorded calls
+        self.app.current_metrics = None
+        self.app.metrics_table.reset_mock()
+        self.app.watch_current_metrics.reset_mock()
     
     def test_metrics_initialization(self):
         """Test that metrics are properly initialized."""
@@ -99,6 +127,17 @@ class TestMetricsDisplay(unittest.TestCase):
         
         # The watch_current_metrics method should be called
         self.app.watch_current_metrics.assert_called_once()
+
+    def test_update_metrics_message_precomputes_rows(self):
+        """Test that the message carries rows formatted at construction time."""
+        message = UpdateMetricsMessage(self.metrics)
+        
+        self.assertEqual(message.rows, format_metrics_rows(self.metrics))
+        labels = [label for label, _, _ in message.rows]
+        self.assertEqual(labels, ["Symbol", "Timestamp", "Current Price", "RSI", "Prediction",
+                                  "Position Size", "Entry Price", "PnL (%)"])
+        self.assertEqual(str(message.rows[3][1]), "55.50")
+        self.assertEqual(str(message.rows[7][1]), "4.92%")
     
     def test_metrics_table_formatting(self):
         """Test that metrics are properly formatted in the table."""
@@ -108,29 +147,8 @@ class TestMetricsDisplay(unittest.TestCase):
         # Call the update_metrics_table method 
         self.app.update_metrics_table()
         
-        # Check the metric values and formatting
-        calls = self.app.metrics_table.add_row.call_args_list
-        
-        # Symbol
-        self.assertEqual(calls[0][0][1], "XRP/USDT:USDT")
-        
-        # Current Price with 4 decimal places
-        self.assertEqual(calls[2][0][1], "0.5456")
-        
-        # RSI with 2 decimal places
-        self.assertEqual(calls[3][0][1], "55.50")
-        
-        # Prediction
-        self.assertEqual(calls[4][0][1], "LONG")
-        
-        # Position Size
-        self.assertEqual(calls[5][0][1], "100")
-        
-        # Entry Price with 4 decimal places
-        self.assertEqual(calls[6][0][1], "0.5200")
-        
-        # PnL with 2 decimal places and % sign
-        self.assertEqual(calls[7][0][1], "4.92%")
+        # Check the metric values and formatting, row by row
+        self.app.metrics_table.add_row.assert_has_calls(EXPECTED_ROWS)
     
     def test_none_metrics_display(self):
         """Test that None values are displayed as 'N/A'."""
@@ -141,19 +159,8 @@ class TestMetricsDisplay(unittest.TestCase):
         # Call the update method directly
         self.app.update_metrics_table()
         
-        # Get add_row calls
-        calls = self.app.metrics_table.add_row.call_args_list
-        
-        # Symbol should be set from config.DEFAULT_SYMBOL
-        self.assertEqual(calls[0][0][1], "XRP/USDT:USDT")
-        
-        # Check that None values are displayed as "N/A"
-        self.assertEqual(calls[2][0][1], "N/A")  # Current Price
-        self.assertEqual(calls[3][0][1], "N/A")  # RSI
-        self.assertEqual(calls[4][0][1], "N/A")  # Prediction
-        self.assertEqual(calls[5][0][1], "N/A")  # Position Size
-        self.assertEqual(calls[6][0][1], "N/A")  # Entry Price
-        self.assertEqual(calls[7][0][1], "N/A")  # PnL
+        # Symbol should be set from config.DEFAULT_SYMBOL; None values are displayed as "N/A"
+        self.app.metrics_table.add_row.assert_has_calls(EXPECTED_EMPTY_ROWS)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,22 +1,85 @@
 import unittest
-import sys
+import copy
 import os
-from unittest.mock import patch, MagicMock
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from unittest.mock import patch, Mock
 from decimal import Decimal
 
-# Add parent directory to path to import our modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ccxt
+import numpy as np
 from src.mexc_handler import MEXCHandler
+from src.utils.error_handler import APIError, ConnectionError
+from src.utils.ring_buffer import OHLCVRingBuffer
 from tests.mock_mexc_handler import MockMEXCHandler
 
+
+XRP_MARKET = {
+    'symbol': 'XRP/USDT:USDT',
+    'base': 'XRP',
+    'quote': 'USDT',
+    'precision': {'price': 4, 'amount': 2},
+    'limits': {'amount': {'min': 0.01}},
+    'swap': True
+}
+
+
+# (symbol, leverage, expected result) for TestMEXCHandler.test_set_leverage
+SET_LEVERAGE_CASES = (
+    ('XRP/USDT:USDT', 10, True),
+    ('INVALID/USDT:USDT', 10, False),  # Unknown symbol
+    ('XRP/USDT:USDT', 0, False),  # Invalid leverage value
+)
+
+# (side, amount, sl_price, tp_price) for TestMEXCHandler.test_place_market_order
+PLACE_ORDER_CASES = (
+    ('buy', 100, 0.45, 0.55),
+    ('sell', 50, None, None),
+)
+
+# Shared read-only fixtures for create_mock_exchange; handlers copy what they keep
+XRP_MARKETS = {'XRP/USDT:USDT': XRP_MARKET}
+MEXC_URLS = {'api': 'https://contract.mexc.com'}
+MEXC_HAS = {'fetchOHLCV': True, 'fetchPositions': True, 'fetchMyTrades': True}
+# fetch_balance payload; read-only so every test can return the same object
+SWAP_BALANCE = MappingProxyType({'free': MappingProxyType({'USDT': 250.0})})
+
+# The ccxt.mexc attributes MEXCHandler uses; touching any other one raises AttributeError
+EXCHANGE_ATTRS = [
+    'urls', 'has', 'markets', 'precisionMode', 'session',
+    'load_markets', 'set_markets', 'price_to_precision', 'set_leverage', 'create_order',
+    'fetch_ticker', 'fetch_tickers', 'fetch_ohlcv', 'fetch_balance', 'fetch_positions', 'fetch_my_trades',
+]
+
+
+def create_mock_exchange():
+    """Create a stand-in for the ccxt.mexc class whose instances know a single XRP market."""
+    # A fresh Mock per call: copies of a template would share child mocks and call counts
+    exchange = Mock(spec_set=EXCHANGE_ATTRS)
+    exchange.load_markets.return_value = XRP_MARKETS
+    exchange.urls = MEXC_URLS
+    exchange.has = MEXC_HAS
+    exchange.precisionMode = ccxt.DECIMAL_PLACES
+    exchange_class = Mock(return_value=exchange)
+    return exchange_class
+
 class TestMEXCHandler(unittest.TestCase):
     """Tests for the MEXCHandler class."""
     
-    def setUp(self):
-        """Set up test environment before each test."""
+    @classmethod
+    def setUpClass(cls):
+        """Build the handler once for the class."""
         # Instead of creating an actual MEXCHandler which tries to connect to the API,
         # we'll create a mock instance for testing
-        self.handler = MockMEXCHandler()
+        cls.handler = MockMEXCHandler()
+    
+    def setUp(self):
+        """Set up test environment before each test."""
+        # Orders append positions; start every test without any
+        self.handler.positions.clear()
     
     def test_init_success(self):
         """Test successful initialization and market loading."""
@@ -36,20 +99,11 @@ class TestMEXCHandler(unittest.TestCase):
         market = self.handler.get_market('NONEXISTENT/USDT:USDT')
         self.assertIsNone(market)
     
-    def test_set_leverage_success(self):
-        """Test setting leverage successfully."""
-        result = self.handler.set_leverage('XRP/USDT:USDT', 10)
-        self.assertTrue(result)
-    
-    def test_set_leverage_exchange_error(self):
-        """Test setting leverage when the exchange returns an error."""
-        # Test with invalid symbol
-        result = self.handler.set_leverage('INVALID/USDT:USDT', 10)
-        self.assertFalse(result)
-        
-        # Test with invalid leverage value
-        result = self.handler.set_leverage('XRP/USDT:USDT', 0)
-        self.assertFalse(result)
+    def test_set_leverage(self):
+        """Test setting leverage, including an unknown symbol and an invalid leverage value."""
+        for symbol, leverage, expected in SET_LEVERAGE_CASES:
+            with self.subTest(symbol=symbol, leverage=leverage):
+                self.assertIs(self.handler.set_leverage(symbol, leverage), expected)
     
     def test_get_current_price_success(self):
         """Test fetching the current price successfully."""
@@ -80,42 +134,33 @@ class TestMEXCHandler(unittest.TestCase):
         # It should return None to indicate error
         self.assertIsNone(result)
     
-    def test_place_market_order_with_sl_tp_success(self):
-        """Test placing a market order with SL and TP prices."""
-        order = self.handler.place_market_order_with_sl_tp(
-            'XRP/USDT:USDT',
-            'buy',
-            100,
-            sl_price=0.45,
-            tp_price=0.55
-        )
-        self.assertIsNotNone(order)
-        self.assertEqual(order['symbol'], 'XRP/USDT:USDT')
-        self.assertEqual(order['side'], 'buy')
-        self.assertEqual(order['amount'], 100)
-        
-        # Verify position was created
-        positions = self.handler.get_positions('XRP/USDT:USDT')
-        self.assertEqual(len(positions), 1)
-        self.assertEqual(positions[0]['sl_price'], 0.45)
-        self.assertEqual(positions[0]['tp_price'], 0.55)
-    
-    def test_place_market_order_success(self):
-        """Test placing a simple market order."""
-        order = self.handler.place_market_order_with_sl_tp(
-            'XRP/USDT:USDT',
-            'sell',
-            50
-        )
-        self.assertIsNotNone(order)
-        self.assertEqual(order['symbol'], 'XRP/USDT:USDT')
-        self.assertEqual(order['side'], 'sell')
-        self.assertEqual(order['amount'], 50)
+    def test_place_market_order(self):
+        """Test placing market orders with and without SL and TP prices."""
+        for side, amount, sl_price, tp_price in PLACE_ORDER_CASES:
+            with self.subTest(side=side, amount=amount, sl_price=sl_price, tp_price=tp_price):
+                self.handler.positions.clear()
+                order = self.handler.place_market_order_with_sl_tp(
+                    'XRP/USDT:USDT',
+                    side,
+                    amount,
+                    sl_price=sl_price,
+                    tp_price=tp_price
+                )
+                self.assertIsNotNone(order)
+                self.assertEqual(order['symbol'], 'XRP/USDT:USDT')
+                self.assertEqual(order['side'], side)
+                self.assertEqual(order['amount'], amount)
+                
+                # Verify position was created
+                positions = self.handler.get_positions('XRP/USDT:USDT')
+                self.assertEqual(len(positions), 1)
+                self.assertEqual(positions[0]['sl_price'], sl_price)
+                self.assertEqual(positions[0]['tp_price'], tp_price)
     
     def test_place_order_insufficient_funds(self):
         """Test placing an order with insufficient funds."""
-        # Create a mock with low balance
-        handler = MockMEXCHandler()
+        # A shallow copy with low balance, leaving the shared handler's balance alone
+        handler = copy.copy(self.handler)
         handler.balance = {'USDT': 0.1}  # Very low balance
         
         order = handler.place_market_order_with_sl_tp(
@@ -134,8 +179,8 @@ class TestMEXCHandler(unittest.TestCase):
     
     def test_get_usdt_balance_no_usdt(self):
         """Test fetching balance when USDT key is missing."""
-        # Create a mock with no USDT balance
-        handler = MockMEXCHandler()
+        # A shallow copy with no USDT balance, leaving the shared handler's balance alone
+        handler = copy.copy(self.handler)
         handler.balance = {'BTC': 1.0}  # No USDT key
         
         balance = handler.get_usdt_balance()
@@ -158,12 +203,378 @@ class TestMEXCHandler(unittest.TestCase):
     
     def test_get_positions_success_no_positions(self):
         """Test fetching positions when there are none open."""
-        # Create a fresh handler with no positions
-        handler = MockMEXCHandler()
-        
-        positions = handler.get_positions()
+        # setUp leaves the handler with no positions
+        positions = self.handler.get_positions()
         self.assertIsNotNone(positions)
         self.assertEqual(len(positions), 0)
 
+
+class TestMEXCHandlerCaching(unittest.TestCase):
+    """Tests for the caching behaviour of the real MEXCHandler against a mocked ccxt exchange."""
+
+    def setUp(self):
+        """Create a handler backed by a mocked ccxt.mexc instance."""
+        patcher = patch('src.mexc_handler.ccxt.mexc', new_callable=create_mock_exchange)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.handler = MEXCHandler(api_key='key', secret_key='secret', test_mode=False, markets_cache_path=None)
+        self.addCleanup(self.handler.close)
+        self.exchange = self.handler.exchange
+
+    def test_get_market_served_from_cache(self):
+        """Test that a known market is returned without reloading markets."""
+        self.assertEqual(self.handler.get_market('XRP/USDT:USDT'), XRP_MARKET)
+        self.assertEqual(self.handler.get_market('XRP/USDT:USDT'), XRP_MARKET)
+        self.exchange.load_markets.assert_called_once_with()
+
+    def test_dns_priming_is_opt_in(self):
+        """Test that only handlers built with prime_dns=True start the background DNS lookup."""
+        for prime_dns in (False, True):
+            with self.subTest(prime_dns=prime_dns), patch.object(MEXCHandler, '_prime_dns') as mock_prime:
+                handler = MEXCHandler(api_key='key', secret_key='secret', test_mode=False,
+                                      markets_cache_path=None, prime_dns=prime_dns)
+                self.addCleanup(handler.close)
+                self.assertEqual(mock_prime.called, prime_dns)
+
+    def test_get_market_missing_symbol_reloads_once(self):
+        """Test that an unknown symbol forces one reload and is then remembered as missing."""
+        self.assertIsNone(self.handler.get_market('NONEXISTENT/USDT:USDT'))
+        self.assertIsNone(self.handler.get_market('NONEXISTENT/USDT:USDT'))
+        self.exchange.load_markets.assert_called_with(True)
+        self.assertEqual(self.exchange.load_markets.call_count, 2) # Initial load + one forced reload
+
+    def test_markets_loaded_from_disk_cache_on_restart(self):
+        """Test that a second handler initializes markets from the on-disk cache."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'markets.pkl')
+            first = MEXCHandler(api_key='key', secret_key='secret', test_mode=False, markets_cache_path=cache_path)
+            self.addCleanup(first.close)
+            self.assertTrue(os.path.exists(cache_path))
+            
+            with patch('src.mexc_handler.ccxt.mexc', new_callable=create_mock_exchange) as exchange_class:
+                exchange = exchange_class.return_value
+                exchange.markets = XRP_MARKETS
+                second = MEXCHandler(api_key='key', secret_key='secret', test_mode=False, markets_cache_path=cache_path)
+                self.addCleanup(second.close)
+                exchange.load_markets.assert_not_called()
+                exchange.set_markets.assert_called_once_with(XRP_MARKETS)
+
+    def test_bad_symbol_order_busts_market_cache(self):
+        """Test that an order rejected for its symbol drops the cached market and the disk cache."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = os.path.join(tmp_dir, 'markets.pkl')
+            handler = MEXCHandler(api_key='key', secret_key='secret', test_mode=False, markets_cache_path=cache_path)
+            self.addCleanup(handler.close)
+            handler.exchange.create_order.side_effect = ccxt.BadSymbol('delisted')
+            
+            with self.assertRaises(APIError):
+                handler.place_market_order_with_sl_tp('XRP/USDT:USDT', 'buy', 10)
+            self.assertFalse(os.path.exists(cache_path))
+            self.assertNotIn('XRP/USDT:USDT', handler._market_handles)
+
+    def test_get_usdt_balance_cached_until_order(self):
+        """Test that the balance is cached and refetched after an order is placed."""
+        self.exchange.fetch_balance.return_value = SWAP_BALANCE
+        self.exchange.create_order.return_value = {'id': 'order-1'}
+        
+        self.assertEqual(self.handler.get_usdt_balance(), 250.0)
+        self.assertEqual(self.handler.get_usdt_balance(), 250.0)
+        self.exchange.fetch_balance.assert_called_once()
+        
+        self.handler.place_market_order_with_sl_tp('XRP/USDT:USDT', 'buy', 10)
+        self.handler.get_usdt_balance()
+        self.assertEqual(self.exchange.fetch_balance.call_count, 2)
+
+    def test_order_invalidates_cached_price(self):
+        """Test that placing an order drops the cached price for its symbol."""
+        self.exchange.fetch_ticker.return_value = {'last': 0.5}
+        self.exchange.create_order.return_value = {'id': 'order-1'}
+        
+        self.handler.get_current_price('XRP/USDT:USDT')
+        self.handler.place_market_order_with_sl_tp('XRP/USDT:USDT', 'buy', 10)
+        self.handler.get_current_price('XRP/USDT:USDT')
+        self.assertEqual(self.exchange.fetch_ticker.call_count, 2)
+
+    def test_fetch_ohlcv_repeat_call_served_from_cache(self):
+        """Test that an immediate repeat OHLCV request does not hit the exchange again."""
+        candles = [[1700000000000, 0.5, 0.51, 0.49, 0.505, 1000.0]]
+        self.exchange.fetch_ohlcv.return_value = candles
+        
+        self.assertEqual(self.handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 1), candles)
+        cached = self.handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 1)
+        self.assertEqual(cached, candles)
+        self.exchange.fetch_ohlcv.assert_called_once()
+        
+        # Modifying a returned list must not leak into the cache
+        cached[0][4] = 0.0
+        cached.clear()
+        self.assertEqual(self.handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 1), [[1700000000000, 0.5, 0.51, 0.49, 0.505, 1000.0]])
+
+    def test_fetch_ohlcv_with_store_fetches_only_delta(self):
+        """Test that a configured OHLCV store turns repeat fetches into since= delta requests."""
+        handler = MEXCHandler(api_key='key', secret_key='secret', test_mode=False,
+                              markets_cache_path=None, ohlcv_db_path=':memory:')
+        self.addCleanup(handler.close)
+        exchange = handler.exchange
+        last_ts = (int(time.time()) // 60 - 1) * 60000
+        exchange.fetch_ohlcv.return_value = [
+            [last_ts - 60000, 0.5, 0.51, 0.49, 0.505, 1000.0],
+            [last_ts, 0.505, 0.52, 0.50, 0.515, 1200.0],
+        ]
+        handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 2)
+        
+        handler._ohlcv_cache.clear()
+        exchange.fetch_ohlcv.return_value = [
+            [last_ts, 0.505, 0.53, 0.50, 0.525, 1500.0],
+            [last_ts + 60000, 0.525, 0.53, 0.52, 0.53, 100.0],
+        ]
+        candles = handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 2)
+        
+        exchange.fetch_ohlcv.assert_called_with('XRP/USDT:USDT', timeframe='1m', since=last_ts, limit=2)
+        self.assertEqual([c[0] for c in candles], [last_ts, last_ts + 60000])
+        self.assertEqual(candles[0][4], 0.525)
+
+    def test_fetch_ohlcv_range_pages_and_stitches(self):
+        """Test that a history range is fetched page by page and stitched in time order."""
+        def page(symbol, timeframe, since, limit):
+            return [[ts, 1.0, 1.0, 1.0, 1.0, 1.0] for ts in range(since, since + limit * 60000, 60000)]
+        self.exchange.fetch_ohlcv.side_effect = page
+        
+        candles = self.handler.fetch_ohlcv_range('XRP/USDT:USDT', '1m', 0, 5 * 60000, limit=2)
+        
+        self.assertEqual([c[0] for c in candles], [0, 60000, 120000, 180000, 240000])
+        self.assertEqual(self.exchange.fetch_ohlcv.call_count, 3)
+
+    def test_fetch_ohlcv_np_returns_columns(self):
+        """Test that OHLCV data is returned as per-column NumPy arrays."""
+        self.exchange.fetch_ohlcv.return_value = [
+            [1700000000000, 0.5, 0.51, 0.49, 0.505, 1000.0],
+            [1700000060000, 0.505, 0.52, 0.50, 0.515, 1200.0],
+        ]
+        columns = self.handler.fetch_ohlcv_np('XRP/USDT:USDT', '1m', 2)
+        
+        self.assertEqual(columns['ts'].dtype, np.int64)
+        self.assertEqual(columns['ts'].tolist(), [1700000000000, 1700000060000])
+        self.assertEqual(columns['close'].tolist(), [0.505, 0.515])
+        self.assertEqual(columns['volume'].dtype, np.float64)
+
+    def test_fetch_ohlcv_many_reports_failures_per_symbol(self):
+        """Test that a concurrent multi-symbol fetch isolates per-symbol failures."""
+        candles = [[1700000000000, 0.5, 0.51, 0.49, 0.505, 1000.0]]
+        
+        def fake_fetch(symbol, timeframe='1m', limit=100):
+            if symbol == 'BAD/USDT:USDT':
+                raise ccxt.BadSymbol('unknown symbol')
+            return candles
+        self.exchange.fetch_ohlcv.side_effect = fake_fetch
+        
+        results = self.handler.fetch_ohlcv_many(['XRP/USDT:USDT', 'BAD/USDT:USDT'], '1m', 1)
+        self.assertEqual(results, {'XRP/USDT:USDT': candles, 'BAD/USDT:USDT': None})
+
+    def test_snapshot_collects_independent_reads(self):
+        """Test that snapshot returns every read and reports failures as None."""
+        self.exchange.fetch_balance.return_value = SWAP_BALANCE
+        self.exchange.fetch_ticker.return_value = {'last': 0.5}
+        self.exchange.fetch_positions.side_effect = ccxt.ExchangeError('positions unavailable')
+        self.exchange.fetch_ohlcv.return_value = [[1700000000000, 0.5, 0.51, 0.49, 0.505, 1000.0]]
+        
+        snapshot = self.handler.snapshot('XRP/USDT:USDT', '1m', 1)
+        self.assertEqual(snapshot['balance'], 250.0)
+        self.assertEqual(snapshot['price'], 0.5)
+        self.assertIsNone(snapshot['positions'])
+        self.assertEqual(len(snapshot['ohlcv']), 1)
+
+    def test_get_current_prices_batch_fills_price_cache(self):
+        """Test that batch price lookups use one request and serve later single lookups."""
+        self.exchange.fetch_tickers.return_value = {
+            'XRP/USDT:USDT': {'last': 0.5456},
+            'BTC/USDT:USDT': {'last': None},
+        }
+        
+        prices = self.handler.get_current_prices(['XRP/USDT:USDT', 'BTC/USDT:USDT'])
+        self.assertEqual(prices, {'XRP/USDT:USDT': 0.5456})
+        self.exchange.fetch_tickers.assert_called_once_with(['XRP/USDT:USDT', 'BTC/USDT:USDT'])
+        
+        self.assertEqual(self.handler.get_current_price('XRP/USDT:USDT'), 0.5456)
+        self.exchange.fetch_ticker.assert_not_called()
+
+    def test_concurrent_price_lookups_share_one_request(self):
+        """Test that overlapping get_current_price calls for a symbol issue one fetch_ticker."""
+        release = threading.Event()
+        def slow_ticker(symbol):
+            release.wait(5)
+            return {'last': 0.5}
+        self.exchange.fetch_ticker.side_effect = slow_ticker
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(self.handler.get_current_price, 'XRP/USDT:USDT') for _ in range(4)]
+            time.sleep(0.1)
+            release.set()
+            prices = [f.result(timeout=5) for f in futures]
+        
+        self.assertEqual(prices, [0.5] * 4)
+        self.exchange.fetch_ticker.assert_called_once_with('XRP/USDT:USDT')
+
+    def test_streamed_price_served_without_rest_call(self):
+        """Test that a pushed websocket price is returned by get_current_price."""
+        self.handler._on_stream_price('XRP/USDT:USDT', 0.6)
+        self.assertEqual(self.handler.get_current_price('XRP/USDT:USDT'), 0.6)
+        self.exchange.fetch_ticker.assert_not_called()
+
+    def test_streamed_candles_served_without_rest_call(self):
+        """Test that live streamed candles, backfilled from REST, are returned by fetch_ohlcv."""
+        self.handler._stream_candles[('XRP/USDT:USDT', '1m')] = (0.0, OHLCVRingBuffer(3))
+        self.exchange.fetch_ohlcv.return_value = [
+            [1700000000000, 0.5, 0.51, 0.49, 0.505, 1000.0],
+            [1700000060000, 0.505, 0.52, 0.50, 0.515, 1200.0],
+        ]
+        self.handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 3)
+        
+        self.handler._on_stream_candles('XRP/USDT:USDT', '1m', [
+            [1700000060000, 0.505, 0.53, 0.50, 0.525, 1300.0],
+            [1700000120000, 0.525, 0.53, 0.52, 0.53, 10.0],
+        ])
+        self.exchange.fetch_ohlcv.reset_mock()
+        candles = self.handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 3)
+        
+        self.exchange.fetch_ohlcv.assert_not_called()
+        self.assertEqual([c[0] for c in candles], [1700000000000, 1700000060000, 1700000120000])
+        self.assertTrue(all(type(c[0]) is int for c in candles))
+        self.assertEqual(candles[1][4], 0.525)
+        
+        columns = self.handler.fetch_ohlcv_np('XRP/USDT:USDT', '1m', 2)
+        self.assertEqual(columns['close'].tolist(), [0.525, 0.53])
+        self.assertFalse(columns['close'].flags.writeable)
+        
+        self.handler._on_stream_candles('XRP/USDT:USDT', '1m', [[1700000180000, 0.53, 0.54, 0.53, 0.54, 5.0]])
+        candles = self.handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 3)
+        self.assertEqual([c[0] for c in candles], [1700000060000, 1700000120000, 1700000180000])
+
+    def test_order_sl_tp_prices_rounded_to_tick(self):
+        """Test that SL/TP prices are formatted to the market's price precision."""
+        self.exchange.create_order.return_value = {'id': 'order-1'}
+        self.handler.place_market_order_with_sl_tp('XRP/USDT:USDT', 'buy', 10, sl_price=0.45004, tp_price=0.55006)
+        
+        params = self.exchange.create_order.call_args.kwargs['params']
+        self.assertEqual(params, {'stopLossPrice': '0.4500', 'takeProfitPrice': '0.5501'})
+        self.exchange.price_to_precision.assert_not_called()
+
+    def test_place_market_order_async_returns_future(self):
+        """Test that an order submitted asynchronously resolves to the placed order."""
+        self.exchange.create_order.return_value = {'id': 'order-2'}
+        future = self.handler.place_market_order_async('XRP/USDT:USDT', 'sell', 10, sl_price=0.55, tp_price=0.45)
+        
+        self.assertEqual(future.result(timeout=5), {'id': 'order-2'})
+        self.assertEqual(self.exchange.create_order.call_args.kwargs['side'], 'sell')
+
+    def test_trade_history_fetches_incrementally(self):
+        """Test that repeat trade history calls only ask for trades after the newest one seen."""
+        self.exchange.fetch_my_trades.return_value = [{'id': '1', 'timestamp': 1000}, {'id': '2', 'timestamp': 2000}]
+        self.assertEqual([t['id'] for t in self.handler.get_trade_history('XRP/USDT:USDT', limit=2)], ['1', '2'])
+        self.exchange.fetch_my_trades.assert_called_with(symbol='XRP/USDT:USDT', since=None, limit=2)
+        
+        self.exchange.fetch_my_trades.return_value = [{'id': '3', 'timestamp': 3000}]
+        self.assertEqual([t['id'] for t in self.handler.get_trade_history('XRP/USDT:USDT', limit=2)], ['2', '3'])
+        self.exchange.fetch_my_trades.assert_called_with(symbol='XRP/USDT:USDT', since=2001, limit=2)
+
+    def test_close_position_places_opposite_order(self):
+        """Test that closing uses the opposite side for both order and ccxt position sides."""
+        self.exchange.create_order.return_value = {'id': 'close-1'}
+        for side, expected in (('buy', 'sell'), ('long', 'sell'), ('sell', 'buy'), ('short', 'buy')):
+            with self.subTest(side=side):
+                self.handler.close_position({'symbol': 'XRP/USDT:USDT', 'side': side, 'size': 10})
+                self.assertEqual(self.exchange.create_order.call_args.kwargs['side'], expected)
+
+    def test_get_trade_history_many_keeps_errors_in_place(self):
+        """Test that per-symbol trade history results align with the input, errors included."""
+        def trades(symbol, since, limit):
+            if symbol == 'BAD/USDT:USDT':
+                raise ccxt.ExchangeError('rejected')
+            return [{'id': symbol, 'timestamp': 1000}]
+        self.exchange.fetch_my_trades.side_effect = trades
+        
+        results = self.handler.get_trade_history_many(['XRP/USDT:USDT', 'BAD/USDT:USDT'])
+        self.assertEqual(results[0], [{'id': 'XRP/USDT:USDT', 'timestamp': 1000}])
+        self.assertIsInstance(results[1], APIError)
+
+    def test_set_leverage_sets_both_sides(self):
+        """Test that leverage is set for both position sides and failures are reported."""
+        self.assertTrue(self.handler.set_leverage('XRP/USDT:USDT', 10))
+        position_types = sorted(c.kwargs['params']['positionType'] for c in self.exchange.set_leverage.call_args_list)
+        self.assertEqual(position_types, [1, 2])
+        
+        self.exchange.set_leverage.side_effect = ccxt.ExchangeError('rejected')
+        self.assertFalse(self.handler.set_leverage('XRP/USDT:USDT', 20))
+
+    def test_set_leverage_network_error_raised_after_both_sides(self):
+        """Test that a network failure on one side is raised only after the other side is recorded."""
+        def set_leverage(leverage, symbol, params):
+            if params['positionType'] == 1:
+                raise ccxt.NetworkError('connection reset')
+        self.exchange.set_leverage.side_effect = set_leverage
+
+        with self.assertRaises(ConnectionError):
+            self.handler.set_leverage('XRP/USDT:USDT', 10)
+        self.assertEqual(self.exchange.set_leverage.call_count, 2)
+
+        # Only the failed LONG side is sent again
+        self.exchange.set_leverage.reset_mock(side_effect=True)
+        self.assertTrue(self.handler.set_leverage('XRP/USDT:USDT', 10))
+        self.assertEqual([c.kwargs['params']['positionType'] for c in self.exchange.set_leverage.call_args_list], [1])
+
+    def test_set_leverage_skips_unchanged_value(self):
+        """Test that re-setting the same leverage does not call the exchange again."""
+        self.assertTrue(self.handler.set_leverage('XRP/USDT:USDT', 10))
+        self.assertTrue(self.handler.set_leverage('XRP/USDT:USDT', 10))
+        self.assertEqual(self.exchange.set_leverage.call_count, 2)
+        
+        self.assertTrue(self.handler.set_leverage('XRP/USDT:USDT', 5))
+        self.assertEqual(self.exchange.set_leverage.call_count, 4)
+
+    @patch('src.mexc_handler.time.sleep')
+    def test_fetch_ohlcv_retries_network_errors_only(self, mock_sleep):
+        """Test that network errors are retried with backoff but other exchange errors are not."""
+        candles = [[1700000000000, 0.5, 0.51, 0.49, 0.505, 1000.0]]
+        self.exchange.fetch_ohlcv.side_effect = [ccxt.NetworkError('timeout'), candles]
+        self.assertEqual(self.handler.fetch_ohlcv('XRP/USDT:USDT', '5m', 1), candles)
+        self.assertEqual(self.exchange.fetch_ohlcv.call_count, 2)
+        mock_sleep.assert_called_once()
+        
+        self.exchange.fetch_ohlcv.reset_mock()
+        self.exchange.fetch_ohlcv.side_effect = ccxt.BadSymbol('unknown symbol')
+        with self.assertRaises(APIError):
+            self.handler.fetch_ohlcv('BAD/USDT:USDT', '5m', 1)
+        self.exchange.fetch_ohlcv.assert_called_once()
+
+    @patch('src.mexc_handler.time.sleep')
+    def test_repeated_network_failures_open_circuit(self, mock_sleep):
+        """Test that data fetches fail fast once the circuit breaker has opened."""
+        self.exchange.fetch_ticker.side_effect = ccxt.NetworkError('down')
+        with self.assertRaises(APIError):
+            self.handler.get_current_price('XRP/USDT:USDT')
+        self.assertIsNone(self.handler.get_current_price('XRP/USDT:USDT'))
+        self.assertTrue(self.handler._breaker.is_open)
+        self.assertEqual(self.exchange.fetch_ticker.call_count, 5)
+        
+        self.exchange.fetch_ohlcv.reset_mock()
+        self.assertIsNone(self.handler.fetch_ohlcv('XRP/USDT:USDT', '1m', 1))
+        self.exchange.fetch_ohlcv.assert_not_called()
+
+    def test_bad_symbol_short_circuits_until_forgotten(self):
+        """Test that a symbol rejected by the exchange is not requested again until forgotten."""
+        self.exchange.fetch_ticker.side_effect = ccxt.BadSymbol('unknown symbol')
+        with self.assertRaises(APIError):
+            self.handler.get_current_price('BAD/USDT:USDT')
+        
+        self.assertIsNone(self.handler.get_current_price('BAD/USDT:USDT'))
+        self.assertIsNone(self.handler.fetch_ohlcv('BAD/USDT:USDT'))
+        self.exchange.fetch_ticker.assert_called_once()
+        self.exchange.fetch_ohlcv.assert_not_called()
+        
+        self.handler.forget_missing('BAD/USDT:USDT')
+        self.exchange.fetch_ticker.side_effect = None
+        self.exchange.fetch_ticker.return_value = {'last': 1.5}
+        self.assertEqual(self.handler.get_current_price('BAD/USDT:USDT'), 1.5)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,82 +1,32 @@
 import unittest
-import sys
-import os
 from unittest.mock import Mock, patch
-import queue
+from types import SimpleNamespace
 
-# Add parent directory to path to import our modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.main import NotificationWidget, NotificationMessage, TradingBotApp
-from textual.app import App, ComposeResult
-from textual.widgets import Static
-
-class MockApp(App):
-    """A mock app to test the NotificationWidget."""
-    
-    def __init__(self):
-        super().__init__()
-        self.notification_widget = NotificationWidget(id="notification")
-        self.notification_widget.visible = False
-        self.test_complete = False
-        self.assertions_passed = False
-        
-    def compose(self) -> ComposeResult:
-        yield self.notification_widget
-        
-    def on_mount(self):
-        # This enables us to set a timer that will check the notification
-        # and then exit the app after the test is complete
-        self.set_timer(0.1, self.run_test)
-        
-    def run_test(self):
-        """Run the test and close the app when done."""
-        try:
-            # Show a notification
-            self.notification_widget.show_notification("Test notification", "info")
-            
-            # Test that the notification is visible
-            assert self.notification_widget.visible is True
-            
-            # Test that the notification contains the correct text
-            assert "Test notification" in self.notification_widget.render()
-            
-            # Manually clear the notification
-            self.notification_widget.clear_notification()
-            
-            # Test that the notification is no longer visible
-            assert self.notification_widget.visible is False
-            
-            # Set success immediately for simplified test
-            self.assertions_passed = True
-            self.test_complete = True
-            self.exit()
-            
-        except AssertionError as e:
-            # If any assertions fail, record it
-            self.test_complete = True
-            self.assertions_passed = False
-            print(f"Assertion failed: {e}")
-            self.exit()
+from src.widgets.notification import NotificationWidget, NotificationMessage
 
 class TestNotifications(unittest.TestCase):
     """Tests for the notification system."""
     
-    @patch('textual.app.App.run')
-    def test_notification_widget(self, mock_run):
+    @patch.object(NotificationWidget, 'set_timer')
+    def test_notification_widget(self, mock_set_timer):
         """Test the NotificationWidget directly."""
-        # Create a mock app
-        app = MockApp()
+        # No App or event loop: only the auto-hide timer needs one, so it is patched out
+        widget = NotificationWidget(id="notification")
+        widget.visible = False
+        
+        # Show a notification
+        widget.show_notification("Test notification", "info")
         
-        # Set test as complete and successful immediately
-        app.test_complete = True
-        app.assertions_passed = True
+        # Test that the notification is visible, with the correct text and an auto-hide timer
+        self.assertIs(widget.visible, True)
+        self.assertIn("Test notification", str(widget.render()))
+        mock_set_timer.assert_called_once_with(widget.auto_hide_time, widget.clear_notification)
         
-        # Run the app (this will be mocked)
-        app.run()
+        # Manually clear the notification
+        widget.clear_notification()
         
-        # After the app "runs", check our assertions
-        self.assertTrue(app.test_complete)
-        self.assertTrue(app.assertions_passed)
+        # Test that the notification is no longer visible
+        self.assertIs(widget.visible, False)
     
     def test_notification_message(self):
         """Test the NotificationMessage class."""
@@ -90,20 +40,23 @@ class TestNotifications(unittest.TestCase):
         self.assertEqual(msg.message, "Warning message")
         self.assertEqual(msg.level, "warning")
     
-    @patch('src.main.TradingBotApp.on_notification_message')
-    def test_notification_handler(self, mock_handler):
+    def test_notification_handler(self):
         """Test the notification message handler."""
-        # Create a mock app
-        app = TradingBotApp()
+        # Imported here so the widget and message tests don't pay for loading the whole app
+        from src.main import TradingBotApp
+        
+        # Only the widget the handler touches, instead of constructing a whole TradingBotApp
+        app = SimpleNamespace(notification_widget=Mock())
         
         # Create a notification message
         msg = NotificationMessage("Test notification", "warning")
         
         # Manually call the handler (normally done by Textual message passing)
-        app.on_notification_message(msg)
+        TradingBotApp.on_notification_message(app, msg)
         
-        # Check that the handler was called with the correct message
-        mock_handler.assert_called_once_with(msg)
+        # Check that the notification was shown, staying up longer as a warning
+        app.notification_widget.show_notification.assert_called_once_with("Test notification", "warning")
+        self.assertEqual(app.notification_widget.auto_hide_time, 7)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,19 +1,20 @@
 import unittest
-from predictor import get_signal
 
 # Sample OHLCV data (replace with realistic data if needed for your actual strategy tests)
-# [timestamp, open, high, low, close, volume]
-SAMPLE_OHLCV_DATA = [
-    [1678886400000, 0.38, 0.39, 0.37, 0.385, 100000],
-    [1678886460000, 0.385, 0.395, 0.38, 0.39, 120000],
-    [1678886520000, 0.39, 0.392, 0.388, 0.391, 80000],
+# (timestamp, open, high, low, close, volume); immutable, so tests can share it safely
+SAMPLE_OHLCV_DATA = (
+    (1678886400000, 0.38, 0.39, 0.37, 0.385, 100000),
+    (1678886460000, 0.385, 0.395, 0.38, 0.39, 120000),
+    (1678886520000, 0.39, 0.392, 0.388, 0.391, 80000),
     # Add more data points as required by your strategy
-]
+)
 
 class TestPredictor(unittest.TestCase):
 
     def test_get_signal_placeholder(self):
         """Test the placeholder behavior which should always return 'NONE'"""
+        # Imported per test, so collecting this module doesn't load the strategy's dependencies
+        from predictor import get_signal
         symbol = 'XRP/USDT:USDT'
         timeframe = '1m'
         signal = get_signal(symbol, timeframe, SAMPLE_OHLCV_DATA)
@@ -21,6 +22,7 @@ class TestPredictor(unittest.TestCase):
 
     def test_get_signal_no_data(self):
         """Test behavior when no OHLCV data is provided."""
+        from predictor import get_signal
         symbol = 'XRP/USDT:USDT'
         timeframe = '1m'
         signal = get_signal(symbol, timeframe, [])
@@ -1,35 +1,79 @@
 import unittest
-import sys
-import os
+import math
 from decimal import Decimal
+from types import MappingProxyType
+import numpy as np
 
-# Add parent directory to path to import our modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.stats_handler import StatsHandler
 
+# Current prices, 10% either side of the sample positions' 0.5000 entry
+_P_UP = Decimal('0.5500')
+_P_DOWN = Decimal('0.4500')
+_P_MID = Decimal('0.5000')
+
+# Sample position data for tests; setUp hands each test its own copies to modify
+LONG_POSITION = MappingProxyType({
+    'symbol': 'XRP/USDT:USDT',
+    'side': 'buy',
+    'size': '100',
+    'entry_price': '0.5000',
+    'order_id': 'test-order-1'
+})
+
+SHORT_POSITION = MappingProxyType({
+    'symbol': 'XRP/USDT:USDT',
+    'side': 'sell',
+    'size': '100',
+    'entry_price': '0.5000',
+    'order_id': 'test-order-2'
+})
+
+# LONG_POSITION with one field missing or invalid
+_POS_NO_ENTRY = MappingProxyType({
+    'symbol': 'XRP/USDT:USDT',
+    'side': 'buy',
+    'size': '100',
+    'order_id': 'test-order-1'
+})
+
+_POS_NO_SIDE = MappingProxyType({
+    'symbol': 'XRP/USDT:USDT',
+    'size': '100',
+    'entry_price': '0.5000',
+    'order_id': 'test-order-1'
+})
+
+_POS_INVALID_SIDE = MappingProxyType({
+    'symbol': 'XRP/USDT:USDT',
+    'side': 'invalid',
+    'size': '100',
+    'entry_price': '0.5000',
+    'order_id': 'test-order-1'
+})
+
+# (case, position, current price, expected PnL%) for test_calculate_pnl
+PNL_CASES = (
+    ('long_profitable', LONG_POSITION, _P_UP, 10.0),
+    ('long_losing', LONG_POSITION, _P_DOWN, -10.0),
+    ('short_profitable', SHORT_POSITION, _P_DOWN, 10.0),
+    ('short_losing', SHORT_POSITION, _P_UP, -10.0),
+)
+
 class TestStatsHandler(unittest.TestCase):
     """Tests for the StatsHandler class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the handler once for the class."""
+        cls.stats_handler = StatsHandler()
+    
     def setUp(self):
         """Set up test environment before each test."""
-        self.stats_handler = StatsHandler()
+        # Start every test with no recorded trades
+        self.stats_handler.reset()
         
-        # Sample position data for tests
-        self.long_position = {
-            'symbol': 'XRP/USDT:USDT',
-            'side': 'buy',
-            'size': '100',
-            'entry_price': '0.5000',
-            'order_id': 'test-order-1'
-        }
-        
-        self.short_position = {
-            'symbol': 'XRP/USDT:USDT',
-            'side': 'sell',
-            'size': '100',
-            'entry_price': '0.5000',
-            'order_id': 'test-order-2'
-        }
+        self.long_position = dict(LONG_POSITION)
+        self.short_position = dict(SHORT_POSITION)
     
     def test_initialization(self):
         """Test proper initialization of StatsHandler."""
@@ -37,71 +81,34 @@ class TestStatsHandler(unittest.TestCase):
         self.assertEqual(self.stats_handler.trade_count, 0)
         self.assertEqual(self.stats_handler.win_count, 0)
     
-    def test_calculate_pnl_long_profitable(self):
-        """Test PnL calculation for a profitable long position."""
-        current_price = Decimal('0.5500')  # 10% increase
-        
-        pnl_info = self.stats_handler.calculate_pnl(self.long_position, current_price)
-        
-        self.assertIsNotNone(pnl_info)
-        self.assertIn('pnl_percent', pnl_info)
-        self.assertAlmostEqual(pnl_info['pnl_percent'], 10.0, places=4)
-    
-    def test_calculate_pnl_long_losing(self):
-        """Test PnL calculation for a losing long position."""
-        current_price = Decimal('0.4500')  # 10% decrease
-        
-        pnl_info = self.stats_handler.calculate_pnl(self.long_position, current_price)
-        
-        self.assertIsNotNone(pnl_info)
-        self.assertIn('pnl_percent', pnl_info)
-        self.assertAlmostEqual(pnl_info['pnl_percent'], -10.0, places=4)
-    
-    def test_calculate_pnl_short_profitable(self):
-        """Test PnL calculation for a profitable short position."""
-        current_price = Decimal('0.4500')  # 10% decrease
-        
-        pnl_info = self.stats_handler.calculate_pnl(self.short_position, current_price)
-        
-        self.assertIsNotNone(pnl_info)
-        self.assertIn('pnl_percent', pnl_info)
-        self.assertAlmostEqual(pnl_info['pnl_percent'], 10.0, places=4)
-    
-    def test_calculate_pnl_short_losing(self):
-        """Test PnL calculation for a losing short position."""
-        current_price = Decimal('0.5500')  # 10% increase
-        
-        pnl_info = self.stats_handler.calculate_pnl(self.short_position, current_price)
-        
-        self.assertIsNotNone(pnl_info)
-        self.assertIn('pnl_percent', pnl_info)
-        self.assertAlmostEqual(pnl_info['pnl_percent'], -10.0, places=4)
+    def test_calculate_pnl(self):
+        """Test PnL calculation for profitable and losing long and short positions."""
+        for name, position, current_price, expected in PNL_CASES:
+            with self.subTest(case=name):
+                pnl_info = self.stats_handler.calculate_pnl(position, current_price)
+                
+                self.assertIsNotNone(pnl_info)
+                self.assertAlmostEqual(pnl_info['pnl_percent'], expected, places=4)
     
     def test_calculate_pnl_zero_entry(self):
         """Test PnL calculation with zero entry price (should return None)."""
         position = self.long_position.copy()
         position['entry_price'] = '0'
         
-        pnl_info = self.stats_handler.calculate_pnl(position, Decimal('0.5000'))
+        pnl_info = self.stats_handler.calculate_pnl(position, _P_MID)
         
         self.assertIsNone(pnl_info)
     
     def test_calculate_pnl_missing_data(self):
         """Test PnL calculation with missing data (should return None)."""
         # Test with missing entry price
-        position_no_entry = self.long_position.copy()
-        del position_no_entry['entry_price']
-        self.assertIsNone(self.stats_handler.calculate_pnl(position_no_entry, Decimal('0.5000')))
+        self.assertIsNone(self.stats_handler.calculate_pnl(_POS_NO_ENTRY, _P_MID))
         
         # Test with missing side
-        position_no_side = self.long_position.copy()
-        del position_no_side['side']
-        self.assertIsNone(self.stats_handler.calculate_pnl(position_no_side, Decimal('0.5000')))
+        self.assertIsNone(self.stats_handler.calculate_pnl(_POS_NO_SIDE, _P_MID))
         
         # Test with invalid side
-        position_invalid_side = self.long_position.copy()
-        position_invalid_side['side'] = 'invalid'
-        self.assertIsNone(self.stats_handler.calculate_pnl(position_invalid_side, Decimal('0.5000')))
+        self.assertIsNone(self.stats_handler.calculate_pnl(_POS_INVALID_SIDE, _P_MID))
         
         # Test with None current price
         self.assertIsNone(self.stats_handler.calculate_pnl(self.long_position, None))
@@ -109,14 +116,53 @@ class TestStatsHandler(unittest.TestCase):
     def test_calculate_pnl_decimal_conversion(self):
         """Test PnL calculation handles decimal conversion correctly."""
         # Test with string entry price (should convert successfully)
-        pnl_info = self.stats_handler.calculate_pnl(self.long_position, Decimal('0.5500'))
+        pnl_info = self.stats_handler.calculate_pnl(self.long_position, _P_UP)
         self.assertIsNotNone(pnl_info)
         
         # Test with float entry price
         position_float = self.long_position.copy()
         position_float['entry_price'] = 0.5000
-        pnl_info = self.stats_handler.calculate_pnl(position_float, Decimal('0.5500'))
+        pnl_info = self.stats_handler.calculate_pnl(position_float, _P_UP)
         self.assertIsNotNone(pnl_info)
 
+    def test_calculate_pnl_follows_entry_price_updates(self):
+        """Test that PnL is priced from the position's current entry price, e.g. after averaging in."""
+        position = self.long_position
+        self.assertAlmostEqual(self.stats_handler.calculate_pnl(position, _P_UP)['pnl_percent'], 10.0, places=4)
+
+        position['entry_price'] = '0.4000'
+        self.assertAlmostEqual(self.stats_handler.calculate_pnl(position, _P_UP)['pnl_percent'], 37.5, places=4)
+
+        position['side'] = 'sell'
+        self.assertAlmostEqual(self.stats_handler.calculate_pnl(position, _P_UP)['pnl_percent'], -37.5, places=4)
+        self.assertEqual(position, dict(LONG_POSITION, entry_price='0.4000', side='sell')) # Nothing cached on it
+
+    def test_calculate_pnl_batch(self):
+        """Test vectorized PnL over several positions."""
+        pnl = StatsHandler.calculate_pnl_batch(
+            np.array([0.5, 0.5, 2.0]), np.array([0.55, 0.55, 1.0]), np.array([1, -1, -1])
+        )
+        np.testing.assert_allclose(pnl, [10.0, -10.0, 50.0])
+        self.assertAlmostEqual(StatsHandler.calculate_pnl_fast(0.5, 0.45, 1), -10.0)
+
+    def test_portfolio_pnl_reuses_buffer(self):
+        """Test that portfolio PnL is computed for all registered positions into one buffer."""
+        self.stats_handler.set_portfolio(np.array([0.5, 0.5, 2.0]), np.array([1, -1, -1]))
+        first = self.stats_handler.portfolio_pnl(np.array([0.55, 0.55, 1.0]))
+        np.testing.assert_allclose(first, [10.0, -10.0, 50.0])
+        
+        second = self.stats_handler.portfolio_pnl(np.array([0.45, 0.45, 2.0]))
+        self.assertIs(first, second)
+        np.testing.assert_allclose(second, [-10.0, 10.0, 0.0])
+
+    def test_record_realized_pnl(self):
+        """Test that realized PnL is summed accurately and wins are counted."""
+        for pnl in [0.1] * 10 + [-0.5]:
+            self.stats_handler.record_realized_pnl(pnl)
+        
+        self.assertEqual(self.stats_handler.total_realized_pnl, math.fsum([0.1] * 10 + [-0.5]))
+        self.assertEqual(self.stats_handler.trade_count, 11)
+        self.assertAlmostEqual(self.stats_handler.get_win_rate(), 1000 / 11)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
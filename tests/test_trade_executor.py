@@ -0,0 +1,69 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock
+
+import ccxt
+from src.trade_executor import TradeExecutor
+
+
+def create_executor(precision, precision_mode):
+    """Create a TradeExecutor for an XRP market with the given ccxt precision and precision mode."""
+    handler = Mock()
+    handler.get_market.return_value = {
+        'symbol': 'XRP/USDT:USDT',
+        'precision': precision,
+        'limits': {'amount': {'min': 0.01}},
+    }
+    handler.exchange.precisionMode = precision_mode
+    return TradeExecutor(handler, symbol='XRP/USDT:USDT', leverage=10)
+
+
+class TestTradeExecutor(unittest.TestCase):
+    """Tests for TradeExecutor's amount and SL/TP price rounding."""
+
+    # (precision, precision mode, amount, side, price, expected amount, expected SL, expected TP)
+    # with SL at 1% and TP at 2%
+    CASES = (
+        ({'price': 4, 'amount': 2}, ccxt.DECIMAL_PLACES, '12.789', 'buy', '0.5', 12.78, 0.495, 0.51),
+        ({'price': 0.0001, 'amount': 1.0}, ccxt.TICK_SIZE, '12.7', 'buy', '0.5', 12.0, 0.495, 0.51),
+        ({'price': 0.0001, 'amount': 1.0}, ccxt.TICK_SIZE, '12.7', 'sell', '0.5', 12.0, 0.505, 0.49),
+        ({'price': 0.5, 'amount': 0.01}, ccxt.TICK_SIZE, '12.789', 'buy', '100.3', 12.78, 99.0, 102.5),
+        # Too many ticks for the float kernel: priced with Decimal, still on the 0.5 tick
+        ({'price': 0.5, 'amount': 0.01}, ccxt.TICK_SIZE, '1', 'buy', '1000000000.3', 1.0, 990000000.0, 1020000000.5),
+    )
+
+    def test_calculate_trade_params(self):
+        """Test amount and SL/TP rounding for decimal-place and tick-size market precision."""
+        for precision, mode, amount, side, price, expected_amount, expected_sl, expected_tp in self.CASES:
+            with self.subTest(precision=precision, side=side, price=price):
+                executor = create_executor(precision, mode)
+                params = executor._calculate_trade_params(Decimal(amount), side, Decimal(price), 1.0, 2.0)
+
+                self.assertIsNone(params['error'])
+                self.assertEqual(params['final_amount'], expected_amount)
+                self.assertEqual(params['sl_price'], expected_sl)
+                self.assertEqual(params['tp_price'], expected_tp)
+
+    def test_amount_floored_to_step(self):
+        """Test that amounts are floored to the amount step, never rounded up to the next one."""
+        # (amount precision, amount, expected amount)
+        for amount_precision, amount, expected in ((2, '0.29', 0.29), (0, '12.9999999', 12.0), (2, '7.019999', 7.01)):
+            with self.subTest(amount_precision=amount_precision, amount=amount):
+                executor = create_executor({'price': 4, 'amount': amount_precision}, ccxt.DECIMAL_PLACES)
+                params = executor._calculate_trade_params(Decimal(amount), 'buy', None, 0, 0)
+
+                self.assertIsNone(params['error'])
+                self.assertEqual(params['final_amount'], expected)
+
+    def test_unusable_precision_fails_per_trade(self):
+        """Test that a market with unreadable precision fails its trades instead of the constructor."""
+        executor = create_executor({'price': 'n/a', 'amount': 1.0}, ccxt.TICK_SIZE)
+
+        params = executor._calculate_trade_params(Decimal('12.7'), 'buy', Decimal('0.5'), 1.0, 2.0)
+
+        self.assertIsNotNone(params['error'])
+        self.assertIsNone(params['final_amount'])
+
+
+if __name__ == '__main__':
+    unittest.main()